@@ -0,0 +1,197 @@
+"""
+Timings for the hot paths of rxcube, saved as JSON and compared between runs.
+
+    python -m benchmarks.bench_suite [--number N] [--repeat R] [--output FILE]
+                                     [--compare BASELINE] [--threshold T]
+
+Covers every face move and whole-cube rotation on both cube sizes, a face
+move on a rotated cube, perform_move_sequence (compiling each sequence,
+and with the compiled sequence cached), generate_scramble, cube string
+round trips, each renderer in DISPLAY_FUNCS and big-cube moves with Cube
+and LargeCube. Each result is the best of --repeat short timings, in
+seconds per call, and the spread between the slowest and the fastest
+face move is shown for each size: every face move is a single gather, so
+they should all land within a narrow band.
+
+With --compare, results more than --threshold slower than the baseline
+file are timed again; those still slower are reported as regressions
+and the exit status is 1.
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import platform
+import random
+import sys
+import timeit
+
+from rxcube.cube import from_cube_string, make_cube
+from rxcube.large import LargeCube
+from rxcube.rubix import DISPLAY_FUNCS, generate_scramble, perform_move_sequence
+
+FORMAT_VERSION = 1
+
+REPEAT = 25
+
+# Suspected regressions are timed again this many times before they count.
+CONFIRM_REPEAT = 50
+
+
+class _Sink:
+    def write(self, s):
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+def benchmarks():
+    """
+    ``(name, function, relative cost)`` for every benchmark; the cost
+    divides the number of calls so slow benchmarks take a similar time.
+    """
+    rng = random.Random(20)
+    for size in (2, 3):
+        cube = make_cube(size)
+        label = f'{size}x{size}x{size}'
+        for move in cube.non_rotational_moves() + cube.whole_cube_rotation_moves():
+            yield f'move/{label}/{move}', lambda cube=cube, move=move: cube.make_move(move), 1
+        framed = cube.make_move('X').make_move('Y')
+        yield f'move/{label}/after_rotation/R', lambda framed=framed: framed.make_move('R'), 1
+
+        # Cycling through more sequences than the compile caches hold (1024)
+        # makes every call parse and compile; a few sequences measure the cache.
+        for suffix, count in (('', 4096), ('/cached', 16)):
+            sequences = itertools.cycle([' '.join(rng.choices(cube.non_rotational_moves(), k=20))
+                                         for _ in range(count)])
+            yield (f'perform_move_sequence/{label}/20{suffix}',
+                   lambda cube=cube, sequences=sequences: perform_move_sequence(next(sequences), cube), 10)
+        yield f'generate_scramble/{label}', lambda cube=cube: generate_scramble(cube, rng), 50
+
+        scrambled = perform_move_sequence(' '.join(generate_scramble(cube, rng)), cube)
+        yield (f'cube_string_round_trip/{label}',
+               lambda scrambled=scrambled: from_cube_string(scrambled.to_cube_string()), 10)
+
+        for mode, display in DISPLAY_FUNCS.items():
+            yield f'display/{label}/{mode}', lambda display=display, scrambled=scrambled: display(scrambled), 50
+
+    for size in (10, 20):
+        cube = make_cube(size)
+        large = LargeCube(cube)
+        label = f'{size}x{size}x{size}'
+        for move in ('R', '3R', '3Rw', 'X'):
+            yield f'large_move/{label}/Cube/{move}', lambda cube=cube, move=move: cube.make_move(move), 1
+            yield f'large_move/{label}/LargeCube/{move}', lambda large=large, move=move: large.apply_move(move), 1
+
+
+def run(number, selected=None, repeat=REPEAT, names=None):
+    """
+    Seconds per call of each benchmark, the best of ``repeat`` timings.
+    Only benchmarks whose name contains one of ``selected`` and, when it is
+    given, is in ``names`` are run.
+
+    The repeats go round all the benchmarks in turn rather than timing one
+    benchmark ``repeat`` times in a row. A stretch of noise from the rest
+    of the machine then spoils a few timings of many benchmarks instead of
+    every timing of one, and the best timing skips it.
+    """
+    selected_benchmarks = [(name, func, max(1, number // cost)) for name, func, cost in benchmarks()
+                           if (names is None or name in names)
+                           and (not selected or any(s in name for s in selected))]
+    results = {}
+    with contextlib.redirect_stdout(_Sink()):
+        for _ in range(repeat):
+            for name, func, calls in selected_benchmarks:
+                seconds = timeit.timeit(func, number=calls) / calls
+                results[name] = min(seconds, results.get(name, seconds))
+    return results
+
+
+def face_move_spread(results):
+    """
+    Slowest over fastest face move time for each cube size timed.
+    """
+    times = {}
+    for name, seconds in results.items():
+        kind, label, *move = name.split('/')
+        if kind == 'move' and len(move) == 1 and move[0][0] not in 'XYZ':
+            times.setdefault(label, []).append(seconds)
+    return {label: max(seconds) / min(seconds) for label, seconds in times.items()}
+
+
+def compare(results, baseline, threshold):
+    """
+    ``(name, baseline seconds, seconds, ratio)`` for benchmarks in both
+    runs whose time grew by more than ``threshold`` (0.2 is 20%).
+    """
+    regressions = []
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before and seconds / before > 1 + threshold:
+            regressions.append((name, before, seconds, seconds / before))
+    return regressions
+
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('version') != FORMAT_VERSION:
+        raise ValueError(f'Unsupported benchmark file version: {data.get("version")}')
+    return data['results']
+
+
+def save_results(path, results, number):
+    data = {
+        'version': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'number': number,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=1000, help='calls per repeat for the cheapest benchmarks')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='slowdown reported as a regression')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='timings per benchmark, the best one counts')
+    parser.add_argument('--select', action='append', help='only run benchmarks whose name contains this')
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.compare) if args.compare else {}
+    results = run(args.number, args.select, args.repeat)
+    if args.compare:
+        # Noise only ever adds time, so a real regression is still slow when
+        # timed again, while a noisy timing usually is not.
+        suspects = {name for name, *_ in compare(results, baseline, args.threshold)}
+        if suspects:
+            for name, seconds in run(args.number, repeat=CONFIRM_REPEAT, names=suspects).items():
+                results[name] = min(seconds, results[name])
+    for name, seconds in results.items():
+        line = f'{name:<44} {seconds * 1e6:12.3f} us'
+        if name in baseline:
+            line += f'  {seconds / baseline[name]:6.2f}x'
+        print(line)
+    for label, spread in face_move_spread(results).items():
+        print(f'{label} face moves, slowest/fastest: {spread:.2f}')
+
+    if args.output:
+        save_results(args.output, results, args.number)
+
+    if args.compare:
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, seconds, ratio in regressions:
+            print(f'REGRESSION {name}: {before * 1e6:.3f} us -> {seconds * 1e6:.3f} us ({ratio:.2f}x)')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""
+Move application over many cubes at once.
+
+A batch is an ``(N, 54)`` or ``(N, 24)`` ``uint8`` matrix with one cube per
+row, holding the same sticker codes as ``Cube.stickers``. Moves are applied
+with NumPy fancy indexing using the permutations from
+``Cube.move_permutations``, so a batch always agrees with ``Cube.make_move``.
+
+``rank_states`` and ``unrank_states`` are batch versions of ``rxcube.rank``.
+
+NumPy is an optional dependency: ``pip install rxcube[numpy]``.
+"""
+try:
+    import numpy as np
+except ImportError as ex:
+    raise ImportError('rxcube.batch needs NumPy, install it with: pip install rxcube[numpy]') from ex
+
+from . import cubie, rank
+from .cube import Cube_3x3x3, cube_class, normalise_move
+
+_MOVE_TABLES = {}
+_CUBIE_TABLES = {}
+_ROTATION_TABLE_2X2X2 = None
+_ORIENTATION_TABLE_3X3X3 = None
+
+
+def _size_of(stickers):
+    size = int(round((stickers.shape[-1] / 6) ** 0.5))
+    if 6 * size * size != stickers.shape[-1]:
+        raise ValueError(f'Not a row of cube stickers: {stickers.shape[-1]} columns')
+    return size
+
+
+def move_table(size):
+    """
+    Move names and the matching ``(M, 6*size*size)`` gather table.
+    """
+    table = _MOVE_TABLES.get(size)
+    if table is None:
+        perms = cube_class(size).move_permutations()
+        names = tuple(perms)
+        table = names, np.array([perms[m] for m in names], dtype=np.intp)
+        _MOVE_TABLES[size] = table
+    return table
+
+
+def move_indices(moves, size=3):
+    """
+    Row indices into ``move_table(size)`` for a sequence of move strings.
+    """
+    names, _ = move_table(size)
+    lookup = {m: i for i, m in enumerate(names)}
+    try:
+        return np.array([lookup[normalise_move(m)] for m in moves], dtype=np.intp)
+    except KeyError as ex:
+        raise NotImplementedError(ex.args[0]) from None
+
+
+def to_sticker_matrix(cubes):
+    cubes = list(cubes)
+    if not cubes:
+        raise ValueError('Empty batch')
+    width = len(cubes[0].stickers)
+    return np.frombuffer(b''.join(c.stickers for c in cubes), dtype=np.uint8).reshape(len(cubes), width)
+
+
+def from_sticker_matrix(stickers):
+    cls = cube_class(_size_of(stickers))
+    return [cls.from_stickers(row.tobytes()) for row in np.asarray(stickers, dtype=np.uint8)]
+
+
+def make_cubes(count, size=3):
+    solved = cube_class(size).make_cube()
+    return np.tile(np.frombuffer(solved.stickers, dtype=np.uint8), (count, 1))
+
+
+def apply_move(stickers, move):
+    """
+    Apply one move to every cube in the batch.
+
+    ``move`` is either a move string applied to all rows, or one move per
+    row given as move strings or as indices into ``move_table``.
+    """
+    size = _size_of(stickers)
+    names, table = move_table(size)
+    if isinstance(move, str):
+        return stickers[:, cube_class(size).move_permutation(move)]
+    move = np.asarray(move)
+    if move.dtype.kind in 'US':
+        move = move_indices(move.tolist(), size)
+    if move.shape != (stickers.shape[0],):
+        raise ValueError(f'Expected {stickers.shape[0]} moves, got shape {move.shape}')
+    return np.take_along_axis(stickers, table[move], axis=1)
+
+
+def apply_move_sequence(stickers, move_sequence_str):
+    """
+    Apply the same move sequence to every cube in the batch.
+
+    The sequence is folded into a single permutation first, so the batch is
+    gathered only once however long the sequence is.
+    """
+    size = _size_of(stickers)
+    _, table = move_table(size)
+    perm = np.arange(stickers.shape[1])
+    for i in move_indices(move_sequence_str.split(), size):
+        perm = perm[table[i]]
+    return stickers[:, perm]
+
+
+def apply_move_sequences(stickers, moves):
+    """
+    Apply a different move sequence to every cube in the batch.
+
+    ``moves`` is an ``(N, K)`` matrix of indices into ``move_table``; the
+    K columns are applied left to right.
+    """
+    size = _size_of(stickers)
+    _, table = move_table(size)
+    moves = np.asarray(moves, dtype=np.intp)
+    if moves.ndim != 2 or moves.shape[0] != stickers.shape[0]:
+        raise ValueError(f'Expected an ({stickers.shape[0]}, K) move matrix, got shape {moves.shape}')
+    for column in moves.T:
+        stickers = np.take_along_axis(stickers, table[column], axis=1)
+    return stickers
+
+
+def _factorials(n):
+    result = [1] * (n + 1)
+    for i in range(1, n + 1):
+        result[i] = result[i - 1] * i
+    return result
+
+
+def _permutation_ranks(perms):
+    """
+    Row-wise ``cubie.permutation_rank`` of an ``(N, n)`` matrix.
+    """
+    n = perms.shape[1]
+    fact = _factorials(n)
+    ranks = np.zeros(perms.shape[0], dtype=np.int64)
+    for i in range(n - 1):
+        smaller = (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1)
+        ranks += smaller * fact[n - 1 - i]
+    return ranks
+
+
+def _permutation_unranks(digits):
+    """
+    Permutations from an ``(N, n)`` matrix of Lehmer digits.
+    """
+    count, n = digits.shape
+    used = np.zeros((count, n), dtype=bool)
+    perms = np.empty((count, n), dtype=np.intp)
+    for i in range(n):
+        free_before = np.cumsum(~used, axis=1)
+        pick = np.argmax((free_before == digits[:, i:i + 1] + 1) & ~used, axis=1)
+        perms[:, i] = pick
+        used[np.arange(count), pick] = True
+    return perms
+
+
+def _lehmer_digits(ranks, n):
+    fact = _factorials(n)
+    return np.stack([(ranks // fact[n - 1 - i]) % (n - i) for i in range(n)], axis=1)
+
+
+def _orientation_ranks(ori, base):
+    ranks = np.zeros(ori.shape[0], dtype=np.int64)
+    for i in range(ori.shape[1] - 1):
+        ranks = ranks * base + ori[:, i]
+    return ranks
+
+
+def _orientation_unranks(ranks, n, base):
+    ori = np.zeros((ranks.shape[0], n), dtype=np.intp)
+    for i in range(n - 2, -1, -1):
+        ori[:, i] = ranks % base
+        ranks = ranks // base
+    ori[:, -1] = -ori[:, :-1].sum(axis=1) % base
+    return ori
+
+
+def _cubie_tables(size):
+    """
+    Sticker indices of every corner (and edge) position, and lookups from
+    the colours on a position to ``cubie * base + orientation``.
+    """
+    tables = _CUBIE_TABLES.get(size)
+    if tables is not None:
+        return tables
+    facelets = [np.array(cubie._facelet_indices(size, cubie.CORNER_FACELETS), dtype=np.intp)]
+    colours = [cubie._CORNER_COLOURS]
+    if size == 3:
+        facelets.append(np.array(cubie._facelet_indices(size, cubie.EDGE_FACELETS), dtype=np.intp))
+        colours.append(cubie._EDGE_COLOURS)
+    tables = []
+    for idx, names in zip(facelets, colours):
+        base = idx.shape[1]
+        lookup = np.full(6 ** base, -1, dtype=np.intp)
+        paint = np.empty((len(names), base, base), dtype=np.uint8)
+        for c, name in enumerate(names):
+            for o in range(base):
+                code = 0
+                for k in range(base):
+                    paint[c, o, k] = name[(k - o) % base]
+                    code = code * 6 + paint[c, o, k]
+                lookup[code] = c * base + o
+        tables.append((idx, lookup, paint))
+    _CUBIE_TABLES[size] = tables
+    return tables
+
+
+def _cubies_from_stickers(stickers, size):
+    result = []
+    for idx, lookup, _ in _cubie_tables(size):
+        base = idx.shape[1]
+        codes = np.zeros((stickers.shape[0], idx.shape[0]), dtype=np.intp)
+        for k in range(base):
+            codes = codes * 6 + stickers[:, idx[:, k]]
+        found = lookup[codes]
+        if (found < 0).any():
+            raise ValueError(f'Invalid cubie colours in row {int(np.argmax((found < 0).any(axis=1)))}')
+        result.extend(divmod(found, base))
+    return result
+
+
+def _cubies_to_stickers(cubies, size):
+    count = cubies[0].shape[0]
+    stickers = np.empty((count, 6 * size * size), dtype=np.uint8)
+    if size == 3:
+        stickers[:, [4 + 9 * f for f in range(6)]] = np.arange(6, dtype=np.uint8)
+    for (idx, _, paint), (perm, ori) in zip(_cubie_tables(size), zip(cubies[::2], cubies[1::2])):
+        for k in range(idx.shape[1]):
+            stickers[:, idx[:, k]] = paint[perm, ori, k]
+    return stickers
+
+
+def _check_legal(cp, co, ep=None, eo=None):
+    legal = (co.sum(axis=1) % 3 == 0) & (np.sort(cp, axis=1) == np.arange(8)).all(axis=1)
+    if ep is not None:
+        parity = (_lehmer_digits(_permutation_ranks(cp), 8).sum(axis=1)
+                  + _lehmer_digits(_permutation_ranks(ep), 12).sum(axis=1)) % 2
+        legal &= (eo.sum(axis=1) % 2 == 0) & (np.sort(ep, axis=1) == np.arange(12)).all(axis=1) & (parity == 0)
+    if not legal.all():
+        raise ValueError(f'Not a legal state in row {int(np.argmin(legal))}')
+
+
+def _rotation_table_2x2x2():
+    global _ROTATION_TABLE_2X2X2
+    if _ROTATION_TABLE_2X2X2 is None:
+        keys = sorted(rank.rotations_2x2x2().items())
+        rcp = np.array([r.cp for _, r in keys], dtype=np.intp)
+        rco = np.array([r.co for _, r in keys], dtype=np.intp)
+        _ROTATION_TABLE_2X2X2 = rcp, rco
+    return _ROTATION_TABLE_2X2X2
+
+
+def _orientation_table_3x3x3():
+    """
+    A lookup from ``u_centre * 6 + f_centre`` to a row of the stacked
+    rotation permutations, row 0 (the identity) for impossible centres.
+    """
+    global _ORIENTATION_TABLE_3X3X3
+    if _ORIENTATION_TABLE_3X3X3 is None:
+        index = np.zeros(36, dtype=np.intp)
+        perms = [tuple(range(54))]
+        for (u, f), (_, perm, _) in Cube_3x3x3._orientation_table().items():
+            index[u * 6 + f] = len(perms)
+            perms.append(perm)
+        _ORIENTATION_TABLE_3X3X3 = index, np.array(perms, dtype=np.intp)
+    return _ORIENTATION_TABLE_3X3X3
+
+
+def _canonical_orientation_3x3x3(stickers):
+    """
+    Every row of a 3x3x3 sticker matrix turned so the centres are home.
+    """
+    index, perms = _orientation_table_3x3x3()
+    key = stickers[:, 4] * 6 + stickers[:, 22]
+    rows = index[key]
+    if (rows == 0).any():
+        raise ValueError('The U and F centres are not adjacent')
+    return np.take_along_axis(stickers, perms[rows], axis=1)
+
+
+def rank_states(stickers):
+    """
+    ``rxcube.rank`` ranks of every row of a sticker matrix.
+
+    2x2x2 ranks come back as ``int64``; 3x3x3 ranks need 66 bits, so they
+    are combined into Python ints in an ``object`` array.
+    """
+    stickers = np.asarray(stickers, dtype=np.intp)
+    size = _size_of(stickers)
+    if size == 3:
+        stickers = _canonical_orientation_3x3x3(stickers)
+        cp, co, ep, eo = _cubies_from_stickers(stickers, 3)
+        _check_legal(cp, co, ep, eo)
+        corners = _permutation_ranks(cp) * rank.N_TWIST + _orientation_ranks(co, 3)
+        edges = (_permutation_ranks(ep) // 2) * rank.N_FLIP + _orientation_ranks(eo, 2)
+        return corners.astype(object) * (rank.N_EDGE_PERM * rank.N_FLIP) + edges.astype(object)
+    if size == 2:
+        cp, co = _cubies_from_stickers(stickers, 2)
+        _check_legal(cp, co)
+        rcp, rco = _rotation_table_2x2x2()
+        j = np.argmax(cp == rank.DBL, axis=1)
+        key = j * 3 + co[np.arange(co.shape[0]), j]
+        rcp, rco = rcp[key], rco[key]
+        cp, co = np.take_along_axis(cp, rcp, axis=1), (np.take_along_axis(co, rcp, axis=1) + rco) % 3
+        free = list(rank.FREE_CORNERS)
+        position = np.zeros(8, dtype=np.intp)
+        position[free] = np.arange(7)
+        return (_permutation_ranks(position[cp[:, free]]) * rank.N_TWIST_2X2X2
+                + _orientation_ranks(co[:, free], 3))
+    raise NotImplementedError(size)
+
+
+def unrank_states(ranks, size=3):
+    """
+    Sticker matrix with one row per rank; the inverse of ``rank_states``.
+    """
+    if size == 3:
+        ranks = np.asarray(ranks, dtype=object)
+        if ((ranks < 0) | (ranks >= rank.N_STATES_3X3X3)).any():
+            raise ValueError('Rank out of range')
+        corners = (ranks // (rank.N_EDGE_PERM * rank.N_FLIP)).astype(np.int64)
+        edges = (ranks % (rank.N_EDGE_PERM * rank.N_FLIP)).astype(np.int64)
+        corner_perm, twist = divmod(corners, rank.N_TWIST)
+        edge_perm, flip = divmod(edges, rank.N_FLIP)
+        corner_digits = _lehmer_digits(corner_perm, 8)
+        edge_digits = _lehmer_digits(edge_perm * 2, 12)
+        # The second to last digit picks the edge permutation of the same parity as the corners.
+        edge_digits[:, 10] = (corner_digits.sum(axis=1) + edge_digits.sum(axis=1)) % 2
+        cubies = [_permutation_unranks(corner_digits), _orientation_unranks(twist, 8, 3),
+                  _permutation_unranks(edge_digits), _orientation_unranks(flip, 12, 2)]
+        return _cubies_to_stickers(cubies, 3)
+    if size == 2:
+        ranks = np.asarray(ranks, dtype=np.int64)
+        if ((ranks < 0) | (ranks >= rank.N_STATES_2X2X2)).any():
+            raise ValueError('Rank out of range')
+        perm, twist = divmod(ranks, rank.N_TWIST_2X2X2)
+        free = np.array(rank.FREE_CORNERS, dtype=np.intp)
+        cp = np.tile(np.arange(8, dtype=np.intp), (ranks.shape[0], 1))
+        co = np.zeros((ranks.shape[0], 8), dtype=np.intp)
+        cp[:, free] = free[_permutation_unranks(_lehmer_digits(perm, 7))]
+        co[:, free] = _orientation_unranks(twist, 7, 3)
+        return _cubies_to_stickers([cp, co], 2)
+    raise NotImplementedError(size)
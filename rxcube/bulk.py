@@ -0,0 +1,146 @@
+"""
+Bulk solving of files of cube strings.
+
+The input has one cube string per line, as written by ``save_to_file``;
+blank lines are skipped. 24 character strings are solved with the optimal
+2x2x2 solver and 54 character strings with the two-phase 3x3x3 solver.
+Cubes are solved on a process pool and results come back as they finish
+but in input order, each with the time its own solve took.
+
+The solver tables of every size in the input are loaded (or built) once in
+the parent before the pool starts. They are memory mapped, so the workers
+share them instead of each holding a copy.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from .solver_2x2x2 import DEFAULT_TABLE_PATH as DEFAULT_2X2X2_TABLE_PATH, Solver_2x2x2
+from .solver_3x3x3 import DEFAULT_TABLE_DIR as DEFAULT_3X3X3_TABLE_DIR, Solver_3x3x3
+
+
+class SolveResult(NamedTuple):
+    # Line number in the file for ``solve_file``, position in the input for ``solve_cube_strings``.
+    index: int
+    cube_string: str
+    # None when the cube could not be solved, see ``error``.
+    solution: list | None
+    seconds: float
+    error: str | None = None
+
+
+_SOLVER_LENGTHS = (24, 54)
+
+_solvers = {}
+
+
+def _solver(length, table_dir):
+    solver = _solvers.get((table_dir, length))
+    if solver is None:
+        if length == 24:
+            path = DEFAULT_2X2X2_TABLE_PATH if table_dir is None else Path(table_dir) / '2x2x2_distances.bin'
+            solver = Solver_2x2x2(path)
+            solver.load_table()
+        elif length == 54:
+            path = DEFAULT_3X3X3_TABLE_DIR if table_dir is None else Path(table_dir) / '3x3x3'
+            solver = Solver_3x3x3(path)
+            solver.load_tables()
+        else:
+            raise ValueError(f'No solver for {length} character cube strings')
+        _solvers[table_dir, length] = solver
+    return solver
+
+
+def _solve_one(item):
+    index, cube_string, timeout, table_dir = item
+    start = time.perf_counter()
+    try:
+        solver = _solver(len(cube_string), table_dir)
+        if isinstance(solver, Solver_3x3x3):
+            solution = solver.solve(cube_string, timeout=timeout)
+        else:
+            solution = solver.solve(cube_string)
+        error = None
+    except (ValueError, TimeoutError, NotImplementedError) as ex:
+        solution = None
+        error = f'{type(ex).__name__}: {ex}'
+    return SolveResult(index, cube_string, solution, time.perf_counter() - start, error)
+
+
+def read_cube_strings(filepath):
+    """
+    ``(line number, cube string)`` for each line of a file, counting from
+    1 and skipping blank lines.
+    """
+    with open(filepath) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                yield line_number, line
+
+
+def _solve_numbered(numbered, processes, timeout, table_dir, chunksize):
+    numbered = list(numbered)
+    # Build or map the tables of every size in the input here, so the
+    # workers find them ready instead of each building them at once.
+    for length in sorted({len(cube_string) for _, cube_string in numbered}):
+        if length in _SOLVER_LENGTHS:
+            _solver(length, table_dir)
+    items = [(index, cube_string, timeout, table_dir) for index, cube_string in numbered]
+    if processes == 1:
+        yield from map(_solve_one, items)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap(_solve_one, items, chunksize)
+
+
+def solve_cube_strings(cube_strings, processes=None, timeout=None, table_dir=None, chunksize=1):
+    """
+    Solve an iterable of cube strings, yielding a ``SolveResult`` per cube in
+    input order, indexed by its position from 0.
+
+    ``processes`` defaults to the number of CPUs; with 1 everything is
+    solved in this process. ``timeout`` limits each 3x3x3 solve.
+    ``table_dir`` holds the solver tables instead of the default cache
+    locations.
+    """
+    yield from _solve_numbered(enumerate(cube_strings), processes, timeout, table_dir, chunksize)
+
+
+def solve_file(filepath, processes=None, timeout=None, table_dir=None, chunksize=1):
+    """
+    Solve every cube string in ``filepath``; see ``solve_cube_strings``.
+    Results are indexed by their line number in the file, from 1.
+    """
+    yield from _solve_numbered(read_cube_strings(filepath), processes, timeout, table_dir, chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='rxcube-solve', description='Solve a file of cube strings, one per line.')
+    parser.add_argument('filepath', type=Path)
+    parser.add_argument('-j', '--processes', type=int, default=None, help='worker processes (default: all CPUs)')
+    parser.add_argument('-t', '--timeout', type=float, default=None, help='seconds allowed per 3x3x3 cube')
+    parser.add_argument('--table-dir', type=Path, default=None, help='directory for the solver tables')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = failed = 0
+    for result in solve_file(args.filepath, processes=args.processes, timeout=args.timeout,
+                             table_dir=args.table_dir):
+        count += 1
+        if result.error is None:
+            print(f'{result.index}\t{result.seconds:.4f}\t{" ".join(result.solution)}', flush=True)
+        else:
+            failed += 1
+            print(f'{result.index}\t{result.seconds:.4f}\t# {result.error}', flush=True)
+    seconds = time.perf_counter() - start
+    rate = count / seconds if seconds else 0.0
+    print(f'Solved {count - failed}/{count} cubes in {seconds:.2f} s ({rate:.1f} cubes/s)', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
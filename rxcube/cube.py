@@ -5,7 +5,10 @@ try:
 except ImportError:
     Self = None
 
+import functools
 import itertools
+import math
+from operator import itemgetter
 
 FACES = 'ULFRBD'
 OPPOSITE_FACES = dict([(FACES[_i], _f) for _i, _f in enumerate('DRBLFU')])
@@ -30,16 +33,293 @@ COLOUR_MAP = {
     'B': 'b',
 }
 
+# Stickers are stored as one byte each: the index of their state in STATES.
+_ENCODE_STICKERS = bytes.maketrans(STATES.encode('ascii'), bytes(range(len(STATES))))
+_DECODE_STICKERS = bytes.maketrans(bytes(range(len(STATES))), STATES.encode('ascii'))
+
+
+def compose_permutations(*perms):
+    """
+    Compose sticker permutations, applied left to right.
+    """
+    composed = perms[0]
+    for p in perms[1:]:
+        composed = tuple(composed[i] for i in p)
+    return composed
+
+
+def normalise_move(move_str):
+    """
+    A move string in the case used by ``Cube.move_permutations``: face
+    letters upper case and the wide marker lower case (``3rw'`` -> ``3Rw'``).
+    """
+    move = move_str.upper()
+    return move.replace('W', 'w') if 'W' in move else move
+
+
+# Outward normal of each face: x points to R, y to U and z to F.
+FACE_NORMALS = {
+    'U': (0, 1, 0), 'L': (-1, 0, 0), 'F': (0, 0, 1),
+    'R': (1, 0, 0), 'B': (0, 0, -1), 'D': (0, -1, 0),
+}
+
+# Slice moves turn the middle layer like this face.
+SLICE_FACES = {'M': 'L', 'E': 'D', 'S': 'F'}
+
+# The whole-cube rotations, which turn the way of these faces.
+ROTATION_FACES = {'X': 'L', 'Y': 'D', 'Z': 'B'}
+
+
+def sticker_geometry(size):
+    """
+    Position and outward normal of every sticker, in ``Cube.stickers``
+    order. Positions are cubie centres with coordinates ``2 * i - (size -
+    1)``, so they are integers whatever the size.
+    """
+    n = size - 1
+    geometry = []
+    for face in FACES:
+        for row in range(size):
+            for col in range(size):
+                a, b = 2 * col - n, 2 * row - n
+                match face:
+                    case 'U':
+                        position = (a, n, b)
+                    case 'L':
+                        position = (-n, -b, a)
+                    case 'F':
+                        position = (a, -b, n)
+                    case 'R':
+                        position = (n, -b, -a)
+                    case 'B':
+                        position = (-a, -b, -n)
+                    case 'D':
+                        position = (a, -n, -b)
+                geometry.append((position, FACE_NORMALS[face]))
+    return geometry
+
+
+def turn_clockwise(vector, axis):
+    """
+    ``vector`` turned a quarter turn clockwise as seen from the tip of the
+    unit vector ``axis`` (a value of ``FACE_NORMALS``).
+    """
+    (x, y, z), (i, j, k) = vector, axis
+    dot = x * i + y * j + z * k
+    return (dot * i - (j * z - k * y), dot * j - (k * x - i * z), dot * k - (i * y - j * x))
+
+
+def _layer_turn(geometry, index, size, face, layers):
+    """
+    Gather permutation turning the ``layers`` of the cube counted from
+    ``face`` (1 is the face itself) a quarter turn clockwise as seen from
+    that face.
+    """
+    axis = FACE_NORMALS[face]
+    perm = list(range(len(geometry)))
+    for i, (position, normal) in enumerate(geometry):
+        depth = (size - 1 - sum(p * a for p, a in zip(position, axis))) // 2 + 1
+        if depth in layers:
+            perm[index[(turn_clockwise(position, axis), turn_clockwise(normal, axis))]] = i
+    return tuple(perm)
+
+
+@functools.lru_cache(maxsize=None)
+def layer_move_permutations(size):
+    """
+    Sticker permutations for a cube of any size, generated from its
+    geometry and keyed by move string like ``Cube.move_permutations``:
+
+    * face turns ``R``, the outer ``k`` layers ``kRw`` (``Rw`` for two) and
+      the ``k``-th layer alone ``kR``, for ``1 < k < size``;
+    * the middle slices ``M``, ``E`` and ``S`` on odd sizes, turning like
+      ``L``, ``D`` and ``F``;
+    * whole-cube rotations ``X``, ``Y`` and ``Z``, turning like ``L``,
+      ``D`` and ``B``.
+
+    Each comes with its inverse (``'``) and half turn (``2``).
+    """
+    geometry = sticker_geometry(size)
+    index = {sticker: i for i, sticker in enumerate(geometry)}
+    everything = frozenset(range(1, size + 1))
+    quarter_turns = {}
+    for face in FACES:
+        quarter_turns[face] = (face, {1})
+    for rotation, face in ROTATION_FACES.items():
+        quarter_turns[rotation] = (face, everything)
+    if size % 2:
+        for slice_, face in SLICE_FACES.items():
+            quarter_turns[slice_] = (face, {size // 2 + 1})
+    for k in range(2, size):
+        for face in FACES:
+            quarter_turns[f'{k}{face}w' if k > 2 else f'{face}w'] = (face, set(range(1, k + 1)))
+    for k in range(2, size):
+        for face in FACES:
+            quarter_turns[f'{k}{face}'] = (face, {k})
+
+    perms = {}
+    for move, (face, layers) in quarter_turns.items():
+        perm = _layer_turn(geometry, index, size, face, layers)
+        perms[move] = perm
+        perms[f"{move}'"] = compose_permutations(perm, perm, perm)
+        perms[f'{move}2'] = compose_permutations(perm, perm)
+    return perms
+
+
+# Whole-cube rotation moves in every spelling ``make_move`` accepts.
+_ROTATION_MOVES = frozenset(f'{a}{s}' for a in 'XYZxyz' for s in ("", "'", "2"))
+
+
+class _FrameTables:
+    """
+    The 24 orientation frames of one cube class, numbered as in
+    ``Cube.whole_cube_rotations`` (0 is the identity), and how moves act
+    on them.
+    """
+    __slots__ = ('perms', 'gathers', 'index', 'by_name', 'inverses', 'after', '_move_gathers', '_cube_class')
+
+    def __init__(self, cube_class):
+        rotations = cube_class.whole_cube_rotations()
+        move_perms = cube_class.move_permutations()
+        self.perms = tuple(perm for _, perm in rotations)
+        self.gathers = tuple(itemgetter(*perm) for perm in self.perms)
+        self.index = {perm: i for i, perm in enumerate(self.perms)}
+        self.by_name = {name: i for i, (name, _) in enumerate(rotations)}
+        self.inverses = tuple(self.index[_inverse_permutation(perm)] for perm in self.perms)
+        # after[frame][rotation move]: the frame once that rotation is made.
+        self.after = tuple({m: self.index[compose_permutations(perm, move_perms[m.upper()])]
+                            for m in _ROTATION_MOVES}
+                           for perm in self.perms)
+        self._move_gathers = {}
+        self._cube_class = cube_class
+
+    def move_gather(self, frame, move):
+        """
+        The gather that makes ``move``, as seen in ``frame``, on stickers
+        stored in the identity frame.
+        """
+        key = (frame, move)
+        gather = self._move_gathers.get(key)
+        if gather is None:
+            perm = self._cube_class.move_permutation(move)
+            inverse = self.perms[self.inverses[frame]]
+            gather = itemgetter(*compose_permutations(self.perms[frame], perm, inverse))
+            self._move_gathers[key] = gather
+        return gather
+
+
+def _inverse_permutation(perm):
+    inverse = [0] * len(perm)
+    for i, p in enumerate(perm):
+        inverse[p] = i
+    return tuple(inverse)
+
 
 class Cube(ABC):
+    """
+    Immutable cube state.
+
+    The stickers live in a single ``bytes`` object, one byte per sticker
+    (faces in ULFRBD order, each face row by row) holding the index of the
+    sticker's state in ``STATES``. Cubes compare and hash by class and
+    stickers, so they can be used directly as set members and dict keys.
+
+    A cube also carries an orientation frame, one of the 24 whole-cube
+    rotations: rotation moves only change the frame, and other moves are
+    remapped through it. The stickers are laid out in the frame only when
+    something reads them.
+    """
+    __slots__ = ('_size', '_stickers', '_frame')
+
+    SIZE = None
+    _MOVE_PERMUTATIONS = None
+    _MOVE_GATHERS = None
+    _MOVE_CHANGES = None
+    _ROTATIONS = None
+    _SOLVED_STICKERS = None
+    _ORIENTATIONS = None
+    _FRAMES = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Move tables depend on the cube size, so each class builds its own.
+        cls._MOVE_PERMUTATIONS = None
+        cls._MOVE_GATHERS = None
+        cls._MOVE_CHANGES = None
+        cls._ROTATIONS = None
+        cls._SOLVED_STICKERS = None
+        cls._ORIENTATIONS = None
+        cls._FRAMES = None
+
     def __init__(self, size, u, l, f, r, b, d):
         self._size = size
-        self._u = u[:]
-        self._l = l[:]
-        self._f = f[:]
-        self._r = r[:]
-        self._b = b[:]
-        self._d = d[:]
+        stickers = ''.join(itertools.chain(u, l, f, r, b, d))
+        self._stickers = stickers.encode('ascii').translate(_ENCODE_STICKERS)
+        self._frame = 0
+
+    @classmethod
+    def _from_stickers(cls, stickers):
+        cube = cls.__new__(cls)
+        cube._size = cls.SIZE
+        cube._stickers = stickers
+        cube._frame = 0
+        return cube
+
+    @classmethod
+    def _from_frame(cls, stickers, frame):
+        cube = cls.__new__(cls)
+        cube._size = cls.SIZE
+        cube._stickers = stickers
+        cube._frame = frame
+        return cube
+
+    @classmethod
+    def _frame_tables(cls):
+        frames = cls._FRAMES
+        if frames is None:
+            frames = cls._FRAMES = _FrameTables(cls)
+        return frames
+
+    @classmethod
+    def from_stickers(cls, stickers) -> Self:
+        """
+        Build a cube from sticker codes as returned by ``Cube.stickers``.
+        """
+        stickers = bytes(stickers)
+        if len(stickers) != 6 * cls.SIZE * cls.SIZE:
+            raise ValueError(f'{cls.__name__} needs {6 * cls.SIZE * cls.SIZE} stickers, got {len(stickers)}')
+        return cls._from_stickers(stickers)
+
+    @property
+    def stickers(self):
+        if self._frame:
+            frames = self._FRAMES or self._frame_tables()
+            return bytes(frames.gathers[self._frame](self._stickers))
+        return self._stickers
+
+    def __eq__(self, other):
+        if not isinstance(other, Cube):
+            return NotImplemented
+        return self.__class__ is other.__class__ and self.stickers == other.stickers
+
+    def __hash__(self):
+        return hash(self.stickers)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def copy(self) -> Self:
+        # Cubes are immutable, so a copy can share the state.
+        return self
+
+    def __reduce__(self):
+        return self._from_stickers, (self.stickers,)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}.from_cube_string({self.to_cube_string()!r})'
 
     @property
     def size(self):
@@ -51,63 +331,35 @@ class Cube(ABC):
         raise NotImplementedError()
 
     def make_move(self, move_str):
-        match move_str.upper():
-            case "R":
-                # print('Making R move')
-                return self.move_R()
-            case "R'":
-                return self.move_r()
-            case "R2":
-                return self.move_R().move_R()
-            case "U":
-                return self.move_U()
-            case "U'":
-                return self.move_u()
-            case "U2":
-                return self.move_U().move_U()
-            case "F":
-                return self.move_F()
-            case "F'":
-                return self.move_f()
-            case "F2":
-                return self.move_F().move_F()
-            case "L":
-                return self.move_L()
-            case "L'":
-                return self.move_l()
-            case "L2":
-                return self.move_L().move_L()
-            case "D":
-                return self.move_D()
-            case "D'":
-                return self.move_d()
-            case "D2":
-                return self.move_D().move_D()
-            case "B":
-                return self.move_B()
-            case "B'":
-                return self.move_b()
-            case "B2":
-                return self.move_B().move_B()
-            case "X":
-                return self.rotate_X()
-            case "X'":
-                return self.rotate_x()
-            case "X2":
-                return self.rotate_X().rotate_X()
-            case "Y":
-                return self.rotate_Y()
-            case "Y'":
-                return self.rotate_y()
-            case "Y2":
-                return self.rotate_Y().rotate_Y()
-            case "Z":
-                return self.rotate_Z()
-            case "Z'":
-                return self.rotate_z()
-            case "Z2":
-                return self.rotate_Z().rotate_Z()
-        raise NotImplementedError(move_str)
+        """
+        This cube after ``move_str``, as a new cube.
+
+        A move is one table lookup and one gather, so every face costs the
+        same, but most of that time goes into packing the gathered stickers
+        back into ``bytes``: a single move is only somewhat faster than the
+        face-by-face version was. Sequences gain far more, use
+        ``compile_move_sequence`` (as ``perform_move_sequence`` does) or
+        ``MutableCube`` for many moves in a row.
+        """
+        if self._frame or move_str in _ROTATION_MOVES:
+            return self._make_framed_move(move_str)
+        gathers = self._MOVE_GATHERS or self._move_gathers()
+        try:
+            gather = gathers[move_str]
+        except KeyError:
+            try:
+                gather = gathers[normalise_move(move_str)]
+            except KeyError:
+                raise NotImplementedError(move_str) from None
+        return self._from_stickers(bytes(gather(self._stickers)))
+
+    def _make_framed_move(self, move_str):
+        frames = self._FRAMES or self._frame_tables()
+        if move_str in _ROTATION_MOVES:
+            # The stickers stay where they are; only the frame turns.
+            return self._from_frame(self._stickers, frames.after[self._frame][move_str])
+        gather = frames.move_gather(self._frame, move_str)
+        return self._from_frame(bytes(gather(self._stickers)), self._frame)
 
     def non_rotational_moves(self):
         move_suffixes = ("", "'", "2")
@@ -118,8 +370,125 @@ class Cube(ABC):
         move_suffixes = ("", "'", "2")
         return [f'{v}{m}' for v, m in itertools.product(axes, move_suffixes)]
 
+    def layer_moves(self):
+        """
+        The wide and inner slice moves of this cube size, see
+        ``layer_move_permutations``.
+        """
+        basic = set(self.non_rotational_moves()) | set(self.whole_cube_rotation_moves())
+        return [m for m in layer_move_permutations(self._size) if m not in basic]
+
+    @classmethod
+    def _quarter_turn_definitions(cls):
+        return {
+            'U': cls._move_U_faces, "U'": cls._move_u_faces,
+            'L': cls._move_L_faces, "L'": cls._move_l_faces,
+            'F': cls._move_F_faces, "F'": cls._move_f_faces,
+            'R': cls._move_R_faces, "R'": cls._move_r_faces,
+            'B': cls._move_B_faces, "B'": cls._move_b_faces,
+            'D': cls._move_D_faces, "D'": cls._move_d_faces,
+            'X': cls._rotate_X_faces, "X'": cls._rotate_x_faces,
+            'Y': cls._rotate_Y_faces, "Y'": cls._rotate_y_faces,
+            'Z': cls._rotate_Z_faces, "Z'": cls._rotate_z_faces,
+        }
+
+    @classmethod
+    def move_permutations(cls):
+        """
+        Sticker permutation of every move, keyed by move string.
+
+        A permutation ``p`` is a gather over the flat sticker sequence
+        (faces in ULFRBD order): after the move, sticker ``i`` holds what
+        was at ``p[i]`` before it. They are computed once per class by
+        running the face-level move definitions on a cube whose stickers
+        are their own indices; wide and slice moves, and any move without a
+        face-level definition, come from ``layer_move_permutations``.
+        """
+        perms = cls._MOVE_PERMUTATIONS
+        if perms is None:
+            fc_size = cls.SIZE * cls.SIZE
+            indices = list(range(6 * fc_size))
+            faces = [indices[i:i + fc_size] for i in range(0, len(indices), fc_size)]
+            perms = {}
+            for move, faces_func in cls._quarter_turn_definitions().items():
+                perms[move] = tuple(itertools.chain(*faces_func(*faces)))
+                if not move.endswith("'"):
+                    perms[f'{move}2'] = compose_permutations(perms[move], perms[move])
+            for move, perm in layer_move_permutations(cls.SIZE).items():
+                perms.setdefault(move, perm)
+            cls._MOVE_PERMUTATIONS = perms
+        return perms
+
+    @classmethod
+    def move_permutation(cls, move_str):
+        try:
+            return cls.move_permutations()[normalise_move(move_str)]
+        except KeyError:
+            raise NotImplementedError(move_str) from None
+
+    @classmethod
+    def _move_gathers(cls):
+        gathers = cls._MOVE_GATHERS
+        if gathers is None:
+            gathers = {m: itemgetter(*p) for m, p in cls.move_permutations().items()}
+            cls._MOVE_GATHERS = gathers
+        return gathers
+
+    @classmethod
+    def _move_changes(cls):
+        """
+        For every move, the ``(destination, source)`` pairs of the stickers
+        it actually moves, for applying it in place.
+        """
+        changes = cls._MOVE_CHANGES
+        if changes is None:
+            changes = {m: tuple((i, j) for i, j in enumerate(p) if i != j)
+                       for m, p in cls.move_permutations().items()}
+            cls._MOVE_CHANGES = changes
+        return changes
+
+    def mutable(self):
+        return MutableCube(self)
+
+    @classmethod
+    def compile_move_sequence(cls, move_sequence_str):
+        """
+        The moves of ``move_sequence_str`` folded into one ``MoveSequence``,
+        which applies them all with a single gather.
+        """
+        return _compile_move_sequence(cls, move_sequence_str)
+
+    def _face(self, face_index):
+        fc_size = self._size * self._size
+        face = self.stickers[face_index * fc_size:(face_index + 1) * fc_size]
+        return list(face.translate(_DECODE_STICKERS).decode('ascii'))
+
+    @property
+    def _u(self):
+        return self._face(0)
+
+    @property
+    def _l(self):
+        return self._face(1)
+
+    @property
+    def _f(self):
+        return self._face(2)
+
+    @property
+    def _r(self):
+        return self._face(3)
+
+    @property
+    def _b(self):
+        return self._face(4)
+
+    @property
+    def _d(self):
+        return self._face(5)
+
     def _unpack_faces(self):
-        return self._u[:], self._l[:], self._f[:], self._r[:], self._b[:], self._d[:]
+        return self._u, self._l, self._f, self._r, self._b, self._d
 
     @staticmethod
     @abstractmethod
@@ -130,58 +499,123 @@ class Cube(ABC):
     @abstractmethod
     def _turn_face_clockwise(face):
         raise NotImplementedError()
-    
+
+    @classmethod
     @abstractmethod
-    def move_U(self) -> Self:
+    def _move_U_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_u(self) -> Self:
+    def _move_u_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_R(self) -> Self:
+    def _move_L_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_r(self) -> Self:
+    def _move_l_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_F(self) -> Self:
-        ...
+    def _move_F_faces(cls, u, l, f, r, b, d):
+        raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_f(self) -> Self:
+    def _move_f_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_L(self) -> Self:
+    def _move_R_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_l(self) -> Self:
+    def _move_r_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_B(self) -> Self:
+    def _move_B_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_b(self) -> Self:
+    def _move_b_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_D(self) -> Self:
+    def _move_D_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def move_d(self) -> Self:
+    def _move_d_faces(cls, u, l, f, r, b, d):
         raise NotImplementedError()
 
+    def move_U(self) -> Self:
+        return self.make_move("U")
+
+    def move_u(self) -> Self:
+        return self.make_move("U'")
+
+    def move_R(self) -> Self:
+        return self.make_move("R")
+
+    def move_r(self) -> Self:
+        return self.make_move("R'")
+
+    def move_F(self) -> Self:
+        return self.make_move("F")
+
+    def move_f(self) -> Self:
+        return self.make_move("F'")
+
+    def move_L(self) -> Self:
+        return self.make_move("L")
+
+    def move_l(self) -> Self:
+        return self.make_move("L'")
+
+    def move_B(self) -> Self:
+        return self.make_move("B")
+
+    def move_b(self) -> Self:
+        return self.make_move("B'")
+
+    def move_D(self) -> Self:
+        return self.make_move("D")
+
+    def move_d(self) -> Self:
+        return self.make_move("D'")
+
     def rotate_X(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return self.make_move("X")
+
+    def rotate_x(self) -> Self:
+        return self.make_move("X'")
+
+    def rotate_Y(self) -> Self:
+        return self.make_move("Y")
 
+    def rotate_y(self) -> Self:
+        return self.make_move("Y'")
+
+    def rotate_Z(self) -> Self:
+        return self.make_move("Z")
+
+    def rotate_z(self) -> Self:
+        return self.make_move("Z'")
+
+    @classmethod
+    def _rotate_X_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -192,23 +626,20 @@ class Cube(ABC):
         new_f = u[:]
         new_d = f[:]
 
-        new_b = self._turn_face_clockwise(self._turn_face_clockwise(d[:]))
+        new_b = cls._turn_face_clockwise(cls._turn_face_clockwise(d[:]))
 
-        new_u = self._turn_face_clockwise(self._turn_face_clockwise(b[:]))
+        new_u = cls._turn_face_clockwise(cls._turn_face_clockwise(b[:]))
 
         new_r = r[:]
-        new_r = self._turn_face_anticlockwise(new_r)
+        new_r = cls._turn_face_anticlockwise(new_r)
 
         new_l = l[:]
-        new_l = self._turn_face_clockwise(new_l)
+        new_l = cls._turn_face_clockwise(new_l)
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def rotate_x(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _rotate_x_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -219,23 +650,20 @@ class Cube(ABC):
         new_u = f[:]
         new_f = d[:]
 
-        new_d = self._turn_face_clockwise(self._turn_face_clockwise(b[:]))
+        new_d = cls._turn_face_clockwise(cls._turn_face_clockwise(b[:]))
 
-        new_b = self._turn_face_clockwise(self._turn_face_clockwise(u[:]))
+        new_b = cls._turn_face_clockwise(cls._turn_face_clockwise(u[:]))
 
         new_r = r[:]
-        new_r = self._turn_face_clockwise(new_r)
+        new_r = cls._turn_face_clockwise(new_r)
 
         new_l = l[:]
-        new_l = self._turn_face_anticlockwise(new_l)
-
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
+        new_l = cls._turn_face_anticlockwise(new_l)
 
-        return new_cube
-
-    def rotate_Y(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _rotate_Y_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -249,18 +677,15 @@ class Cube(ABC):
         new_l = b[:]
 
         new_u = u[:]
-        new_u = self._turn_face_anticlockwise(new_u)
+        new_u = cls._turn_face_anticlockwise(new_u)
 
         new_d = d[:]
-        new_d = self._turn_face_clockwise(new_d)
-
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
+        new_d = cls._turn_face_clockwise(new_d)
 
-        return new_cube
-
-    def rotate_y(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _rotate_y_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -274,18 +699,15 @@ class Cube(ABC):
         new_b = l[:]
 
         new_u = u[:]
-        new_u = self._turn_face_clockwise(new_u)
+        new_u = cls._turn_face_clockwise(new_u)
 
         new_d = d[:]
-        new_d = self._turn_face_anticlockwise(new_d)
-
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
+        new_d = cls._turn_face_anticlockwise(new_d)
 
-        return new_cube
-
-    def rotate_Z(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _rotate_Z_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -294,30 +716,27 @@ class Cube(ABC):
         new_d = d[:]
 
         new_l = u[:]
-        new_l = self._turn_face_anticlockwise(new_l)
+        new_l = cls._turn_face_anticlockwise(new_l)
 
         new_d = l[:]
-        new_d = self._turn_face_anticlockwise(new_d)
+        new_d = cls._turn_face_anticlockwise(new_d)
 
         new_r = d[:]
-        new_r = self._turn_face_anticlockwise(new_r)
+        new_r = cls._turn_face_anticlockwise(new_r)
 
         new_u = r[:]
-        new_u = self._turn_face_anticlockwise(new_u)
+        new_u = cls._turn_face_anticlockwise(new_u)
 
         new_f = f[:]
-        new_f = self._turn_face_anticlockwise(new_f)
+        new_f = cls._turn_face_anticlockwise(new_f)
 
         new_b = b[:]
-        new_b = self._turn_face_clockwise(new_b)
+        new_b = cls._turn_face_clockwise(new_b)
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def rotate_z(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _rotate_z_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -326,75 +745,149 @@ class Cube(ABC):
         new_d = d[:]
 
         new_u = l[:]
-        new_u = self._turn_face_clockwise(new_u)
+        new_u = cls._turn_face_clockwise(new_u)
 
         new_l = d[:]
-        new_l = self._turn_face_clockwise(new_l)
+        new_l = cls._turn_face_clockwise(new_l)
 
         new_d = r[:]
-        new_d = self._turn_face_clockwise(new_d)
+        new_d = cls._turn_face_clockwise(new_d)
 
         new_r = u[:]
-        new_r = self._turn_face_clockwise(new_r)
+        new_r = cls._turn_face_clockwise(new_r)
 
         new_f = f[:]
-        new_f = self._turn_face_clockwise(new_f)
+        new_f = cls._turn_face_clockwise(new_f)
 
         new_b = b[:]
-        new_b = self._turn_face_anticlockwise(new_b)
+        new_b = cls._turn_face_anticlockwise(new_b)
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
     @abstractmethod
     def face_centre_index(self):
         raise NotImplementedError()
 
-    def correct_face_orientation(self):
-        u, l, f, r, b, d = self._unpack_faces()
-
-        fci = self.face_centre_index()
-
-        # Where is U?
-        if u[fci] == 'U':
-            ...
-        else:
-            if l[fci] == 'U':
-                u, l, f, r, b, d = self.rotate_z()._unpack_faces()
-            if f[fci] == 'U':
-                u, l, f, r, b, d = self.rotate_x()._unpack_faces()
-            if r[fci] == 'U':
-                u, l, f, r, b, d = self.rotate_Z()._unpack_faces()
-            if b[fci] == 'U':
-                u, l, f, r, b, d = self.rotate_X()._unpack_faces()
-            if d[fci] == 'U':
-                u, l, f, r, b, d = self.rotate_X().rotate_X()._unpack_faces()
-
-        while l[fci] != 'L':
-            u, l, f, r, b, d = self.rotate_Y()._unpack_faces()
-
-        new_cube = self.__class__(u, l, f, r, b, d)
+    @classmethod
+    def whole_cube_rotations(cls):
+        """
+        The 24 orientations of the cube as ``(rotation moves, sticker
+        permutation)`` pairs, identity first, each with a shortest move
+        string.
+        """
+        rotations = cls._ROTATIONS
+        if rotations is None:
+            perms = cls.move_permutations()
+            identity = tuple(range(6 * cls.SIZE * cls.SIZE))
+            found = {identity: ''}
+            frontier = [identity]
+            while frontier:
+                next_frontier = []
+                for perm in frontier:
+                    for move in ('X', "X'", 'X2', 'Y', "Y'", 'Y2', 'Z', "Z'", 'Z2'):
+                        rotated = compose_permutations(perm, perms[move])
+                        if rotated not in found:
+                            found[rotated] = f'{found[perm]} {move}'.strip()
+                            next_frontier.append(rotated)
+                frontier = next_frontier
+            rotations = tuple((name, perm) for perm, name in found.items())
+            cls._ROTATIONS = rotations
+        return rotations
 
-        return new_cube
+    @classmethod
+    def _solved_stickers(cls):
+        solved = cls._SOLVED_STICKERS
+        if solved is None:
+            stickers = cls.make_cube().stickers
+            solved = frozenset(bytes(stickers[i] for i in perm) for _, perm in cls.whole_cube_rotations())
+            cls._SOLVED_STICKERS = solved
+        return solved
 
-    def is_solved(self):
-        print(self.to_cube_string())
+    @classmethod
+    def _orientation_table(cls):
+        """
+        How to find the rotation that brings a cube to the standard
+        orientation. With centres it is looked up by the colours of the U
+        and F centres; without, each rotation is tried until the DBL corner
+        lands home, so the table lists the stickers each one brings to the
+        DBL facelets. Entries end in ``(rotation moves, permutation,
+        gather)``.
+        """
+        table = cls._ORIENTATIONS
+        if table is None:
+            size = cls.SIZE
+            fc_size = size * size
+            rotations = [(name, perm, itemgetter(*perm)) for name, perm in cls.whole_cube_rotations()]
+            if size % 2:
+                centre = (size // 2) * size + size // 2
+                u, f = centre, FACES.index('F') * fc_size + centre
+                table = {}
+                for name, perm, gather in rotations:
+                    # The cube that this rotation brings home shows these centres.
+                    inverse = _inverse_permutation(perm)
+                    table[(inverse[u] // fc_size, inverse[f] // fc_size)] = (name, perm, gather)
+            else:
+                d = FACES.index('D') * fc_size + (size - 1) * size
+                b = FACES.index('B') * fc_size + fc_size - 1
+                l = FACES.index('L') * fc_size + (size - 1) * size
+                table = tuple((perm[d], perm[b], perm[l], (name, perm, gather)) for name, perm, gather in rotations)
+            cls._ORIENTATIONS = table
+        return table
+
+    def _orientation(self):
+        # The rotation found is relative to the stored layout, not the frame.
+        stickers = self._stickers
+        table = self._ORIENTATIONS or self._orientation_table()
+        if self._size % 2:
+            fc_size = self._size * self._size
+            centre = (self._size // 2) * self._size + self._size // 2
+            try:
+                return table[(stickers[centre], stickers[2 * fc_size + centre])]
+            except KeyError:
+                raise ValueError('The U and F centres are not adjacent') from None
+        for d, b, l, orientation in table:
+            if stickers[d] == 5 and stickers[b] == 4 and stickers[l] == 1:
+                return orientation
+        raise ValueError('No DBL corner on this cube')
+
+    def orientation_rotation(self):
+        """
+        The whole-cube rotation moves that bring this cube to the standard
+        orientation, '' if it is already there.
+        """
+        name = self._orientation()[0]
+        if not self._frame:
+            return name
+        frames = self._FRAMES or self._frame_tables()
+        inverse = frames.perms[frames.inverses[self._frame]]
+        rotation = frames.index[compose_permutations(inverse, frames.perms[frames.by_name[name]])]
+        return self.whole_cube_rotations()[rotation][0]
+
+    def canonical_orientation(self) -> Self:
+        """
+        This cube turned to the standard orientation: centres at home for
+        odd sizes, the DBL corner at home for even ones. Only the frame
+        changes, the stickers are shared.
+        """
+        name = self._orientation()[0]
+        frames = self._FRAMES or self._frame_tables()
+        frame = frames.by_name[name]
+        if frame == self._frame:
+            return self
+        return self._from_frame(self._stickers, frame)
 
-        u, l, f, r, b, d = self._unpack_faces()
-        for face in (u, l, f, r, b, d):
-            if len(set(face)) > 1:
-                return False
+    def correct_face_orientation(self):
+        return self.canonical_orientation()
 
-        cbstr = self.correct_face_orientation().to_cube_string()
-        print(cbstr)
-        new_cbstr = self.make_cube().to_cube_string()
-        print(new_cbstr)
-        return cbstr == new_cbstr
+    def is_solved(self):
+        """
+        Whether every face is one colour, in any orientation of the cube.
+        """
+        # Solved in any orientation, so the frame does not matter.
+        return self._stickers in (self._SOLVED_STICKERS or self._solved_stickers())
 
     def to_cube_string(self):
-        flattened = sum(self._unpack_faces(), [])
-        cube_str = ''.join(flattened)
+        cube_str = self.stickers.translate(_DECODE_STICKERS).decode('ascii')
         return cube_str
 
     @classmethod
@@ -443,6 +936,8 @@ class Cube(ABC):
 
 
 class Cube_3x3x3(Cube):
+    __slots__ = ()
+
     SIZE = 3
 
     def __init__(self, u, l, f, r, b, d):
@@ -487,9 +982,8 @@ class Cube_3x3x3(Cube):
 
         return new_face
 
-    def move_U(self):
-        u, l, f, r, b, d = self._unpack_faces()
-
+    @classmethod
+    def _move_U_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -497,7 +991,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_u = self._turn_face_clockwise(new_u)
+        new_u = cls._turn_face_clockwise(new_u)
 
         new_l[0] = f[0]
         new_l[1] = f[1]
@@ -515,13 +1009,10 @@ class Cube_3x3x3(Cube):
         new_b[1] = l[1]
         new_b[2] = l[2]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_u(self):
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_u_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -529,7 +1020,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_u = self._turn_face_anticlockwise(new_u)
+        new_u = cls._turn_face_anticlockwise(new_u)
 
         new_f[0] = l[0]
         new_f[1] = l[1]
@@ -547,14 +1038,10 @@ class Cube_3x3x3(Cube):
         new_l[1] = b[1]
         new_l[2] = b[2]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_R(self):
-        # print('Performing R move')
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_R_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -562,7 +1049,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_r = self._turn_face_clockwise(new_r)
+        new_r = cls._turn_face_clockwise(new_r)
 
         new_f[2] = d[2]
         new_f[5] = d[5]
@@ -580,13 +1067,10 @@ class Cube_3x3x3(Cube):
         new_d[5] = b[3]
         new_d[8] = b[0]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_r(self):
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_r_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -594,7 +1078,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_r = self._turn_face_anticlockwise(new_r)
+        new_r = cls._turn_face_anticlockwise(new_r)
 
         new_d[2] = f[2]
         new_d[5] = f[5]
@@ -612,13 +1096,10 @@ class Cube_3x3x3(Cube):
         new_b[3] = d[5]
         new_b[0] = d[8]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_F(self):
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_F_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -626,7 +1107,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_f = self._turn_face_clockwise(new_f)
+        new_f = cls._turn_face_clockwise(new_f)
 
         new_l[2] = d[0]
         new_l[5] = d[1]
@@ -644,13 +1125,10 @@ class Cube_3x3x3(Cube):
         new_d[1] = r[3]
         new_d[2] = r[0]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_f(self):
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_f_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -658,7 +1136,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_f = self._turn_face_anticlockwise(new_f)
+        new_f = cls._turn_face_anticlockwise(new_f)
 
         new_d[0] = l[2]
         new_d[1] = l[5]
@@ -676,13 +1154,10 @@ class Cube_3x3x3(Cube):
         new_r[3] = d[1]
         new_r[0] = d[2]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_L(self):
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_L_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -690,7 +1165,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_l = self._turn_face_clockwise(new_l)
+        new_l = cls._turn_face_clockwise(new_l)
 
         new_f[0] = u[0]
         new_f[3] = u[3]
@@ -708,13 +1183,10 @@ class Cube_3x3x3(Cube):
         new_d[3] = f[3]
         new_d[6] = f[6]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_l(self):
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_l_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -722,7 +1194,7 @@ class Cube_3x3x3(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_l = self._turn_face_anticlockwise(new_l)
+        new_l = cls._turn_face_anticlockwise(new_l)
 
         new_u[0] = f[0]
         new_u[3] = f[3]
@@ -740,21 +1212,123 @@ class Cube_3x3x3(Cube):
         new_f[3] = d[3]
         new_f[6] = d[6]
 
-        new_cube = Cube_3x3x3(new_u, new_l, new_f, new_r, new_b, new_d)
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
-        return new_cube
+    @classmethod
+    def _move_B_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
+
+        new_b = cls._turn_face_clockwise(new_b)
+
+        new_u[0] = r[2]
+        new_u[1] = r[5]
+        new_u[2] = r[8]
+
+        new_l[0] = u[2]
+        new_l[3] = u[1]
+        new_l[6] = u[0]
+
+        new_r[2] = d[8]
+        new_r[5] = d[7]
+        new_r[8] = d[6]
+
+        new_d[6] = l[0]
+        new_d[7] = l[3]
+        new_d[8] = l[6]
 
-    def move_B(self):
-        return self.rotate_X().move_U().rotate_x()  #  self.rotate_x(self.move_U(self.rotate_X(cube)))
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
-    def move_b(self):
-        return self.rotate_X().move_u().rotate_x()  #   rotate_x(move_u(rotate_X(cube)))
+    @classmethod
+    def _move_b_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
+
+        new_b = cls._turn_face_anticlockwise(new_b)
+
+        new_u[0] = l[6]
+        new_u[1] = l[3]
+        new_u[2] = l[0]
+
+        new_r[2] = u[0]
+        new_r[5] = u[1]
+        new_r[8] = u[2]
+
+        new_l[0] = d[6]
+        new_l[3] = d[7]
+        new_l[6] = d[8]
+
+        new_d[6] = r[8]
+        new_d[7] = r[5]
+        new_d[8] = r[2]
+
+        return new_u, new_l, new_f, new_r, new_b, new_d
+
+    @classmethod
+    def _move_D_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
 
-    def move_D(self):
-        return self.rotate_x().move_F().rotate_X() # rotate_X(move_F(rotate_x(cube)))
+        new_d = cls._turn_face_clockwise(new_d)
 
-    def move_d(self):
-        return self.rotate_x().move_f().rotate_X()  # rotate_X(move_f(rotate_x(cube)))
+        new_l[6] = b[6]
+        new_l[7] = b[7]
+        new_l[8] = b[8]
+
+        new_f[6] = l[6]
+        new_f[7] = l[7]
+        new_f[8] = l[8]
+
+        new_r[6] = f[6]
+        new_r[7] = f[7]
+        new_r[8] = f[8]
+
+        new_b[6] = r[6]
+        new_b[7] = r[7]
+        new_b[8] = r[8]
+
+        return new_u, new_l, new_f, new_r, new_b, new_d
+
+    @classmethod
+    def _move_d_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
+
+        new_d = cls._turn_face_anticlockwise(new_d)
+
+        new_l[6] = f[6]
+        new_l[7] = f[7]
+        new_l[8] = f[8]
+
+        new_f[6] = r[6]
+        new_f[7] = r[7]
+        new_f[8] = r[8]
+
+        new_r[6] = b[6]
+        new_r[7] = b[7]
+        new_r[8] = b[8]
+
+        new_b[6] = l[6]
+        new_b[7] = l[7]
+        new_b[8] = l[8]
+
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
     def face_centre_index(self):
         return 4
@@ -773,6 +1347,8 @@ class Cube_3x3x3(Cube):
 
 
 class Cube_2x2x2(Cube):
+    __slots__ = ()
+
     SIZE = 2
 
     def __init__(self, u, l, f, r, b, d):
@@ -816,9 +1392,8 @@ class Cube_2x2x2(Cube):
 
         return new_face
 
-    def move_U(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
-
+    @classmethod
+    def _move_U_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -826,7 +1401,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_u = self._turn_face_clockwise(new_u)
+        new_u = cls._turn_face_clockwise(new_u)
 
         new_l[0] = f[0]
         new_l[1] = f[1]
@@ -840,13 +1415,10 @@ class Cube_2x2x2(Cube):
         new_b[0] = l[0]
         new_b[1] = l[1]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_u(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_u_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -854,7 +1426,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_u = self._turn_face_anticlockwise(new_u)
+        new_u = cls._turn_face_anticlockwise(new_u)
 
         new_f[0] = l[0]
         new_f[1] = l[1]
@@ -868,13 +1440,10 @@ class Cube_2x2x2(Cube):
         new_l[0] = b[0]
         new_l[1] = b[1]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_R(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_R_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -882,7 +1451,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_r = self._turn_face_clockwise(new_r)
+        new_r = cls._turn_face_clockwise(new_r)
 
         new_f[1] = d[1]
         new_f[3] = d[3]
@@ -896,13 +1465,10 @@ class Cube_2x2x2(Cube):
         new_d[1] = b[2]
         new_d[3] = b[0]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_r(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_r_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -910,7 +1476,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_r = self._turn_face_anticlockwise(new_r)
+        new_r = cls._turn_face_anticlockwise(new_r)
 
         new_d[1] = f[1]
         new_d[3] = f[3]
@@ -924,13 +1490,10 @@ class Cube_2x2x2(Cube):
         new_b[2] = d[1]
         new_b[0] = d[3]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_F(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_F_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -938,7 +1501,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_f = self._turn_face_clockwise(new_f)
+        new_f = cls._turn_face_clockwise(new_f)
 
         new_l[1] = d[0]
         new_l[3] = d[1]
@@ -952,13 +1515,10 @@ class Cube_2x2x2(Cube):
         new_d[0] = r[2]
         new_d[1] = r[0]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_f(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_f_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -966,7 +1526,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_f = self._turn_face_anticlockwise(new_f)
+        new_f = cls._turn_face_anticlockwise(new_f)
 
         new_d[0] = l[1]
         new_d[1] = l[3]
@@ -980,13 +1540,10 @@ class Cube_2x2x2(Cube):
         new_r[2] = d[0]
         new_r[0] = d[1]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_L(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_L_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -994,7 +1551,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_l = self._turn_face_clockwise(new_l)
+        new_l = cls._turn_face_clockwise(new_l)
 
         new_f[0] = u[0]
         new_f[2] = u[2]
@@ -1008,13 +1565,10 @@ class Cube_2x2x2(Cube):
         new_d[0] = f[0]
         new_d[2] = f[2]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
-
-        return new_cube
-
-    def move_l(self) -> Self:
-        u, l, f, r, b, d = self._unpack_faces()
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
+    @classmethod
+    def _move_l_faces(cls, u, l, f, r, b, d):
         new_u = u[:]
         new_l = l[:]
         new_f = f[:]
@@ -1022,7 +1576,7 @@ class Cube_2x2x2(Cube):
         new_b = b[:]
         new_d = d[:]
 
-        new_l = self._turn_face_anticlockwise(new_l)
+        new_l = cls._turn_face_anticlockwise(new_l)
 
         new_u[0] = f[0]
         new_u[2] = f[2]
@@ -1036,42 +1590,362 @@ class Cube_2x2x2(Cube):
         new_f[0] = d[0]
         new_f[2] = d[2]
 
-        new_cube = self.__class__(new_u, new_l, new_f, new_r, new_b, new_d)
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
-        return new_cube
+    @classmethod
+    def _move_B_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
+
+        new_b = cls._turn_face_clockwise(new_b)
+
+        new_u[0] = r[1]
+        new_u[1] = r[3]
+
+        new_l[0] = u[1]
+        new_l[2] = u[0]
+
+        new_r[1] = d[3]
+        new_r[3] = d[2]
+
+        new_d[2] = l[0]
+        new_d[3] = l[2]
+
+        return new_u, new_l, new_f, new_r, new_b, new_d
+
+    @classmethod
+    def _move_b_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
+
+        new_b = cls._turn_face_anticlockwise(new_b)
+
+        new_u[0] = l[2]
+        new_u[1] = l[0]
+
+        new_r[1] = u[0]
+        new_r[3] = u[1]
+
+        new_l[0] = d[2]
+        new_l[2] = d[3]
+
+        new_d[2] = r[3]
+        new_d[3] = r[1]
+
+        return new_u, new_l, new_f, new_r, new_b, new_d
+
+    @classmethod
+    def _move_D_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
+
+        new_d = cls._turn_face_clockwise(new_d)
+
+        new_l[2] = b[2]
+        new_l[3] = b[3]
+
+        new_f[2] = l[2]
+        new_f[3] = l[3]
+
+        new_r[2] = f[2]
+        new_r[3] = f[3]
+
+        new_b[2] = r[2]
+        new_b[3] = r[3]
+
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
-    def move_B(self):
-        return self.rotate_X().move_U().rotate_x()  #  self.rotate_x(self.move_U(self.rotate_X(cube)))
+    @classmethod
+    def _move_d_faces(cls, u, l, f, r, b, d):
+        new_u = u[:]
+        new_l = l[:]
+        new_f = f[:]
+        new_r = r[:]
+        new_b = b[:]
+        new_d = d[:]
 
-    def move_b(self):
-        return self.rotate_X().move_u().rotate_x()  #   rotate_x(move_u(rotate_X(cube)))
+        new_d = cls._turn_face_anticlockwise(new_d)
 
-    def move_D(self):
-        return self.rotate_x().move_F().rotate_X() # rotate_X(move_F(rotate_x(cube)))
+        new_l[2] = f[2]
+        new_l[3] = f[3]
+
+        new_f[2] = r[2]
+        new_f[3] = r[3]
+
+        new_r[2] = b[2]
+        new_r[3] = b[3]
+
+        new_b[2] = l[2]
+        new_b[3] = l[3]
 
-    def move_d(self):
-        return self.rotate_x().move_f().rotate_X()  # rotate_X(move_f(rotate_x(cube)))
+        return new_u, new_l, new_f, new_r, new_b, new_d
 
     def face_centre_index(self):
         return 0
 
 
+class Cube_NxNxN(Cube):
+    """
+    A cube of any size, with every move generated by
+    ``layer_move_permutations``. ``cube_class(size)`` makes one subclass
+    per size, so each gets its own move tables.
+    """
+    __slots__ = ()
+
+    def __init__(self, u, l, f, r, b, d):
+        super().__init__(self.SIZE, u, l, f, r, b, d)
+
+    def __reduce__(self):
+        # The per-size classes are made at run time, so pickle by size.
+        return _cube_from_stickers, (self.SIZE, self.stickers)
+
+    @classmethod
+    def make_cube(cls):
+        return cls._from_stickers(bytes(i for i in range(len(FACES)) for _ in range(cls.SIZE * cls.SIZE)))
+
+    @classmethod
+    def from_cube_string(cls, cube_string):
+        fc_size = cls.SIZE * cls.SIZE
+        if len(cube_string) != 6 * fc_size:
+            raise ValueError(f'{cls.__name__} needs {6 * fc_size} stickers, got {len(cube_string)}')
+        return cls(*(list(cube_string[i:i + fc_size]) for i in range(0, 6 * fc_size, fc_size)))
+
+    @classmethod
+    def _quarter_turn_definitions(cls):
+        return {}
+
+    @staticmethod
+    def _turn_face_clockwise(face):
+        size = math.isqrt(len(face))
+        return [face[(size - 1 - col) * size + row] for row in range(size) for col in range(size)]
+
+    @staticmethod
+    def _turn_face_anticlockwise(face):
+        size = math.isqrt(len(face))
+        return [face[col * size + size - 1 - row] for row in range(size) for col in range(size)]
+
+    @classmethod
+    def _permuted_faces(cls, move, faces):
+        stickers = list(itertools.chain(*faces))
+        fc_size = cls.SIZE * cls.SIZE
+        moved = [stickers[i] for i in cls.move_permutations()[move]]
+        return tuple(moved[i:i + fc_size] for i in range(0, len(moved), fc_size))
+
+    @classmethod
+    def _move_U_faces(cls, *faces):
+        return cls._permuted_faces('U', faces)
+
+    @classmethod
+    def _move_u_faces(cls, *faces):
+        return cls._permuted_faces("U'", faces)
+
+    @classmethod
+    def _move_L_faces(cls, *faces):
+        return cls._permuted_faces('L', faces)
+
+    @classmethod
+    def _move_l_faces(cls, *faces):
+        return cls._permuted_faces("L'", faces)
+
+    @classmethod
+    def _move_F_faces(cls, *faces):
+        return cls._permuted_faces('F', faces)
+
+    @classmethod
+    def _move_f_faces(cls, *faces):
+        return cls._permuted_faces("F'", faces)
+
+    @classmethod
+    def _move_R_faces(cls, *faces):
+        return cls._permuted_faces('R', faces)
+
+    @classmethod
+    def _move_r_faces(cls, *faces):
+        return cls._permuted_faces("R'", faces)
+
+    @classmethod
+    def _move_B_faces(cls, *faces):
+        return cls._permuted_faces('B', faces)
+
+    @classmethod
+    def _move_b_faces(cls, *faces):
+        return cls._permuted_faces("B'", faces)
+
+    @classmethod
+    def _move_D_faces(cls, *faces):
+        return cls._permuted_faces('D', faces)
+
+    @classmethod
+    def _move_d_faces(cls, *faces):
+        return cls._permuted_faces("D'", faces)
+
+    def face_centre_index(self):
+        return (self._size // 2) * (self._size + 1) if self._size % 2 else 0
+
+
+_CUBE_CLASSES = {}
+
+
+def _cube_from_stickers(size, stickers):
+    return cube_class(size)._from_stickers(stickers)
+
+
+class MoveSequence:
+    """
+    A move sequence composed into a single sticker permutation.
+    """
+    __slots__ = ('moves', 'perm', '_gather', 'changes')
+
+    def __init__(self, moves, perm):
+        self.moves = tuple(moves)
+        self.perm = tuple(perm)
+        self._gather = itemgetter(*self.perm)
+        self.changes = tuple((i, j) for i, j in enumerate(self.perm) if i != j)
+
+    def __str__(self):
+        return ' '.join(self.moves)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({str(self)!r})'
+
+    def __len__(self):
+        return len(self.moves)
+
+    def apply(self, cube):
+        return cube._from_stickers(bytes(self._gather(cube.stickers)))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_normalized(cls, moves):
+    perms = cls.move_permutations()
+    composed = tuple(range(6 * cls.SIZE * cls.SIZE))
+    for m in moves:
+        try:
+            composed = compose_permutations(composed, perms[m])
+        except KeyError:
+            raise NotImplementedError(m) from None
+    return MoveSequence(moves, composed)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_move_sequence(cls, move_sequence_str):
+    # Cached on the string as given too, so repeated calls skip normalizing.
+    return _compile_normalized(cls, tuple(normalise_move(m) for m in move_sequence_str.split()))
+
+
+class MutableCube:
+    """
+    A cube state that moves in place, for hot loops such as long random
+    walks.
+
+    The stickers live in a preallocated ``bytearray`` and a move copies
+    them into a second, scratch ``bytearray`` and gathers the moved ones
+    back, so applying a move allocates nothing that outlives the call.
+    ``copy()`` and ``to_cube()`` take snapshots.
+    """
+    __slots__ = ('_cube_class', '_buffer', '_scratch', '_changes')
+
+    def __init__(self, cube):
+        self._cube_class = cube.__class__
+        self._buffer = bytearray(cube.stickers)
+        self._scratch = bytearray(len(self._buffer))
+        self._changes = cube._move_changes()
+
+    @property
+    def size(self):
+        return self._cube_class.SIZE
+
+    @property
+    def stickers(self):
+        return bytes(self._buffer)
+
+    def apply_move(self, move_str):
+        try:
+            changes = self._changes[move_str]
+        except KeyError:
+            try:
+                changes = self._changes[normalise_move(move_str)]
+            except KeyError:
+                raise NotImplementedError(move_str) from None
+        buffer, scratch = self._buffer, self._scratch
+        scratch[:] = buffer
+        for i, j in changes:
+            buffer[i] = scratch[j]
+        return self
+
+    def apply_moves(self, moves):
+        for move in moves:
+            self.apply_move(move)
+        return self
+
+    def apply_move_sequence(self, move_sequence):
+        """
+        Apply a ``MoveSequence`` or a move sequence string in one pass.
+        """
+        if isinstance(move_sequence, str):
+            move_sequence = self._cube_class.compile_move_sequence(move_sequence)
+        buffer, scratch = self._buffer, self._scratch
+        scratch[:] = buffer
+        for i, j in move_sequence.changes:
+            buffer[i] = scratch[j]
+        return self
+
+    def copy(self):
+        new_cube = MutableCube.__new__(MutableCube)
+        new_cube._cube_class = self._cube_class
+        new_cube._buffer = bytearray(self._buffer)
+        new_cube._scratch = bytearray(len(self._buffer))
+        new_cube._changes = self._changes
+        return new_cube
+
+    def to_cube(self):
+        return self._cube_class._from_stickers(bytes(self._buffer))
+
+    def __eq__(self, other):
+        if not isinstance(other, MutableCube):
+            return NotImplemented
+        return self._cube_class is other._cube_class and self._buffer == other._buffer
+
+    # Mutable, so not hashable.
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.to_cube()!r})'
+
+
 def from_cube_string(cube_string):
-    match len(cube_string):
-        case 54:
-            return Cube_3x3x3.from_cube_string(cube_string)
-        case 24:
-            return Cube_2x2x2.from_cube_string(cube_string)
-    raise NotImplementedError(cube_string)
+    size = math.isqrt(len(cube_string) // 6)
+    if size < 2 or 6 * size * size != len(cube_string):
+        raise NotImplementedError(cube_string)
+    return cube_class(size).from_cube_string(cube_string)
 
 
-def make_cube(size):
+def cube_class(size):
     match size:
         case 3:
-            return Cube_3x3x3.make_cube()
+            return Cube_3x3x3
         case 2:
-            return Cube_2x2x2.make_cube()
-    raise NotImplementedError(size)
-
+            return Cube_2x2x2
+    if not isinstance(size, int) or size < 2:
+        raise NotImplementedError(size)
+    cls = _CUBE_CLASSES.get(size)
+    if cls is None:
+        cls = type(f'Cube_{size}x{size}x{size}', (Cube_NxNxN,), {'__slots__': (), 'SIZE': size, '__module__': __name__})
+        _CUBE_CLASSES[size] = cls
+    return cls
 
 
+def make_cube(size):
+    return cube_class(size).make_cube()
@@ -0,0 +1,396 @@
+from abc import ABC, abstractmethod
+
+try:
+    from typing import Self
+except ImportError:
+    Self = None
+
+from .cube import Cube_2x2x2, Cube_3x3x3, FACES, STATES
+
+CORNERS = ('URF', 'UFL', 'ULB', 'UBR', 'DFR', 'DLF', 'DBL', 'DRB')
+EDGES = ('UR', 'UF', 'UL', 'UB', 'DR', 'DF', 'DL', 'DB', 'FR', 'FL', 'BL', 'BR')
+
+# Facelets of every corner and edge position as (face, row, column), with -1
+# standing for the last row/column of the face. Corner facelets start on the
+# U or D face and go clockwise around the corner; edge facelets start on the
+# U or D face, or on F or B for the middle layer edges.
+CORNER_FACELETS = (
+    (('U', -1, -1), ('R', 0, 0), ('F', 0, -1)),
+    (('U', -1, 0), ('F', 0, 0), ('L', 0, -1)),
+    (('U', 0, 0), ('L', 0, 0), ('B', 0, -1)),
+    (('U', 0, -1), ('B', 0, 0), ('R', 0, -1)),
+    (('D', 0, -1), ('F', -1, -1), ('R', -1, 0)),
+    (('D', 0, 0), ('L', -1, -1), ('F', -1, 0)),
+    (('D', -1, 0), ('B', -1, -1), ('L', -1, 0)),
+    (('D', -1, -1), ('R', -1, -1), ('B', -1, 0)),
+)
+
+EDGE_FACELETS = (
+    (('U', 1, -1), ('R', 0, 1)),
+    (('U', -1, 1), ('F', 0, 1)),
+    (('U', 1, 0), ('L', 0, 1)),
+    (('U', 0, 1), ('B', 0, 1)),
+    (('D', 1, -1), ('R', -1, 1)),
+    (('D', 0, 1), ('F', -1, 1)),
+    (('D', 1, 0), ('L', -1, 1)),
+    (('D', -1, 1), ('B', -1, 1)),
+    (('F', 1, -1), ('R', 1, 0)),
+    (('F', 1, 0), ('L', 1, -1)),
+    (('B', 1, -1), ('L', 1, 0)),
+    (('B', 1, 0), ('R', 1, -1)),
+)
+
+
+def sticker_index(size, face, row, column):
+    """
+    Index of a facelet in the flat sticker sequence of a cube of ``size``.
+    """
+    return FACES.index(face) * size * size + (row % size) * size + (column % size)
+
+
+def _facelet_indices(size, facelets):
+    return tuple(tuple(sticker_index(size, *f) for f in cubie) for cubie in facelets)
+
+
+def _colour_codes(names):
+    return tuple(tuple(STATES.index(c) for c in name) for name in names)
+
+
+_CORNER_COLOURS = _colour_codes(CORNERS)
+_EDGE_COLOURS = _colour_codes(EDGES)
+_U_D = (STATES.index('U'), STATES.index('D'))
+
+
+def permutation_parity(perm):
+    """
+    0 for an even permutation, 1 for an odd one.
+    """
+    parity = 0
+    for i in range(len(perm)):
+        for j in range(i + 1, len(perm)):
+            if perm[i] > perm[j]:
+                parity ^= 1
+    return parity
+
+
+def permutation_rank(perm):
+    """
+    Lexicographic rank of a permutation of ``range(len(perm))``.
+    """
+    rank = 0
+    remaining = sorted(perm)
+    for p in perm:
+        i = remaining.index(p)
+        rank = rank * len(remaining) + i
+        del remaining[i]
+    return rank
+
+
+def permutation_unrank(rank, n):
+    digits = []
+    for base in range(1, n + 1):
+        rank, digit = divmod(rank, base)
+        digits.append(digit)
+    remaining = list(range(n))
+    return tuple(remaining.pop(d) for d in reversed(digits))
+
+
+def orientation_rank(ori, base):
+    """
+    Rank of an orientation vector whose sum is 0 modulo ``base``.
+
+    The last entry is implied by the others and is not encoded.
+    """
+    rank = 0
+    for o in ori[:-1]:
+        rank = rank * base + o
+    return rank
+
+
+def orientation_unrank(rank, n, base):
+    ori = [0] * n
+    for i in range(n - 2, -1, -1):
+        rank, ori[i] = divmod(rank, base)
+    ori[-1] = -sum(ori) % base
+    return tuple(ori)
+
+
+def _corners_from_stickers(stickers, corner_facelets):
+    cp = []
+    co = []
+    for facelets in corner_facelets:
+        colours = [stickers[i] for i in facelets]
+        for ori, colour in enumerate(colours):
+            if colour in _U_D:
+                break
+        else:
+            raise ValueError(f'No U or D sticker on corner {colours}')
+        key = tuple(colours[(ori + n) % 3] for n in range(3))
+        try:
+            cp.append(_CORNER_COLOURS.index(key))
+        except ValueError:
+            raise ValueError(f'Invalid corner colours {key}') from None
+        co.append(ori)
+    return tuple(cp), tuple(co)
+
+
+def _corners_to_stickers(stickers, corner_facelets, cp, co):
+    for facelets, corner, ori in zip(corner_facelets, cp, co):
+        for n, colour in enumerate(_CORNER_COLOURS[corner]):
+            stickers[facelets[(n + ori) % 3]] = colour
+
+
+class CubieCube(ABC):
+    """
+    Cube state as a permutation and orientation of its cubies.
+
+    ``cp[i]`` is the corner cubie sitting at corner position ``i`` and
+    ``co[i]`` its clockwise twist; ``ep``/``eo`` do the same for edges on
+    cubes that have them. Cubies and positions are numbered as in
+    ``CORNERS`` and ``EDGES``. Instances are treated as immutable.
+
+    Moves are applied by composing with the cubie form of the move, which
+    is derived from the sticker move tables of ``CUBE_CLASS``.
+    """
+    __slots__ = ()
+
+    CUBE_CLASS = None
+    _MOVE_CUBES = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._MOVE_CUBES = None
+
+    @classmethod
+    @abstractmethod
+    def make_cube(cls) -> Self:
+        raise NotImplementedError()
+
+    @classmethod
+    @abstractmethod
+    def from_cube(cls, cube) -> Self:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def to_cube(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def multiply(self, other) -> Self:
+        """
+        The state reached by applying ``other`` to this one.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def inverse(self) -> Self:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def is_valid(self):
+        raise NotImplementedError()
+
+    @classmethod
+    def from_cube_string(cls, cube_string) -> Self:
+        return cls.from_cube(cls.CUBE_CLASS.from_cube_string(cube_string))
+
+    def to_cube_string(self):
+        return self.to_cube().to_cube_string()
+
+    @classmethod
+    def supported_moves(cls):
+        return cls.CUBE_CLASS.make_cube().non_rotational_moves()
+
+    @classmethod
+    def move_cubes(cls):
+        """
+        Cubie form of every supported move, keyed by move string.
+        """
+        move_cubes = cls._MOVE_CUBES
+        if move_cubes is None:
+            solved = cls.CUBE_CLASS.make_cube()
+            move_cubes = {m: cls.from_cube(solved.make_move(m)) for m in cls.supported_moves()}
+            cls._MOVE_CUBES = move_cubes
+        return move_cubes
+
+    def make_move(self, move_str) -> Self:
+        try:
+            move_cube = self.move_cubes()[move_str.upper()]
+        except KeyError:
+            raise NotImplementedError(move_str) from None
+        return self.multiply(move_cube)
+
+    def is_solved(self):
+        return self == self.make_cube()
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)}' for name in self.__slots__)
+        return f'{self.__class__.__name__}({fields})'
+
+
+class CubieCube_3x3x3(CubieCube):
+    __slots__ = ('cp', 'co', 'ep', 'eo')
+
+    CUBE_CLASS = Cube_3x3x3
+    _CORNER_FACELETS = _facelet_indices(3, CORNER_FACELETS)
+    _EDGE_FACELETS = _facelet_indices(3, EDGE_FACELETS)
+    _CENTRES = tuple(sticker_index(3, f, 1, 1) for f in FACES)
+
+    def __init__(self, cp, co, ep, eo):
+        self.cp = tuple(cp)
+        self.co = tuple(co)
+        self.ep = tuple(ep)
+        self.eo = tuple(eo)
+
+    @classmethod
+    def make_cube(cls):
+        return cls(range(8), (0,) * 8, range(12), (0,) * 12)
+
+    @classmethod
+    def from_cube(cls, cube):
+        """
+        Cubie form of a ``Cube_3x3x3``.
+
+        The cubies are read relative to the home position of the centres,
+        so cubes turned by whole-cube rotations have to be brought back to
+        the standard orientation first.
+        """
+        stickers = cube.stickers
+        if any(stickers[i] != colour for colour, i in enumerate(cls._CENTRES)):
+            raise ValueError('Centres are not in their home position')
+        cp, co = _corners_from_stickers(stickers, cls._CORNER_FACELETS)
+        ep = []
+        eo = []
+        for facelets in cls._EDGE_FACELETS:
+            colours = tuple(stickers[i] for i in facelets)
+            if colours in _EDGE_COLOURS:
+                ep.append(_EDGE_COLOURS.index(colours))
+                eo.append(0)
+            elif colours[::-1] in _EDGE_COLOURS:
+                ep.append(_EDGE_COLOURS.index(colours[::-1]))
+                eo.append(1)
+            else:
+                raise ValueError(f'Invalid edge colours {colours}')
+        return cls(cp, co, ep, eo)
+
+    def to_cube(self):
+        stickers = bytearray(54)
+        for colour, i in enumerate(self._CENTRES):
+            stickers[i] = colour
+        _corners_to_stickers(stickers, self._CORNER_FACELETS, self.cp, self.co)
+        for facelets, edge, ori in zip(self._EDGE_FACELETS, self.ep, self.eo):
+            for n, colour in enumerate(_EDGE_COLOURS[edge]):
+                stickers[facelets[(n + ori) % 2]] = colour
+        return self.CUBE_CLASS.from_stickers(stickers)
+
+    def multiply(self, other):
+        a_cp, a_co, a_ep, a_eo = self.cp, self.co, self.ep, self.eo
+        return self.__class__(
+            [a_cp[i] for i in other.cp],
+            [(a_co[i] + o) % 3 for i, o in zip(other.cp, other.co)],
+            [a_ep[i] for i in other.ep],
+            [(a_eo[i] + o) % 2 for i, o in zip(other.ep, other.eo)],
+        )
+
+    def inverse(self):
+        cp = [0] * 8
+        co = [0] * 8
+        for i, (c, o) in enumerate(zip(self.cp, self.co)):
+            cp[c] = i
+            co[c] = -o % 3
+        ep = [0] * 12
+        eo = [0] * 12
+        for i, (e, o) in enumerate(zip(self.ep, self.eo)):
+            ep[e] = i
+            eo[e] = o
+        return self.__class__(cp, co, ep, eo)
+
+    def is_valid(self):
+        return (
+            sorted(self.cp) == list(range(8))
+            and sorted(self.ep) == list(range(12))
+            and sum(self.co) % 3 == 0
+            and sum(self.eo) % 2 == 0
+            and permutation_parity(self.cp) == permutation_parity(self.ep)
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, CubieCube_3x3x3):
+            return NotImplemented
+        return (self.cp, self.co, self.ep, self.eo) == (other.cp, other.co, other.ep, other.eo)
+
+    def __hash__(self):
+        return hash((self.cp, self.co, self.ep, self.eo))
+
+
+class CubieCube_2x2x2(CubieCube):
+    __slots__ = ('cp', 'co')
+
+    CUBE_CLASS = Cube_2x2x2
+    _CORNER_FACELETS = _facelet_indices(2, CORNER_FACELETS)
+
+    def __init__(self, cp, co):
+        self.cp = tuple(cp)
+        self.co = tuple(co)
+
+    @classmethod
+    def make_cube(cls):
+        return cls(range(8), (0,) * 8)
+
+    @classmethod
+    def supported_moves(cls):
+        # Without centres a whole-cube rotation is just another corner permutation.
+        cube = cls.CUBE_CLASS.make_cube()
+        return cube.non_rotational_moves() + cube.whole_cube_rotation_moves()
+
+    @classmethod
+    def from_cube(cls, cube):
+        return cls(*_corners_from_stickers(cube.stickers, cls._CORNER_FACELETS))
+
+    def to_cube(self):
+        stickers = bytearray(24)
+        _corners_to_stickers(stickers, self._CORNER_FACELETS, self.cp, self.co)
+        return self.CUBE_CLASS.from_stickers(stickers)
+
+    def multiply(self, other):
+        a_cp, a_co = self.cp, self.co
+        return self.__class__(
+            [a_cp[i] for i in other.cp],
+            [(a_co[i] + o) % 3 for i, o in zip(other.cp, other.co)],
+        )
+
+    def inverse(self):
+        cp = [0] * 8
+        co = [0] * 8
+        for i, (c, o) in enumerate(zip(self.cp, self.co)):
+            cp[c] = i
+            co[c] = -o % 3
+        return self.__class__(cp, co)
+
+    def is_valid(self):
+        return sorted(self.cp) == list(range(8)) and sum(self.co) % 3 == 0
+
+    def is_solved(self):
+        """
+        Whether the cube is solved in any orientation, as for
+        ``Cube_2x2x2.is_solved``; without centres each whole-cube rotation
+        of the solved cube is a state of its own.
+        """
+        return self.to_cube().is_solved()
+
+    def __eq__(self, other):
+        if not isinstance(other, CubieCube_2x2x2):
+            return NotImplemented
+        return (self.cp, self.co) == (other.cp, other.co)
+
+    def __hash__(self):
+        return hash((self.cp, self.co))
+
+
+def to_cubie_cube(cube):
+    match cube.size:
+        case 3:
+            return CubieCube_3x3x3.from_cube(cube)
+        case 2:
+            return CubieCube_2x2x2.from_cube(cube)
+    raise NotImplementedError(cube.size)
@@ -0,0 +1,240 @@
+"""
+A move engine for big cubes whose cost grows with N rather than N^2.
+
+``Cube.make_move`` and ``MutableCube.apply_move`` touch every one of the
+6*N*N stickers on each move. ``LargeCube`` keeps the stickers in a
+``bytearray`` and moves only what a turn really moves:
+
+* each turned layer cycles its ring of 4*N stickers in place;
+* the stickers of a turned outer face stay where they are; the face just
+  counts how many quarter turns its storage is behind, and every later
+  read or ring update goes through that offset;
+* whole-cube rotations only change the frame: which physical face each
+  face letter currently means. No sticker is touched.
+
+``to_cube()`` resolves the offsets and the frame once, for a snapshot.
+Move names are those of ``layer_move_permutations``.
+"""
+import re
+
+from .cube import (FACE_NORMALS, FACES, ROTATION_FACES, SLICE_FACES, cube_class, normalise_move, sticker_geometry,
+                   turn_clockwise)
+
+_MOVE_PATTERN = re.compile(r"(\d*)([ULFRBDMESXYZ])(w?)(['2]?)")
+
+_NORMAL_FACES = {normal: face for face, normal in FACE_NORMALS.items()}
+
+_IDENTITY_FRAME = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+
+_TABLES = {}
+
+# (frame, face, quarter turns) -> frame after that whole-cube rotation
+_FRAME_TURNS = {}
+
+# frame -> the physical face under each face letter
+_FRAME_FACES = {_IDENTITY_FRAME: {f: f for f in FACES}}
+
+
+def _apply_frame(frame, vector):
+    # ``frame`` holds the images of the x, y and z unit vectors.
+    x, y, z = vector
+    return tuple(x * a + y * b + z * c for a, b, c in zip(*frame))
+
+
+def _turn_frame(frame, face, turns):
+    key = (frame, face, turns)
+    turned = _FRAME_TURNS.get(key)
+    if turned is None:
+        # The cube turns one way, so the frame turns the other: the stickers stay put.
+        axis = FACE_NORMALS[face]
+        columns = []
+        for unit in _IDENTITY_FRAME:
+            for _ in range(4 - turns):
+                unit = turn_clockwise(unit, axis)
+            columns.append(_apply_frame(frame, unit))
+        turned = _FRAME_TURNS[key] = tuple(columns)
+        _FRAME_FACES[turned] = {f: _NORMAL_FACES[_apply_frame(turned, normal)] for f, normal in FACE_NORMALS.items()}
+    return turned
+
+
+def _as_slice(indices):
+    # Ring segments are rows or columns, so their indices are evenly spaced.
+    step = indices[1] - indices[0]
+    stop = indices[-1] + step
+    segment = slice(indices[0], stop if stop >= 0 else None, step)
+    if tuple(range(max(indices) + 1)[segment]) != indices:
+        raise ValueError(f'Ring segment is not evenly spaced: {indices}')
+    return segment
+
+
+class _Tables:
+    """
+    Everything ``LargeCube`` looks up for one cube size, built on demand.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.fc_size = size * size
+        self.geometry = sticker_geometry(size)
+        self.index = {sticker: i for i, sticker in enumerate(self.geometry)}
+        # storage[k][cell]: where a face that is k quarter turns behind keeps the sticker shown at cell.
+        storage = [tuple(range(self.fc_size))]
+        for _ in range(3):
+            previous = storage[-1]
+            storage.append(tuple(previous[(size - 1 - col) * size + row] for row in range(size) for col in range(size)))
+        self.storage = tuple(storage)
+        self._rings = {}
+        self._moves = {}
+        self._frame_maps = {}
+
+    def ring(self, face, depth):
+        """
+        The ring of ``depth`` counted from ``face`` as four segments, each
+        ``(face index, buffer slice for every storage offset)``, where a
+        clockwise quarter turn moves segment ``j`` onto ``j + 1``.
+        """
+        key = (face, depth)
+        ring = self._rings.get(key)
+        if ring is None:
+            axis = FACE_NORMALS[face]
+            level = self.size + 1 - 2 * depth
+            opposite = tuple(-a for a in axis)
+            neighbour = next(f for f in FACES if FACE_NORMALS[f] not in (axis, opposite))
+            start = [(position, normal) for position, normal in self.geometry
+                     if normal == FACE_NORMALS[neighbour] and sum(p * a for p, a in zip(position, axis)) == level]
+            ring = []
+            stickers = start
+            for _ in range(4):
+                cells = [self.index[s] for s in stickers]
+                f = cells[0] // self.fc_size
+                local = [c - f * self.fc_size for c in cells]
+                ring.append((f, tuple(_as_slice(tuple(f * self.fc_size + self.storage[k][c] for c in local))
+                                      for k in range(4))))
+                stickers = [(turn_clockwise(p, axis), turn_clockwise(n, axis)) for p, n in stickers]
+            ring = tuple(ring)
+            self._rings[key] = ring
+        return ring
+
+    def frame_map(self, frame):
+        """
+        For every sticker as seen in ``frame``, its physical sticker index.
+        """
+        frame_map = self._frame_maps.get(frame)
+        if frame_map is None:
+            frame_map = tuple(self.index[(_apply_frame(frame, position), _apply_frame(frame, normal))]
+                              for position, normal in self.geometry)
+            self._frame_maps[frame] = frame_map
+        return frame_map
+
+    def move(self, move_str):
+        """
+        ``(face, depths, quarter turns)`` for a layer move, or ``(face,
+        None, quarter turns)`` for a whole-cube rotation.
+        """
+        parsed = self._moves.get(move_str)
+        if parsed is None:
+            match = _MOVE_PATTERN.fullmatch(normalise_move(move_str))
+            if match is None:
+                raise NotImplementedError(move_str)
+            count, letter, wide, suffix = match.groups()
+            turns = {'': 1, '2': 2, "'": 3}[suffix]
+            size = self.size
+            if letter in ROTATION_FACES:
+                if count or wide:
+                    raise NotImplementedError(move_str)
+                parsed = (ROTATION_FACES[letter], None, turns)
+            elif letter in SLICE_FACES:
+                if count or wide or not size % 2:
+                    raise NotImplementedError(move_str)
+                parsed = (SLICE_FACES[letter], (size // 2 + 1,), turns)
+            else:
+                k = int(count) if count else (2 if wide else 1)
+                # As in Cube, two wide layers are only spelt Rw, never 2Rw.
+                if (count and not (2 if wide else 1) < k < size) or (wide and size < 3):
+                    raise NotImplementedError(move_str)
+                parsed = (letter, tuple(range(1, k + 1)) if wide else (k,), turns)
+            self._moves[move_str] = parsed
+        return parsed
+
+
+def _tables(size):
+    tables = _TABLES.get(size)
+    if tables is None:
+        tables = _TABLES[size] = _Tables(size)
+    return tables
+
+
+class LargeCube:
+    """
+    A mutable cube state for big cubes: a layer move costs O(N) and a
+    whole-cube rotation O(1).
+    """
+    __slots__ = ('_tables', '_buffer', '_offsets', '_frame')
+
+    def __init__(self, cube):
+        self._tables = _tables(cube.size)
+        self._buffer = bytearray(cube.stickers)
+        # Quarter turns each physical face's storage is behind.
+        self._offsets = [0] * len(FACES)
+        # Where the x, y and z axes of the cube as seen now point physically.
+        self._frame = _IDENTITY_FRAME
+
+    @property
+    def size(self):
+        return self._tables.size
+
+    def apply_move(self, move_str):
+        face, depths, turns = self._tables.move(move_str)
+        if depths is None:
+            self._frame = _turn_frame(self._frame, face, turns)
+            return self
+
+        face = _FRAME_FACES[self._frame][face]
+        buffer, offsets, ring = self._buffer, self._offsets, self._tables.ring
+        for depth in depths:
+            segments = [slices[offsets[f]] for f, slices in ring(face, depth)]
+            values = [buffer[segment] for segment in segments]
+            for j in range(4):
+                buffer[segments[(j + turns) % 4]] = values[j]
+        if depths[0] == 1:
+            f = FACES.index(face)
+            offsets[f] = (offsets[f] + turns) % 4
+        return self
+
+    def apply_moves(self, moves):
+        if isinstance(moves, str):
+            moves = moves.split()
+        for move in moves:
+            self.apply_move(move)
+        return self
+
+    @property
+    def stickers(self):
+        tables = self._tables
+        fc_size, storage, offsets, buffer = tables.fc_size, tables.storage, self._offsets, self._buffer
+        stickers = bytearray(len(buffer))
+        for i, physical in enumerate(tables.frame_map(self._frame)):
+            f, cell = divmod(physical, fc_size)
+            stickers[i] = buffer[f * fc_size + storage[offsets[f]][cell]]
+        return bytes(stickers)
+
+    def to_cube(self):
+        return cube_class(self.size)._from_stickers(self.stickers)
+
+    def copy(self):
+        new_cube = LargeCube.__new__(LargeCube)
+        new_cube._tables = self._tables
+        new_cube._buffer = bytearray(self._buffer)
+        new_cube._offsets = list(self._offsets)
+        new_cube._frame = self._frame
+        return new_cube
+
+    def __eq__(self, other):
+        if not isinstance(other, LargeCube):
+            return NotImplemented
+        return self.size == other.size and self.stickers == other.stickers
+
+    # Mutable, so not hashable.
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.to_cube()!r})'
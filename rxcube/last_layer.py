@@ -0,0 +1,257 @@
+"""
+Recognition of OLL and PLL cases on a 3x3x3 with the first two layers
+solved.
+
+The algorithms are listed in the usual notation (lower case letters for
+wide turns, ``x``/``y``/``z`` for standard rotations) and come back in the
+notation of this package, ready for ``perform_move_sequence``.
+
+The lookup tables are built once, on first use, by undoing every
+algorithm after every pre-AUF (and for PLL every post-AUF) from the solved
+cube. Each state reached must keep the first two layers solved and the
+cube in its orientation; that checks the algorithms. Recognition then
+reads the last-layer stickers straight from the sticker bytes (the layout
+behind ``_u``, ``_l``, ``_f``, ``_r`` and ``_b``, without decoding it)
+and looks them up in a dict:
+
+* OLL on which of the 21 last-layer stickers show the U colour, which only
+  depends on how the pieces are twisted and flipped (216 patterns);
+* PLL on the 12 side stickers of the last layer once it is oriented (288
+  patterns).
+
+Cases are for the cube in its standard orientation, so the moves returned
+apply to ``cube.canonical_orientation()``.
+"""
+from typing import NamedTuple
+
+from .cube import Cube_3x3x3
+from .simplify import invert_moves
+
+AUFS = ('', 'U', 'U2', "U'")
+
+OLL_ALGORITHMS = {
+    1: "R U2 R2 F R F' U2 R' F R F'",
+    2: "F R U R' U' F' f R U R' U' f'",
+    3: "f R U R' U' f' U' F R U R' U' F'",
+    4: "f R U R' U' f' U F R U R' U' F'",
+    5: "r' U2 R U R' U r",
+    6: "r U2 R' U' R U' r'",
+    7: "r U R' U R U2 r'",
+    8: "r' U' R U' R' U2 r",
+    9: "R U R' U' R' F R2 U R' U' F'",
+    10: "R U R' U R' F R F' R U2 R'",
+    11: "r U R' U R' F R F' R U2 r'",
+    12: "M' R' U' R U' R' U2 R U' R r'",
+    13: "F U R U' R2 F' R U R U' R'",
+    14: "R' F R U R' F' R F U' F'",
+    15: "r' U' r R' U' R U r' U r",
+    16: "r U r' R U R' U' r U' r'",
+    17: "R U R' U R' F R F' U2 R' F R F'",
+    18: "r U R' U R U2 r2 U' R U' R' U2 r",
+    19: "M U R U R' U' M' R' F R F'",
+    20: "r U R' U' M2 U R U' R' U' M'",
+    21: "R U2 R' U' R U R' U' R U' R'",
+    22: "R U2 R2 U' R2 U' R2 U2 R",
+    23: "R2 D' R U2 R' D R U2 R",
+    24: "r U R' U' r' F R F'",
+    25: "F' r U R' U' r' F R",
+    26: "R U2 R' U' R U' R'",
+    27: "R U R' U R U2 R'",
+    28: "r U R' U' M U R U' R'",
+    29: "R U R' U' R U' R' F' U' F R U R'",
+    30: "F R' F R2 U' R' U' R U R' F2",
+    31: "R' U' F U R U' R' F' R",
+    32: "L U F' U' L' U L F L'",
+    33: "R U R' U' R' F R F'",
+    34: "R U R2 U' R' F R U R U' F'",
+    35: "R U2 R2 F R F' R U2 R'",
+    36: "L' U' L U' L' U L U L F' L' F",
+    37: "F R' F' R U R U' R'",
+    38: "R U R' U R U' R' U' R' F R F'",
+    39: "L F' L' U' L U F U' L'",
+    40: "R' F R U R' U' F' U R",
+    41: "R U R' U R U2 R' F R U R' U' F'",
+    42: "R' U' R U' R' U2 R F R U R' U' F'",
+    43: "F' U' L' U L F",
+    44: "F U R U' R' F'",
+    45: "F R U R' U' F'",
+    46: "R' U' R' F R F' U R",
+    47: "R' U' R' F R F' R' F R F' U R",
+    48: "F R U R' U' R U R' U' F'",
+    49: "r U' r2 U r2 U r2 U' r",
+    50: "r' U r2 U' r2 U' r2 U r'",
+    51: "F U R U' R' U R U' R' F'",
+    52: "R U R' U R U' B U' B' R'",
+    53: "r' U' R U' R' U R U' R' U2 r",
+    54: "r U R' U R U' R' U R U2 r'",
+    55: "R' F R U R U' R2 F' R2 U' R' U R U R'",
+    56: "r' U' r U' R' U R U' R' U R r' U r",
+    57: "R U R' U' M' U R U' r'",
+}
+
+PLL_ALGORITHMS = {
+    'Aa': "x R' U R' D2 R U' R' D2 R2 x'",
+    'Ab': "x R2 D2 R U R' D2 R U' R x'",
+    'E': "x' R U' R' D R U R' D' R U R' D R U' R' D' x",
+    'F': "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R",
+    'Ga': "R2 U R' U R' U' R U' R2 U' D R' U R D'",
+    'Gb': "R' U' R U D' R2 U R' U R U' R U' R2 D",
+    'Gc': "R2 U' R U' R U R' U R2 U D' R U' R' D",
+    'Gd': "R U R' U' D R2 U' R U' R' U R' U R2 D'",
+    'H': "M2 U M2 U2 M2 U M2",
+    'Ja': "x R2 F R F' R U2 r' U r U2 x'",
+    'Jb': "R U R' F' R U R' U' R' F R2 U' R'",
+    'Na': "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'",
+    'Nb': "R' U R U' R' F' U' F R U R' F R' F' R U' R",
+    'Ra': "R U' R' U' R U R D R' U' R D' R' U2 R'",
+    'Rb': "R2 F R U R U' R' F' R U2 R' U2 R",
+    'T': "R U R' U' R' F R2 U' R' U' R U R' F'",
+    'Ua': "M2 U M U2 M' U M2",
+    'Ub': "M2 U' M U2 M' U' M2",
+    'V': "R U' R U R' D R D' R U' D R2 U R2 D' R2",
+    'Y': "F R U' R' U' R U R' F' R U R' U' R' F R F'",
+    'Z': "M' U M2 U M2 U M' U2 M2",
+}
+
+# Which sticker bytes show the U colour, for the OLL key.
+_U_MASK = bytes([1] + [0] * 255)
+
+_INVERTED_SUFFIXES = {'': "'", "'": '', '2': '2'}
+
+
+class OllCase(NamedTuple):
+    # 0 when the last layer is already oriented.
+    number: int
+    # Turn of U to make before the algorithm.
+    auf: str
+    algorithm: str
+
+
+class PllCase(NamedTuple):
+    # 'solved' when the last layer only needs ``final_auf``.
+    name: str
+    auf: str
+    algorithm: str
+    final_auf: str
+
+
+class LastLayerCase(NamedTuple):
+    oll: OllCase
+    pll: PllCase
+
+
+def to_rxcube_notation(algorithm):
+    """
+    An algorithm in the usual notation rewritten for this package: wide
+    turns ``r`` -> ``Rw`` and rotations ``x`` -> ``X'``, since ``X``, ``Y``
+    and ``Z`` here turn like ``L``, ``D`` and ``B``.
+    """
+    moves = []
+    for move in algorithm.split():
+        letter, suffix = move[0], move[1:]
+        if letter in 'xyz':
+            moves.append(f'{letter.upper()}{_INVERTED_SUFFIXES[suffix]}')
+        elif letter in 'ulfrbd':
+            moves.append(f'{letter.upper()}w{suffix}')
+        else:
+            moves.append(move)
+    return ' '.join(moves)
+
+
+def _oll_key(stickers):
+    # The U face and the top row of L, F, R and B.
+    return (stickers[:12] + stickers[18:21] + stickers[27:30] + stickers[36:39]).translate(_U_MASK)
+
+
+def _pll_key(stickers):
+    return stickers[9:12] + stickers[18:21] + stickers[27:30] + stickers[36:39]
+
+
+def _f2l(stickers):
+    return stickers[12:18] + stickers[21:27] + stickers[30:36] + stickers[39:]
+
+
+class _Tables:
+    def __init__(self):
+        solved = Cube_3x3x3.make_cube()
+        self.f2l = _f2l(solved.stickers)
+        self.oll = {_oll_key(solved.stickers): OllCase(0, '', '')}
+        for number, algorithm in OLL_ALGORITHMS.items():
+            algorithm = to_rxcube_notation(algorithm)
+            for auf in AUFS:
+                stickers = self._undo(solved, f'{auf} {algorithm}', number)
+                self.oll.setdefault(_oll_key(stickers), OllCase(number, auf, algorithm))
+
+        self.pll = {}
+        for name, algorithm in [('solved', '')] + list(PLL_ALGORITHMS.items()):
+            algorithm = to_rxcube_notation(algorithm)
+            for auf in AUFS:
+                for final_auf in AUFS:
+                    stickers = self._undo(solved, f'{auf} {algorithm} {final_auf}', name)
+                    if stickers[:9] != bytes(9):
+                        raise ValueError(f'PLL {name} changes the orientation of the last layer')
+                    self.pll.setdefault(_pll_key(stickers), PllCase(name, auf, algorithm, final_auf))
+
+    def _undo(self, solved, moves, case):
+        cube = Cube_3x3x3.compile_move_sequence(' '.join(invert_moves(moves))).apply(solved)
+        if cube.orientation_rotation():
+            # The AUFs would be taken about the wrong face.
+            raise ValueError(f'The algorithm for {case} turns the whole cube')
+        stickers = cube.stickers
+        if _f2l(stickers) != self.f2l:
+            raise ValueError(f'The algorithm for {case} does not keep the first two layers')
+        return stickers
+
+
+_tables = None
+
+
+def _get_tables():
+    global _tables
+    if _tables is None:
+        _tables = _Tables()
+    return _tables
+
+
+def _last_layer_stickers(cube, tables):
+    stickers = cube.canonical_orientation().stickers
+    if _f2l(stickers) != tables.f2l:
+        raise ValueError('The first two layers are not solved')
+    return stickers
+
+
+def recognise_oll(cube):
+    """
+    The ``OllCase`` of a ``Cube_3x3x3`` with the first two layers solved.
+    """
+    tables = _tables or _get_tables()
+    try:
+        return tables.oll[_oll_key(_last_layer_stickers(cube, tables))]
+    except KeyError:
+        raise ValueError('The last layer is not reachable by legal moves') from None
+
+
+def recognise_pll(cube):
+    """
+    The ``PllCase`` of a ``Cube_3x3x3`` with the first two layers solved
+    and the last layer oriented.
+    """
+    tables = _tables or _get_tables()
+    stickers = _last_layer_stickers(cube, tables)
+    if stickers[:9] != bytes(9):
+        raise ValueError('The last layer is not oriented')
+    try:
+        return tables.pll[_pll_key(stickers)]
+    except KeyError:
+        raise ValueError('The last layer is not reachable by legal moves') from None
+
+
+def recognise(cube):
+    """
+    The OLL case of a ``Cube_3x3x3`` with the first two layers solved and
+    the PLL case left once its OLL algorithm is done.
+    """
+    oll = recognise_oll(cube)
+    if oll.number:
+        cube = Cube_3x3x3.compile_move_sequence(f'{oll.auf} {oll.algorithm}').apply(cube.canonical_orientation())
+    return LastLayerCase(oll, recognise_pll(cube))
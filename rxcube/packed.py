@@ -0,0 +1,267 @@
+"""
+Packed binary files of cube states.
+
+A file starts with a 16 byte header (magic, format version, cube size,
+encoding and record size) followed by fixed size records, one per state,
+so record ``i`` is at ``HEADER_SIZE + i * record_size`` and the number of
+records follows from the file size. Two encodings are supported:
+
+``ENCODING_STICKERS``
+    Every sticker as 3 bits, little end first: 21 bytes for a 3x3x3 and
+    9 for a 2x2x2. Any sticker pattern can be stored.
+``ENCODING_CUBIE``
+    The cubie permutation and orientation coordinates as one integer: the
+    ``rank.rank_3x3x3`` rank in 9 bytes for a 3x3x3, ``rank.rank_corners``
+    in 4 for a 2x2x2. Only legal states can be stored, and for the 3x3x3
+    only with the centres at home.
+
+``StateWriter`` and ``StateReader`` stream records through a file object;
+``StateFile`` maps a file and reads any record by index. ``text_to_packed``
+and ``packed_to_text`` convert from and to text files of cube strings, one
+per line, without loss.
+"""
+import mmap
+import struct
+
+from .cube import FACES, cube_class, from_cube_string
+from .cubie import CubieCube_2x2x2
+from .rank import rank_3x3x3, rank_corners, unrank_3x3x3, unrank_corners
+
+# 2: cubie records of the 3x3x3 are ranks from ``rank.rank_3x3x3``.
+FORMAT_VERSION = 2
+
+MAGIC = b'RXCS'
+
+ENCODING_STICKERS = 0
+ENCODING_CUBIE = 1
+
+# magic, version, cube size, encoding, record size
+_HEADER = struct.Struct('<4sHBBH6x')
+HEADER_SIZE = _HEADER.size
+
+
+def record_size(size, encoding):
+    if encoding == ENCODING_STICKERS:
+        return (6 * size * size * 3 + 7) // 8
+    if encoding == ENCODING_CUBIE:
+        match size:
+            case 3:
+                return 9
+            case 2:
+                return 4
+        raise NotImplementedError(size)
+    raise ValueError(f'Unknown encoding: {encoding}')
+
+
+def _pack_stickers(cube, n_bytes):
+    stickers = cube.stickers
+    # A code past the six colours would spill into the next sticker's bits.
+    if max(stickers) >= len(FACES):
+        raise ValueError(f'Not a sticker colour in {cube.to_cube_string()!r}')
+    value = 0
+    for sticker in reversed(stickers):
+        value = (value << 3) | sticker
+    return value.to_bytes(n_bytes, 'little')
+
+
+def _unpack_stickers(cls, record):
+    value = int.from_bytes(record, 'little')
+    return cls.from_stickers(bytes((value >> (3 * i)) & 7 for i in range(6 * cls.SIZE * cls.SIZE)))
+
+
+def _pack_cubie(cube, n_bytes):
+    if cube.size == 3:
+        # Ranks are taken with the centres home, which would lose a rotation.
+        if cube.orientation_rotation():
+            raise ValueError(f'Not a state with the centres at home: {cube.to_cube_string()}')
+        value = rank_3x3x3(cube)
+    else:
+        cc = CubieCube_2x2x2.from_cube(cube)
+        if not cc.is_valid():
+            raise ValueError(f'Not a legal state: {cube.to_cube_string()}')
+        # All eight corners, so every rotation of a state keeps its own record.
+        value = rank_corners(cc)
+    return value.to_bytes(n_bytes, 'little')
+
+
+def _unpack_cubie(cls, record):
+    value = int.from_bytes(record, 'little')
+    if cls.SIZE == 3:
+        return unrank_3x3x3(value)
+    return CubieCube_2x2x2(*unrank_corners(value)).to_cube()
+
+
+class _Format:
+    def __init__(self, size, encoding):
+        self.size = size
+        self.encoding = encoding
+        self.record_size = record_size(size, encoding)
+        self.cube_class = cube_class(size)
+
+    def header(self):
+        return _HEADER.pack(MAGIC, FORMAT_VERSION, self.size, self.encoding, self.record_size)
+
+    @classmethod
+    def from_header(cls, header):
+        if len(header) < HEADER_SIZE:
+            raise ValueError('Truncated header')
+        magic, version, size, encoding, size_of_record = _HEADER.unpack(header[:HEADER_SIZE])
+        if magic != MAGIC:
+            raise ValueError('Not a packed cube state file')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported format version {version}')
+        fmt = cls(size, encoding)
+        if fmt.record_size != size_of_record:
+            raise ValueError(f'Record size {size_of_record} does not match {fmt.record_size}')
+        return fmt
+
+    def pack(self, cube):
+        if cube.size != self.size:
+            raise ValueError(f'Expected a {self.size}x{self.size}x{self.size} cube, got size {cube.size}')
+        if self.encoding == ENCODING_STICKERS:
+            return _pack_stickers(cube, self.record_size)
+        return _pack_cubie(cube, self.record_size)
+
+    def unpack(self, record):
+        if self.encoding == ENCODING_STICKERS:
+            return _unpack_stickers(self.cube_class, record)
+        return _unpack_cubie(self.cube_class, record)
+
+
+def _open(file, mode):
+    if hasattr(file, 'read' if mode == 'rb' else 'write'):
+        return file, False
+    return open(file, mode), True
+
+
+class StateWriter:
+    """
+    Write states to a path or binary file object, record by record.
+    """
+    def __init__(self, file, size=3, encoding=ENCODING_STICKERS):
+        self._format = _Format(size, encoding)
+        self._file, self._owned = _open(file, 'wb')
+        self._file.write(self._format.header())
+        self.count = 0
+
+    def write(self, cube):
+        self._file.write(self._format.pack(cube))
+        self.count += 1
+
+    def write_many(self, cubes):
+        for cube in cubes:
+            self.write(cube)
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StateReader:
+    """
+    Iterate over the states in a path or binary file object without
+    reading the whole file.
+    """
+    def __init__(self, file):
+        self._file, self._owned = _open(file, 'rb')
+        self._format = _Format.from_header(self._file.read(HEADER_SIZE))
+        self.size = self._format.size
+        self.encoding = self._format.encoding
+
+    def __iter__(self):
+        read, n_bytes, unpack = self._file.read, self._format.record_size, self._format.unpack
+        while record := read(n_bytes):
+            if len(record) < n_bytes:
+                raise ValueError('Truncated record at end of file')
+            yield unpack(record)
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StateFile:
+    """
+    Random access to the states of a packed file by record index, through
+    a read-only memory map.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._format = _Format.from_header(f.read(HEADER_SIZE))
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = self._format.size
+        self.encoding = self._format.encoding
+        self._count, remainder = divmod(len(self._map) - HEADER_SIZE, self._format.record_size)
+        if remainder:
+            raise ValueError('Truncated record at end of file')
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        n_bytes = self._format.record_size
+        start = HEADER_SIZE + index * n_bytes
+        return self._format.unpack(self._map[start:start + n_bytes])
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def text_to_packed(text_path, packed_path, size=None, encoding=ENCODING_STICKERS):
+    """
+    Convert a text file of cube strings, one per line, to a packed file.
+    The cube size is taken from the first line unless given. Returns the
+    number of states written.
+    """
+    with open(text_path) as lines:
+        cubes = (from_cube_string(line.strip()) for line in lines if line.strip())
+        first = next(cubes, None)
+        if size is None:
+            size = first.size if first is not None else 3
+        with StateWriter(packed_path, size, encoding) as writer:
+            if first is not None:
+                writer.write(first)
+                writer.write_many(cubes)
+            return writer.count
+
+
+def packed_to_text(packed_path, text_path):
+    """
+    Convert a packed file to a text file of cube strings, one per line.
+    Returns the number of states written.
+    """
+    count = 0
+    with StateReader(packed_path) as reader, open(text_path, 'w') as out:
+        for cube in reader:
+            out.write(cube.to_cube_string())
+            out.write('\n')
+            count += 1
+    return count
@@ -0,0 +1,232 @@
+"""
+An on-disk database of known positions: named patterns, algorithm cases
+and best known solutions, looked up by cube state.
+
+Positions are keyed by the sticker bytes of the state turned to a
+canonical orientation, so every whole-cube rotation of a position finds
+the same record. With ``colours=True`` the colours are renamed as well
+(in order of first appearance, over the rotation giving the smallest
+bytes), so a pattern is found whatever the colour scheme.
+
+The records live in an SQLite table whose primary key is that canonical
+key, so a lookup is one B-tree search; recently looked up cubes are kept
+in an in-process LRU cache in front of it. Solutions are stored for the
+canonical orientation and returned turned to the orientation of the cube
+that was looked up.
+
+Text files for ``import_file`` have one position per line: a cube string,
+optionally followed by a tab and a name and another tab and a solution
+move sequence. Blank lines and lines starting with ``#`` are skipped.
+"""
+import sqlite3
+from collections import OrderedDict
+from operator import itemgetter
+from typing import NamedTuple
+
+from .cube import from_cube_string
+from .simplify import invert_moves, simplify_moves
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Cube class -> ((rotation moves, gather), ...) over its whole-cube rotations.
+_ROTATION_GATHERS = {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    key BLOB PRIMARY KEY,
+    cube_string TEXT NOT NULL,
+    name TEXT,
+    solution TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS positions_name ON positions (name);
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class Position(NamedTuple):
+    cube_string: str
+    name: str | None
+    # Moves solving the cube that was looked up, None if none was stored.
+    solution: list | None
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _relabel(stickers):
+    # Rename the colours in order of first appearance.
+    order = bytes(dict.fromkeys(stickers))
+    return stickers.translate(bytes.maketrans(order, bytes(range(len(order)))))
+
+
+def _rotation_gathers(cube_class):
+    gathers = _ROTATION_GATHERS.get(cube_class)
+    if gathers is None:
+        gathers = tuple((name, itemgetter(*perm)) for name, perm in cube_class.whole_cube_rotations())
+        _ROTATION_GATHERS[cube_class] = gathers
+    return gathers
+
+
+def _normalise(cube, colours):
+    """
+    The canonical key of ``cube`` and the rotation moves that turn it to
+    the orientation the key was taken in.
+    """
+    if not colours:
+        return cube.canonical_orientation().stickers, cube.orientation_rotation()
+    stickers = cube.stickers
+    best, best_name = None, ''
+    for name, gather in _rotation_gathers(cube.__class__):
+        image = _relabel(bytes(gather(stickers)))
+        if best is None or image < best:
+            best, best_name = image, name
+    return best, best_name
+
+
+def position_key(cube, colours=False):
+    """
+    The database key of ``cube``: equal for all its rotations and, with
+    ``colours``, for all its recolourings.
+    """
+    return _normalise(cube, colours)[0]
+
+
+def _moves(solution):
+    return solution.split() if isinstance(solution, str) else list(solution)
+
+
+def _as_cube(cube):
+    return from_cube_string(cube) if isinstance(cube, str) else cube
+
+
+def _solved_after(cube_class, moves):
+    # The rotations left at the end do not matter to a solved cube.
+    return [m for m in simplify_moves(moves, cube_class) if m[0] not in 'XYZ']
+
+
+class PositionDatabase:
+    """
+    Positions with a name and a solution, stored in the SQLite file at
+    ``path`` (``':memory:'`` for a database that is not saved).
+
+    Whether keys ignore colours is fixed when the file is created; opening
+    it again with the other setting raises ``ValueError``.
+    """
+    def __init__(self, path=':memory:', colours=False, cache_size=DEFAULT_CACHE_SIZE):
+        self.colours = colours
+        self._connection = sqlite3.connect(str(path))
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute("INSERT OR IGNORE INTO settings VALUES ('colours', ?)", (str(int(colours)),))
+        stored = self._connection.execute("SELECT value FROM settings WHERE name = 'colours'").fetchone()[0]
+        if stored != str(int(colours)):
+            self._connection.close()
+            raise ValueError(f'{path} was created with colours={bool(int(stored))}')
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._hits = self._misses = 0
+
+    def _record(self, cube, name, solution):
+        cube = _as_cube(cube)
+        key, rotation = _normalise(cube, self.colours)
+        if solution is not None:
+            # Stored for the canonical orientation: turn back to the cube first.
+            solution = ' '.join(_solved_after(cube.__class__, invert_moves(rotation) + _moves(solution)))
+        return key, cube.to_cube_string(), name, solution
+
+    def add(self, cube, name=None, solution=None):
+        """
+        Store ``cube`` (a cube or a cube string) with a name and the moves
+        solving it, replacing any record for the same key.
+        """
+        self.add_many([(cube, name, solution)])
+
+    def add_many(self, positions):
+        """
+        Store ``(cube, name, solution)`` triples in one transaction and
+        return how many there were.
+        """
+        records = [self._record(*position) for position in positions]
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?)', records)
+        self._cache.clear()
+        return len(records)
+
+    def import_file(self, filepath):
+        """
+        Add every position of a text file, see the module docstring, and
+        return how many there were.
+        """
+        with open(filepath) as f:
+            return self.add_many(_parse_line(line) for line in f if line.strip() and not line.startswith('#'))
+
+    def lookup(self, cube):
+        """
+        The ``Position`` stored for ``cube`` (a cube or a cube string) or
+        any rotation of it, None if there is none.
+        """
+        cube = _as_cube(cube)
+        cache = self._cache
+        try:
+            position = cache[cube]
+        except KeyError:
+            self._misses += 1
+        else:
+            self._hits += 1
+            cache.move_to_end(cube)
+            return position
+
+        key, rotation = _normalise(cube, self.colours)
+        row = self._connection.execute('SELECT cube_string, name, solution FROM positions WHERE key = ?',
+                                       (key,)).fetchone()
+        position = None
+        if row is not None:
+            cube_string, name, solution = row
+            if solution is not None:
+                solution = _solved_after(cube.__class__, rotation.split() + solution.split())
+            position = Position(cube_string, name, solution)
+        cache[cube] = position
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return position
+
+    def find_name(self, name):
+        """
+        Cube strings of the positions stored under ``name``.
+        """
+        rows = self._connection.execute('SELECT cube_string FROM positions WHERE name = ?', (name,))
+        return [cube_string for cube_string, in rows]
+
+    def cache_info(self):
+        return CacheInfo(self._hits, self._misses, self._cache_size, len(self._cache))
+
+    def __contains__(self, cube):
+        return self.lookup(cube) is not None
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM positions').fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _parse_line(line):
+    fields = line.rstrip('\n').split('\t')
+    if len(fields) > 3:
+        raise ValueError(f'Too many fields in position line: {line!r}')
+    fields += [None] * (3 - len(fields))
+    cube_string, name, solution = fields
+    return cube_string.strip(), name or None, solution or None
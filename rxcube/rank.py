@@ -0,0 +1,166 @@
+"""
+Every legal cube state as a unique integer, and back.
+
+3x3x3 states are turned so the centres are home and then ranked from
+their cubie coordinates::
+
+    ((corner_perm * 3**7 + twist) * 12!/2 + edge_perm // 2) * 2**11 + flip
+
+which is dense: ranks run from 0 to ``N_STATES_3X3X3 - 1`` (4.3e19, 66
+bits). The edge permutation only needs half its range because its parity
+follows from the corners.
+
+2x2x2 states are ranked modulo whole-cube rotation: the state is first
+turned so the DBL corner is home, then ranked as
+``corner_perm * 3**6 + twist`` over the other seven corners, for
+``N_STATES_2X2X2`` (3,674,160) classes. Unranking gives the member of the
+class with DBL at home.
+
+``rxcube.batch`` has NumPy versions for sticker matrices.
+"""
+from .cube import Cube_2x2x2, Cube_3x3x3
+from .cubie import (CubieCube_2x2x2, CubieCube_3x3x3, orientation_rank, orientation_unrank, permutation_parity,
+                    permutation_rank, permutation_unrank)
+
+N_CORNER_PERM = 40320
+N_TWIST = 3 ** 7
+N_EDGE_PERM = 479001600 // 2
+N_FLIP = 2 ** 11
+N_STATES_3X3X3 = N_CORNER_PERM * N_TWIST * N_EDGE_PERM * N_FLIP
+
+# Corner positions other than DBL, in cubie numbering.
+FREE_CORNERS = (0, 1, 2, 3, 4, 5, 7)
+DBL = 6
+
+N_PERM_2X2X2 = 5040
+N_TWIST_2X2X2 = 3 ** 6
+N_STATES_2X2X2 = N_PERM_2X2X2 * N_TWIST_2X2X2
+
+_ROTATIONS_2X2X2 = None
+
+
+def _cubie_cube(cube, cubie_class):
+    if isinstance(cube, str):
+        cube = cubie_class.CUBE_CLASS.from_cube_string(cube)
+    if cubie_class is CubieCube_3x3x3 and isinstance(cube, Cube_3x3x3):
+        cube = cube.canonical_orientation()
+    cc = cube if isinstance(cube, cubie_class) else cubie_class.from_cube(cube)
+    if not cc.is_valid():
+        raise ValueError(f'Not a legal {cubie_class.CUBE_CLASS.SIZE}x{cubie_class.CUBE_CLASS.SIZE} state')
+    return cc
+
+
+def rank_corners(cc):
+    """
+    ``corner_perm * 3**7 + twist`` over all eight corners of a
+    ``CubieCube``, below ``N_CORNER_PERM * N_TWIST``.
+    """
+    return permutation_rank(cc.cp) * N_TWIST + orientation_rank(cc.co, 3)
+
+
+def unrank_corners(rank):
+    """
+    The ``(cp, co)`` lists of a corner rank from ``rank_corners``.
+    """
+    corner_perm, twist = divmod(rank, N_TWIST)
+    return permutation_unrank(corner_perm, 8), orientation_unrank(twist, 8, 3)
+
+
+def rank_3x3x3(cube):
+    """
+    Rank of a ``Cube_3x3x3``, cube string or ``CubieCube_3x3x3``; all
+    rotations of a cube share one rank.
+    """
+    cc = _cubie_cube(cube, CubieCube_3x3x3)
+    return (rank_corners(cc) * N_EDGE_PERM + permutation_rank(cc.ep) // 2) * N_FLIP + orientation_rank(cc.eo, 2)
+
+
+def unrank_3x3x3(rank):
+    if not 0 <= rank < N_STATES_3X3X3:
+        raise ValueError(f'Rank out of range: {rank}')
+    rank, flip = divmod(rank, N_FLIP)
+    rank, edge_perm = divmod(rank, N_EDGE_PERM)
+    cp, co = unrank_corners(rank)
+    ep = permutation_unrank(edge_perm * 2, 12)
+    if permutation_parity(ep) != permutation_parity(cp):
+        ep = permutation_unrank(edge_perm * 2 + 1, 12)
+    return CubieCube_3x3x3(cp, co, ep, orientation_unrank(flip, 12, 2)).to_cube()
+
+
+def rotations_2x2x2():
+    """
+    For each (position of the DBL cubie, its twist), the whole-cube
+    rotation that brings it home.
+    """
+    global _ROTATIONS_2X2X2
+    if _ROTATIONS_2X2X2 is None:
+        rotation_moves = ('', 'X', 'X2', "X'", 'Z', "Z'")
+        spins = ('', 'Y', 'Y2', "Y'")
+        rotations = {}
+        for first in rotation_moves:
+            for spin in spins:
+                r = CubieCube_2x2x2.make_cube()
+                for m in (first, spin):
+                    if m:
+                        r = r.make_move(m)
+                rotations[(r.cp[DBL], -r.co[DBL] % 3)] = r
+        assert len(rotations) == 24
+        _ROTATIONS_2X2X2 = rotations
+    return _ROTATIONS_2X2X2
+
+
+def coords_2x2x2(cc):
+    """
+    ``(corner_perm, twist)`` of a ``CubieCube_2x2x2`` with DBL at home.
+    """
+    return (permutation_rank([FREE_CORNERS.index(cc.cp[i]) for i in FREE_CORNERS]),
+            orientation_rank([cc.co[i] for i in FREE_CORNERS], 3))
+
+
+def cubie_from_coords_2x2x2(perm, twist):
+    cp = list(range(8))
+    co = [0] * 8
+    for i, c, o in zip(FREE_CORNERS, permutation_unrank(perm, 7), orientation_unrank(twist, 7, 3)):
+        cp[i] = FREE_CORNERS[c]
+        co[i] = o
+    return CubieCube_2x2x2(cp, co)
+
+
+def normalise_2x2x2(cc):
+    """
+    The ``CubieCube_2x2x2`` turned by a whole-cube rotation so DBL is home.
+    """
+    j = cc.cp.index(DBL)
+    return cc.multiply(rotations_2x2x2()[(j, cc.co[j])])
+
+
+def rank_2x2x2(cube):
+    """
+    Rank of a ``Cube_2x2x2``, cube string or ``CubieCube_2x2x2``; all
+    rotations of a state share one rank.
+    """
+    perm, twist = coords_2x2x2(normalise_2x2x2(_cubie_cube(cube, CubieCube_2x2x2)))
+    return perm * N_TWIST_2X2X2 + twist
+
+
+def unrank_2x2x2(rank):
+    if not 0 <= rank < N_STATES_2X2X2:
+        raise ValueError(f'Rank out of range: {rank}')
+    return cubie_from_coords_2x2x2(*divmod(rank, N_TWIST_2X2X2)).to_cube()
+
+
+def rank_state(cube):
+    if isinstance(cube, Cube_3x3x3):
+        return rank_3x3x3(cube)
+    if isinstance(cube, Cube_2x2x2):
+        return rank_2x2x2(cube)
+    raise NotImplementedError(cube.__class__.__name__)
+
+
+def unrank_state(rank, size=3):
+    match size:
+        case 3:
+            return unrank_3x3x3(rank)
+        case 2:
+            return unrank_2x2x2(rank)
+    raise NotImplementedError(size)
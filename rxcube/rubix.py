@@ -3,8 +3,9 @@ import random
 from functools import partial
 from pathlib import Path
 
-from .cube import from_cube_string, make_cube, OPPOSITE_FACES
+from .cube import FACES, from_cube_string, make_cube
 from .cube_display import print_cube, print_cube_fg_color, print_cube_bg_color, print_large_cube_bg_color
+from .simplify import simplify_moves
 
 
 def perform_move(move_str, cube):
@@ -13,59 +14,23 @@ def perform_move(move_str, cube):
 
 
 def perform_move_sequence(move_sequence_str, cube):
-    moves = move_sequence_str.split()
     # print(f'Performing move seq: {move_sequence_str}')
-    for m in moves:
-        m = m.strip().upper()
-        if m:
-            cube = perform_move(m, cube)
-    return cube
-
-
-def generate_random_moves(count, all_moves):
-    return random.choices(all_moves, k=count)
-
-
-def is_move_redundant(move, previous_moves):
-    move_face = move[0]
-    if previous_moves:
-        last_move = previous_moves[-1]
-        last_move_face = last_move[0]
-        if move_face == last_move_face:
-            return True
-
-        last_same_face_move = None
-        last_same_face_move_idx = -1
-        for i, pm in enumerate(previous_moves):
-            if pm[0] == move[0]:
-                last_same_face_move = pm
-                last_same_face_move_idx = i
-
-        opp_face = OPPOSITE_FACES[move_face]
-        non_opp_face_move_count = 0
-        for i in range(last_same_face_move_idx+1, len(previous_moves)):
-            _prev_move_i = previous_moves[i]
-            _prev_move_i_face = _prev_move_i[0]
-            if _prev_move_i_face != opp_face:
-                non_opp_face_move_count += 1
-        if non_opp_face_move_count <= 0:
-            return True
-
-    return False
-
-
-def remove_redundant_moves(move_sequence):
-    non_redundant_moves = []
-    for m in move_sequence:
-        if not is_move_redundant(m, non_redundant_moves):
-            non_redundant_moves.append(m)
-    return non_redundant_moves
-
-
-def generate_scramble(cube):
+    return cube.compile_move_sequence(move_sequence_str).apply(cube)
+
+
+def generate_random_moves(count, all_moves, rng=None):
+    # Pass an own random.Random for reproducible moves; the global one is shared by every caller.
+    return (rng or random).choices(all_moves, k=count)
+
+
+def generate_scramble(cube, rng=None):
     all_moves = cube.non_rotational_moves()
-    random_moves = generate_random_moves(16*cube.size, all_moves)
-    return remove_redundant_moves(random_moves)
+    if cube.size > 3:
+        # Face turns never reach the inner layers; add wide turns of up to half the cube.
+        all_moves += [f'{k}{f}w{m}' if k > 2 else f'{f}w{m}'
+                      for k in range(2, cube.size // 2 + 1) for f in FACES for m in ("", "'", "2")]
+    random_moves = generate_random_moves(16*cube.size, all_moves, rng)
+    return simplify_moves(random_moves, cube.__class__)
 
 
 def scramble(cube):
@@ -198,6 +163,8 @@ def check_U_moves():
     print("UUUU")
     print_cube(perform_move_sequence("U U U U", cb1))
 
+MAX_CUBE_SIZE = 7
+
 DISPLAY_MODES = ('simple', 'small_fg', 'small_bg', 'medium_bg', 'large_bg')
 DISPLAY_FUNCS = {
     'simple': print_cube,
@@ -217,6 +184,8 @@ def process_cmd(m, ctx):
     elif m == '?' or m == '/':
         non_rotational_cube_moves = ' '.join(ctx['cb'].non_rotational_moves())
         whole_cube_rotation_moves = ' '.join(ctx['cb'].whole_cube_rotation_moves())
+        layer_moves = ' '.join(ctx['cb'].layer_moves()) or '-'
+        largest = f'{MAX_CUBE_SIZE}x{MAX_CUBE_SIZE}x{MAX_CUBE_SIZE}'
         print(f'''
         Control commands:
             ? or /       - Help
@@ -225,8 +194,8 @@ def process_cmd(m, ctx):
             p            - Print Cube
             + or =       - Enhance cube display mode (size &/ color)
             - or _       - Simplify cube display mode (size &/ color)
-            ] or }}       - Harder puzzle; Increase cube dimensions (from 2x2x2 to 3x3x3)
-            [ or {{       - Easier puzzle; Decrease cube dimensions (from 3x3x3 to 2x2x2)
+            ] or }}       - Harder puzzle; Increase cube dimensions (up to {largest})
+            [ or {{       - Easier puzzle; Decrease cube dimensions (down to 2x2x2)
             0            - Reset Cube
             1            - Open *
             2            - Save *
@@ -234,6 +203,9 @@ def process_cmd(m, ctx):
         
         Cube face moves:
             {non_rotational_cube_moves}
+
+        Wide and slice moves:
+            {layer_moves}
         
         Whole cube rotations:
             {whole_cube_rotation_moves}
@@ -255,7 +227,7 @@ def process_cmd(m, ctx):
             ctx['cube_size'] = sz
     elif m == ']' or m == '}':
         sz = ctx['cube_size']
-        sz = min(3, sz + 1)
+        sz = min(MAX_CUBE_SIZE, sz + 1)
         cb = ctx['cb']
         if cb.size != sz:
             ctx['cb'] = cb = make_cube(sz)
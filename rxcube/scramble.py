@@ -0,0 +1,142 @@
+"""
+Random-state scrambles.
+
+A scramble made of random moves does not reach every state with the same
+probability. Here the state is drawn first, uniformly among all legal
+cubie states, and the scramble is the inverse of a solution to it, so it
+is also short: at most 22 moves for the 3x3x3 (two-phase solver) and at
+most 11 for the 2x2x2 (optimal solver).
+
+The 2x2x2 has no centres, so its states are drawn with the DBL corner at
+home; every state of the puzzle is one of those seen from some side.
+
+``scramble_stream`` yields reproducible scrambles with stable ids, so any
+of them can be regenerated from its id instead of being stored.
+"""
+import itertools
+import random
+from typing import NamedTuple
+
+from .bulk import solve_cube_strings
+from .cube import make_cube
+from .cubie import CubieCube_2x2x2, CubieCube_3x3x3, permutation_parity
+from .rank import FREE_CORNERS
+from .rubix import generate_scramble
+from .simplify import invert_moves
+
+
+def _random_orientation(rng, n, base):
+    orientation = [rng.randrange(base) for _ in range(n - 1)]
+    orientation.append(-sum(orientation) % base)
+    return orientation
+
+
+def random_state(size=3, rng=None):
+    """
+    A uniformly random legal ``CubieCube`` of the given size.
+    """
+    rng = rng or random
+    match size:
+        case 3:
+            cp = rng.sample(range(8), 8)
+            ep = rng.sample(range(12), 12)
+            # Corner and edge permutations must have the same parity.
+            if permutation_parity(cp) != permutation_parity(ep):
+                ep[10], ep[11] = ep[11], ep[10]
+            return CubieCube_3x3x3(cp, _random_orientation(rng, 8, 3), ep, _random_orientation(rng, 12, 2))
+        case 2:
+            cp = list(range(8))
+            co = [0] * 8
+            for i, c, o in zip(FREE_CORNERS, rng.sample(FREE_CORNERS, 7), _random_orientation(rng, 7, 3)):
+                cp[i] = c
+                co[i] = o
+            return CubieCube_2x2x2(cp, co)
+    raise NotImplementedError(size)
+
+
+def random_state_scramble(size=3, rng=None, table_dir=None):
+    """
+    Scramble, as a list of moves, taking the solved cube to a uniformly
+    random state.
+    """
+    return random_state_scrambles(1, size, rng=rng, processes=1, table_dir=table_dir)[0]
+
+
+def random_state_scrambles(count, size=3, rng=None, processes=None, table_dir=None):
+    """
+    ``count`` random-state scrambles, solved on a process pool (see
+    ``rxcube.bulk``). The states are all drawn here from ``rng``, so a
+    seeded ``rng`` gives the same scrambles whatever ``processes`` is.
+    """
+    rng = rng or random
+    cube_strings = [random_state(size, rng).to_cube_string() for _ in range(count)]
+    scrambles = []
+    for result in solve_cube_strings(cube_strings, processes=processes, table_dir=table_dir):
+        if result.error is not None:
+            raise ValueError(f'Could not solve random state {result.cube_string}: {result.error}')
+        scrambles.append(invert_moves(result.solution))
+    return scrambles
+
+
+class Scramble(NamedTuple):
+    # "<seed>-<index>", enough to regenerate the scramble with ``scramble_by_id``.
+    id: str
+    moves: list
+
+
+def _seed_from(seed):
+    if isinstance(seed, random.Random):
+        return seed.getrandbits(64)
+    if hasattr(seed, 'bit_generator'):
+        # A NumPy Generator.
+        return int(seed.integers(2 ** 63))
+    return seed
+
+
+def scramble_rng(seed, index):
+    """
+    The ``random.Random`` that scramble ``index`` of stream ``seed`` is
+    drawn from; independent of every other index.
+    """
+    return random.Random(f'{seed}:{index}')
+
+
+def _make_scramble(seed, index, size, method, table_dir):
+    rng = scramble_rng(seed, index)
+    if method == 'random_state':
+        moves = random_state_scramble(size, rng, table_dir=table_dir)
+    elif method == 'random_moves':
+        moves = generate_scramble(make_cube(size), rng)
+    else:
+        raise ValueError(f'Unknown scramble method: {method}')
+    return Scramble(f'{seed}-{index}', moves)
+
+
+def scramble_stream(seed, size=3, start=0, stop=None, step=1, method='random_state', table_dir=None):
+    """
+    Lazily yield ``Scramble``s ``start``, ``start + step``, ... (up to
+    ``stop``, or forever) of the stream identified by ``seed``.
+
+    ``seed`` is an int or str, or a ``random.Random`` or NumPy
+    ``Generator`` from which a seed is drawn once. Every scramble has its
+    own generator seeded from the stream seed and its index, so
+    ``scramble_by_id`` can rebuild any one of them, and shards of a stream
+    (``start=k, step=n`` for shard ``k`` of ``n``) never overlap.
+
+    ``method`` is ``'random_state'`` (see ``random_state_scramble``) or
+    ``'random_moves'`` (see ``generate_scramble``).
+    """
+    seed = _seed_from(seed)
+    indices = itertools.count(start, step) if stop is None else range(start, stop, step)
+    for index in indices:
+        yield _make_scramble(seed, index, size, method, table_dir)
+
+
+def scramble_by_id(scramble_id, size=3, method='random_state', table_dir=None):
+    """
+    Regenerate the scramble with the given ``Scramble.id``.
+    """
+    seed, _, index = scramble_id.rpartition('-')
+    if not seed or not index.isdigit():
+        raise ValueError(f'Not a scramble id: {scramble_id!r}')
+    return _make_scramble(seed, int(index), size, method, table_dir)
@@ -0,0 +1,261 @@
+"""
+Shortest move sequences between two states of any ``Cube`` subclass.
+
+Two searches are offered. ``bidirectional_bfs`` grows breadth first
+frontiers from both ends until they meet and is the better choice for
+short distances. ``ida_star`` is an iterative deepening A* that only keeps
+its current path plus a bounded transposition table, so its memory stays
+flat however deep it goes.
+
+Both work directly on ``Cube.stickers`` with the gather permutations from
+``Cube.move_permutations``, and can be limited to a move set such as
+``'<R,U>'``. The goal has to match sticker for sticker, including the
+orientation of the whole cube; ``ida_star`` can key its transposition
+table on symmetry classes from ``rxcube.symmetry`` instead of states.
+"""
+import math
+import time
+from operator import itemgetter
+from typing import NamedTuple
+
+from .cube import FACES, OPPOSITE_FACES, normalise_move
+
+
+class SearchResult(NamedTuple):
+    # None when no sequence within ``max_depth`` moves exists.
+    moves: list | None
+    # States generated, i.e. moves applied.
+    nodes: int
+    seconds: float
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+def parse_move_set(move_set):
+    """
+    Expand a move set like ``'<R,U>'`` or ``'R U2'`` into move strings.
+
+    A move without a suffix (``R``, ``Rw``, ``M``) stands for its quarter
+    turns both ways and its half turn; moves with a suffix are taken as
+    they are.
+    """
+    moves = []
+    for token in move_set.strip().strip('<>').replace(',', ' ').split():
+        token = normalise_move(token)
+        if token[-1] not in "'2":
+            moves.extend((token, f"{token}'", f'{token}2'))
+        else:
+            moves.append(token)
+    return moves
+
+
+class TranspositionTable:
+    """
+    Shallowest depth at which each state was reached, keyed by state.
+
+    It holds at most ``max_entries`` states and is emptied when full,
+    which only costs some re-expansions and keeps memory bounded.
+    """
+    def __init__(self, max_entries=1_000_000):
+        self.max_entries = max_entries
+        self._depths = {}
+
+    def __len__(self):
+        return len(self._depths)
+
+    def get(self, key):
+        return self._depths.get(key)
+
+    def store(self, key, depth):
+        if len(self._depths) >= self.max_entries:
+            self._depths.clear()
+        self._depths[key] = depth
+
+    def clear(self):
+        self._depths.clear()
+
+
+def _inverse_permutation(perm):
+    inverse = [0] * len(perm)
+    for i, p in enumerate(perm):
+        inverse[p] = i
+    return inverse
+
+
+def _prepare(start, goal, moves):
+    if goal is None:
+        goal = start.make_cube()
+    if goal.__class__ is not start.__class__:
+        raise ValueError(f'Cannot search from {start.__class__.__name__} to {goal.__class__.__name__}')
+    if moves is None:
+        moves = start.non_rotational_moves()
+    elif isinstance(moves, str):
+        moves = parse_move_set(moves)
+    moves = [normalise_move(m) for m in moves]
+    perms = [start.move_permutation(m) for m in moves]
+    return goal, moves, perms
+
+
+def bidirectional_bfs(start, goal=None, moves=None, max_depth=20):
+    """
+    Shortest sequence of ``moves`` taking ``start`` to ``goal`` (the solved
+    cube by default), found by breadth first search from both ends.
+
+    ``moves`` is a list of move strings or a move set string for
+    ``parse_move_set``; by default all face moves. Memory grows with the
+    number of states within half the distance of either end.
+    """
+    began = time.perf_counter()
+    goal, moves, perms = _prepare(start, goal, moves)
+    forward_gathers = [itemgetter(*p) for p in perms]
+    backward_gathers = [itemgetter(*_inverse_permutation(p)) for p in perms]
+    # state -> (previous state, move index), None at the two ends
+    forward = {start.stickers: None}
+    backward = {goal.stickers: None}
+    forward_frontier = [start.stickers]
+    backward_frontier = [goal.stickers]
+    nodes = 0
+    meeting = start.stickers if start.stickers in backward else None
+    depth = 0
+    while meeting is None and depth < max_depth and forward_frontier and backward_frontier:
+        depth += 1
+        # Grow the smaller side.
+        if len(forward_frontier) <= len(backward_frontier):
+            seen, other, gathers, frontier = forward, backward, forward_gathers, forward_frontier
+        else:
+            seen, other, gathers, frontier = backward, forward, backward_gathers, backward_frontier
+        next_frontier = []
+        for state in frontier:
+            for m, gather in enumerate(gathers):
+                nodes += 1
+                neighbour = bytes(gather(state))
+                if neighbour not in seen:
+                    seen[neighbour] = (state, m)
+                    next_frontier.append(neighbour)
+                    if neighbour in other:
+                        meeting = neighbour
+                        break
+            if meeting is not None:
+                break
+        if seen is forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    path = None
+    if meeting is not None:
+        path = []
+        state = meeting
+        while forward[state] is not None:
+            state, m = forward[state]
+            path.append(moves[m])
+        path.reverse()
+        state = meeting
+        while backward[state] is not None:
+            state, m = backward[state]
+            path.append(moves[m])
+    return SearchResult(path, nodes, time.perf_counter() - began)
+
+
+def sticker_heuristic(goal, moves):
+    """
+    Admissible distance estimate: stickers that differ from ``goal``
+    divided by the most stickers a single move can change.
+    """
+    _, moves, perms = _prepare(goal, goal, moves)
+    most_moved = max(sum(1 for i, p in enumerate(perm) if p != i) for perm in perms)
+    target = goal.stickers
+
+    def heuristic(stickers):
+        return math.ceil(sum(1 for a, b in zip(stickers, target) if a != b) / most_moved)
+
+    return heuristic
+
+
+def _skips(moves):
+    """
+    For each move (and -1 for no move yet), the set of move indices not
+    worth trying next: the same face again, or the opposite face in one
+    fixed order since opposite faces commute. Wide and slice moves only
+    skip themselves.
+    """
+    faces = [m[:-1] if m[-1] in "'2" else m for m in moves]
+    skips = {-1: frozenset()}
+    for i, face in enumerate(faces):
+        skip = set()
+        for j, other in enumerate(faces):
+            if other == face:
+                skip.add(j)
+            elif face in FACES and OPPOSITE_FACES[face] == other and FACES.index(other) < FACES.index(face):
+                skip.add(j)
+        skips[i] = frozenset(skip)
+    return skips
+
+
+def ida_star(start, goal=None, moves=None, max_depth=20, heuristic=None, table=None, key=None):
+    """
+    Shortest sequence of ``moves`` taking ``start`` to ``goal`` (the solved
+    cube by default), found by iterative deepening A*.
+
+    ``heuristic`` maps a sticker ``bytes`` state to a lower bound on its
+    distance to ``goal``; ``sticker_heuristic`` is used by default.
+    ``table`` is the ``TranspositionTable`` used to avoid re-expanding
+    states reached again at the same or a greater depth.
+
+    ``key`` maps sticker bytes to the transposition table key, e.g.
+    ``rxcube.symmetry.class_key`` to treat symmetric states as one. That
+    is only sound when ``goal`` and the move set are symmetric too, as for
+    all face moves to the solved cube. States are then pruned only when
+    their class was already reached at a smaller depth.
+    """
+    began = time.perf_counter()
+    goal, moves, perms = _prepare(start, goal, moves)
+    if heuristic is None:
+        heuristic = sticker_heuristic(goal, moves)
+    if table is None:
+        table = TranspositionTable()
+    gathers = [itemgetter(*p) for p in perms]
+    skips = _skips(moves)
+    target = goal.stickers
+    path = []
+    nodes = 0
+
+    def search(state, depth, bound, last):
+        nonlocal nodes
+        if state == target:
+            return True
+        if depth + heuristic(state) > bound:
+            return False
+        if key is None:
+            # States reached after different moves may still be pruned differently.
+            table_key = (state, last)
+            seen = table.get(table_key)
+            if seen is not None and seen <= depth:
+                return False
+        else:
+            table_key = key(state)
+            seen = table.get(table_key)
+            if seen is not None and seen < depth:
+                return False
+        table.store(table_key, depth)
+        skip = skips[last]
+        for m, gather in enumerate(gathers):
+            if m in skip:
+                continue
+            nodes += 1
+            path.append(m)
+            if search(bytes(gather(state)), depth + 1, bound, m):
+                return True
+            path.pop()
+        return False
+
+    found = False
+    for bound in range(heuristic(start.stickers), max_depth + 1):
+        table.clear()
+        if search(start.stickers, 0, bound, -1):
+            found = True
+            break
+    result = [moves[m] for m in path] if found else None
+    return SearchResult(result, nodes, time.perf_counter() - began)
@@ -0,0 +1,275 @@
+"""
+Canonical form of move sequences.
+
+``simplify_moves`` rewrites a sequence into an equivalent one, i.e. one
+that leaves every cube in exactly the same state:
+
+* whole-cube rotations are moved to the end, relabelling the face moves
+  they pass over, and emitted as the shortest rotation sequence;
+* consecutive turns of the same face are merged (``R R`` -> ``R2``,
+  ``R R'`` -> nothing);
+* turns of opposite faces commute, so a face also merges across turns of
+  its opposite face (``L R L`` -> ``L2 R``), and such pairs are written in
+  ``FACES`` order (``R L`` -> ``L R``).
+
+Wide and slice moves (``Rw``, ``3R``, ``M``) are merged with the face
+turns about the same axis: all such moves commute, so a run of them only
+matters through how far it turns each layer. The run is written back as
+the fewest moves turning the layers that far (``Rw R' Rw 2R'`` -> ``Rw``),
+in ``Cube.move_permutations`` order. Layer moves that add up to a
+whole-cube rotation (``R M' L'``) stay layer moves; only rotation moves
+become rotations.
+
+This takes one pass over the input with a stack. Every run about one
+axis comes out as short as it can be; finding shorter equivalents that
+mix axes would take a search, like solving the cube.
+"""
+import functools
+
+from .cube import (FACE_NORMALS, Cube_3x3x3, compose_permutations, normalise_move, sticker_geometry,
+                   turn_clockwise)
+from .symmetry import symmetries
+
+_SUFFIXES = ('', '', '2', "'")
+
+# Moves about the same axis commute.
+_AXES = {'U': 0, 'D': 0, 'E': 0, 'L': 1, 'R': 1, 'M': 1, 'F': 2, 'B': 2, 'S': 2}
+
+# Layers about each axis are counted from this face, and turned as seen from it.
+_AXIS_FACES = ('D', 'L', 'F')
+
+_CONJUGATIONS = {}
+
+
+def _family(move):
+    # The move without its suffix: R2 -> R, 3Rw' -> 3Rw.
+    return move[:-1] if move[-1] in "'2" else move
+
+
+def _amount(move):
+    if move.endswith("'"):
+        return 3
+    if move.endswith('2'):
+        return 2
+    return 1
+
+
+def _inverse_permutation(perm):
+    inverse = [0] * len(perm)
+    for i, p in enumerate(perm):
+        inverse[p] = i
+    return tuple(inverse)
+
+
+def _layer_turns(geometry, size, axis, perm):
+    """
+    Quarter turns that ``perm``, a quarter turn about ``axis``, gives each
+    layer, counting the layers from ``_AXIS_FACES[axis]``.
+    """
+    normal = FACE_NORMALS[_AXIS_FACES[axis]]
+    turns = [0] * size
+    for i, source in enumerate(perm):
+        if source != i:
+            depth = (size - 1 - sum(p * a for p, a in zip(geometry[i][0], normal))) // 2
+            source_position, source_normal = geometry[source]
+            clockwise = (turn_clockwise(source_position, normal), turn_clockwise(source_normal, normal)) == geometry[i]
+            turns[depth] = 1 if clockwise else 3
+    return tuple(turns)
+
+
+def _fewest_layer_moves(turns):
+    """
+    The fewest ``(first layer, last layer, quarter turns)`` moves turning
+    layer ``i + 1`` by ``turns[i]``, out of single layers, the layers from
+    either end up to any depth, but not all layers at once.
+
+    With ``d[k]`` how much further layer ``k + 1`` turns than layer ``k``
+    (``0..n``, the layers past either end not turning), turning layers
+    ``i..j`` by ``a`` adds ``a`` to ``d[i - 1]`` and takes it from ``d[j]``.
+    So moves are edges between the nodes ``0..n`` and the fewest moves make
+    a forest, each tree summing to 0 over ``d``: ``n + 1`` less the most
+    trees. A tree without the end nodes can only use single layers, so it
+    is a run of consecutive nodes; an end node is joined to every middle
+    node, so its tree can take any of them.
+    """
+    n = len(turns)
+    d = [(b - a) % 4 for a, b in zip((0,) + turns, turns + (0,))]
+    need = -d[0] % 4
+    memo = {}
+
+    def most_trees(k, sums, spare):
+        # (trees, runs) for the middle nodes from k on. ``sums`` is a bit
+        # mask of the subset sums of the nodes left for the end trees so
+        # far and ``spare`` whether there are any; -1 trees is impossible.
+        key = (k, sums, spare)
+        if key not in memo:
+            if k == n:
+                # Both end trees, or one joined through a spare node.
+                result = (2 if sums >> need & 1 else 1 if spare else -1), ()
+            else:
+                shifted = (sums << d[k] | sums >> (4 - d[k])) & 0xF
+                result = most_trees(k + 1, sums | shifted, True)
+                total = 0
+                for j in range(k, n):
+                    total = (total + d[j]) % 4
+                    if not total:
+                        trees, runs = most_trees(j + 1, sums, spare)
+                        if trees >= 0 and trees + 1 > result[0]:
+                            result = trees + 1, ((k, j),) + runs
+            memo[key] = result
+        return memo[key]
+
+    _, runs = most_trees(1, 1, False)
+    moves = []
+    in_runs = set()
+    for first, last in runs:
+        total = 0
+        for k in range(first, last):
+            total = (total + d[k]) % 4
+            moves.append((k + 1, k + 1, total))
+        in_runs.update(range(first, last + 1))
+    spare = [k for k in range(1, n) if k not in in_runs]
+    subsets = {0: ()}
+    for k in spare:
+        for total, subset in list(subsets.items()):
+            subsets.setdefault((total + d[k]) % 4, subset + (k,))
+    if need in subsets:
+        for k in spare:
+            moves.append((1, k, -d[k] % 4) if k in subsets[need] else (k + 1, n, d[k]))
+    else:
+        # One tree holding both ends, joined through the first spare node.
+        joint = spare[0]
+        a = -d[n] % 4
+        moves.append((joint + 1, n, a))
+        for k in spare:
+            moves.append((1, k, ((a if k == joint else 0) - d[k]) % 4))
+    return tuple(move for move in moves if move[2])
+
+
+def _run_moves(families, layer_families, axis, turns):
+    """
+    The fewest moves turning the layers about ``axis`` by ``turns``, in
+    ``Cube.move_permutations`` order. ``families`` gives each layer move
+    family as ``(axis, quarter turns of each layer, sort position)`` and
+    ``layer_families[axis]`` the family turning each run of layers
+    ``(first, last)``.
+    """
+    run = []
+    for first, last, amount in _fewest_layer_moves(turns):
+        family = layer_families[axis][first, last]
+        _, family_turns, order = families[family]
+        # Families turning the other way, like R for L, take the inverse.
+        run.append((order, f'{family}{_SUFFIXES[amount * family_turns[first - 1] % 4]}'))
+    return tuple(move for _, move in sorted(run))
+
+
+def _conjugation_tables(cube_class):
+    """
+    The 24 rotations as permutations with their shortest names, the index
+    of each rotation after a further rotation move, and for each rotation
+    ``r`` and layer move ``m`` the axis of the layer move ``m'`` with
+    ``r m == m' r`` and its quarter turns of each layer along that axis.
+    Last comes ``_run_moves`` for the class, to write layer turns back as
+    moves.
+    """
+    tables = _CONJUGATIONS.get(cube_class)
+    if tables is None:
+        perms = cube_class.move_permutations()
+        rotations = [(sym.perm, sym.name) for sym in symmetries(cube_class)[:24]]
+        index = {perm: i for i, (perm, _) in enumerate(rotations)}
+        face_moves = {}
+        for m, perm in perms.items():
+            if m[0] not in 'XYZ':
+                # Where two names turn the same layers (3R and M'), the first one is used.
+                face_moves.setdefault(perm, m)
+        rotation_moves = [m for m in perms if m[0] in 'XYZ']
+        size = cube_class.SIZE
+        geometry = sticker_geometry(size)
+        families = {}
+        layer_families = ({}, {}, {})
+        for m in face_moves.values():
+            family = _family(m)
+            if family not in families:
+                axis = _AXES[family.lstrip('0123456789')[0]]
+                turns = _layer_turns(geometry, size, axis, perms[family])
+                families[family] = (axis, turns, len(families))
+                layers = [i + 1 for i, t in enumerate(turns) if t]
+                layer_families[axis].setdefault((layers[0], layers[-1]), family)
+        after = [{m: index[compose_permutations(perm, perms[m])] for m in rotation_moves}
+                 for perm, _ in rotations]
+        conjugate = []
+        for perm, _ in rotations:
+            inverse = _inverse_permutation(perm)
+            layer_turns = {}
+            for m, p in perms.items():
+                if m[0] not in 'XYZ':
+                    conjugated = face_moves[compose_permutations(perm, p, inverse)]
+                    axis, turns, _ = families[_family(conjugated)]
+                    amount = _amount(conjugated)
+                    layer_turns[m] = axis, tuple(amount * t % 4 for t in turns)
+            conjugate.append(layer_turns)
+        run_moves = functools.lru_cache(maxsize=4096)(functools.partial(_run_moves, families, layer_families))
+        tables = [name for _, name in rotations], after, conjugate, run_moves
+        _CONJUGATIONS[cube_class] = tables
+    return tables
+
+
+def simplify_moves(moves, cube_class=Cube_3x3x3):
+    """
+    Canonical equivalent of ``moves``, a list of move strings or a move
+    sequence string, as a list of move strings.
+    """
+    if isinstance(moves, str):
+        moves = moves.split()
+    names, after, conjugate, run_moves = _conjugation_tables(cube_class)
+    rotation = 0
+    # [axis, quarter turns of each layer] entries; no entry turns nothing,
+    # and neighbouring entries are about different axes.
+    stack = []
+    for move in moves:
+        move = normalise_move(move)
+        if move[0] in 'XYZ':
+            try:
+                rotation = after[rotation][move]
+            except KeyError:
+                raise NotImplementedError(move) from None
+            continue
+        try:
+            axis, turns = conjugate[rotation][move]
+        except KeyError:
+            raise NotImplementedError(move) from None
+        if stack and stack[-1][0] == axis:
+            # Moves about the same axis commute, so they all merge.
+            merged = tuple((t + u) % 4 for t, u in zip(stack[-1][1], turns))
+            if any(merged):
+                stack[-1][1] = merged
+            else:
+                stack.pop()
+        else:
+            stack.append([axis, turns])
+
+    simplified = []
+    for axis, turns in stack:
+        simplified.extend(run_moves(axis, turns))
+    if rotation:
+        simplified.extend(names[rotation].split())
+    return simplified
+
+
+def invert_moves(moves):
+    """
+    The moves undoing ``moves``, a list of move strings or a move sequence
+    string, as a list of move strings.
+    """
+    if isinstance(moves, str):
+        moves = moves.split()
+    inverted = []
+    for move in reversed(moves):
+        move = normalise_move(move)
+        if move.endswith("'"):
+            inverted.append(move[:-1])
+        elif move.endswith('2'):
+            inverted.append(move)
+        else:
+            inverted.append(f"{move}'")
+    return inverted
@@ -0,0 +1,235 @@
+"""
+Optimal 2x2x2 solver.
+
+With the DBL corner held fixed, the 2x2x2 has 7! * 3^6 = 3,674,160 states
+and every one of them can be reached with U, R and F turns. A breadth first
+search from the solved state gives the exact distance of each state; the
+distances are stored one nibble per state (about 1.8 MB). Solving is then a
+walk downhill in that table, one lookup per candidate move.
+
+Cubes in any orientation are accepted: the state is first expressed
+relative to whichever whole-cube rotation puts its DBL cubie home, and the
+solution, applied to the original cube, leaves it solved in that rotated
+orientation.
+"""
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from .cube import Cube_2x2x2
+from .cubie import CubieCube_2x2x2
+from .rank import (DBL, N_PERM_2X2X2 as N_PERM, N_STATES_2X2X2 as N_STATES, N_TWIST_2X2X2 as N_TWIST,
+                   coords_2x2x2, cubie_from_coords_2x2x2, rotations_2x2x2)
+from .tables import move_digest, open_table, write_table
+
+MOVES = ("U", "U'", "U2", "R", "R'", "R2", "F", "F'", "F2")
+
+_UNSEEN = 0xF
+
+# Bump when the layout of the distance table changes.
+TABLE_VERSION = 1
+
+DEFAULT_TABLE_PATH = Path('~').expanduser() / '.cache' / 'rxcube' / '2x2x2_distances.bin'
+
+_MOVE_TABLES = None
+_RELABELLINGS = None
+
+
+class TableStats(NamedTuple):
+    states: int
+    table_bytes: int
+    seconds: float
+    depth_counts: tuple
+    # Peak resident size of the process after the build, where the platform reports it.
+    peak_rss_bytes: int | None
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _move_tables():
+    """
+    The ``(perm_moves, twist_moves)`` transition tables, built once per
+    process and shared by every solver.
+    """
+    global _MOVE_TABLES
+    if _MOVE_TABLES is None:
+        _MOVE_TABLES = _build_move_tables()
+    return _MOVE_TABLES
+
+
+def _build_move_tables():
+    move_cubes = CubieCube_2x2x2.move_cubes()
+    perm_moves = [[0] * len(MOVES) for _ in range(N_PERM)]
+    twist_moves = [[0] * len(MOVES) for _ in range(N_TWIST)]
+    for perm in range(N_PERM):
+        cc = cubie_from_coords_2x2x2(perm, 0)
+        for m, move in enumerate(MOVES):
+            perm_moves[perm][m] = coords_2x2x2(cc.multiply(move_cubes[move]))[0]
+    for twist in range(N_TWIST):
+        cc = cubie_from_coords_2x2x2(0, twist)
+        for m, move in enumerate(MOVES):
+            twist_moves[twist][m] = coords_2x2x2(cc.multiply(move_cubes[move]))[1]
+    return perm_moves, twist_moves
+
+
+def _relabellings():
+    """
+    For each (cubie at DBL, its twist), the inverse of the rotation from
+    ``rank.rotations_2x2x2`` that brings that cubie home.
+    """
+    global _RELABELLINGS
+    if _RELABELLINGS is None:
+        _RELABELLINGS = {(j, -twist % 3): r.inverse() for (j, twist), r in rotations_2x2x2().items()}
+    return _RELABELLINGS
+
+
+def _pack_nibbles(depths):
+    packed = bytearray((len(depths) + 1) // 2)
+    for i in range(0, len(depths) - 1, 2):
+        packed[i >> 1] = depths[i] | (depths[i + 1] << 4)
+    if len(depths) % 2:
+        packed[-1] = depths[-1]
+    return packed
+
+
+class Solver_2x2x2:
+    def __init__(self, table_path=DEFAULT_TABLE_PATH):
+        self.table_path = Path(table_path) if table_path is not None else None
+        self.table_stats = None
+        self._perm_moves, self._twist_moves = _move_tables()
+        self._rotations = _relabellings()
+        self._digest = move_digest(Cube_2x2x2, extra=f'2x2x2-distances-{TABLE_VERSION}')
+        self._table = None
+
+    def build_table(self):
+        """
+        Breadth first search over all states; returns the build statistics.
+        """
+        start = time.perf_counter()
+        perm_moves, twist_moves = self._perm_moves, self._twist_moves
+        n_moves = len(MOVES)
+        depths = bytearray([_UNSEEN]) * N_STATES
+        depths[0] = 0
+        frontier = [0]
+        depth_counts = [1]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            append = next_frontier.append
+            for state in frontier:
+                perm, twist = divmod(state, N_TWIST)
+                p_row = perm_moves[perm]
+                t_row = twist_moves[twist]
+                for m in range(n_moves):
+                    neighbour = p_row[m] * N_TWIST + t_row[m]
+                    if depths[neighbour] == _UNSEEN:
+                        depths[neighbour] = depth
+                        append(neighbour)
+            if next_frontier:
+                depth_counts.append(len(next_frontier))
+            frontier = next_frontier
+        self._table = _pack_nibbles(depths)
+        self.table_stats = TableStats(
+            states=N_STATES,
+            table_bytes=len(self._table),
+            seconds=time.perf_counter() - start,
+            depth_counts=tuple(depth_counts),
+            peak_rss_bytes=_peak_rss_bytes(),
+        )
+        return self.table_stats
+
+    def load_table(self):
+        """
+        Map the table from ``table_path``, building and saving it if it is
+        missing or was generated from other move definitions.
+        """
+        if self._table is not None:
+            return
+        if self.table_path is not None:
+            table = open_table(self.table_path, 'B', self._digest)
+            if table is not None and len(table) == (N_STATES + 1) // 2:
+                self._table = table
+                return
+        self.build_table()
+        if self.table_path is not None:
+            write_table(self.table_path, self._table, self._digest)
+            self._table = open_table(self.table_path, 'B', self._digest)
+
+    def _distance(self, perm, twist):
+        state = perm * N_TWIST + twist
+        return (self._table[state >> 1] >> ((state & 1) << 2)) & 0xF
+
+    def _coords(self, cube):
+        if isinstance(cube, str):
+            cube = Cube_2x2x2.from_cube_string(cube)
+        cc = CubieCube_2x2x2.from_cube(cube)
+        if not cc.is_valid():
+            raise ValueError('Not a solvable 2x2x2 state')
+        # Relabel the cubies so the one at DBL is DBL; the solution then ends
+        # in the rotation that relabelling stands for.
+        cc = self._rotations[(cc.cp[DBL], cc.co[DBL])].multiply(cc)
+        return coords_2x2x2(cc)
+
+    def distance(self, cube):
+        """
+        Number of moves in an optimal solution (half-turn metric).
+        """
+        self.load_table()
+        return self._distance(*self._coords(cube))
+
+    def solve(self, cube):
+        """
+        Optimal solution for a ``Cube_2x2x2`` or a 24 character cube string,
+        as a list of moves.
+        """
+        self.load_table()
+        perm, twist = self._coords(cube)
+        perm_moves, twist_moves = self._perm_moves, self._twist_moves
+        distance = self._distance(perm, twist)
+        solution = []
+        while distance:
+            for m, move in enumerate(MOVES):
+                p, t = perm_moves[perm][m], twist_moves[twist][m]
+                if self._distance(p, t) < distance:
+                    solution.append(move)
+                    perm, twist, distance = p, t, distance - 1
+                    break
+            else:
+                raise ValueError('Not a solvable 2x2x2 state')
+        return solution
+
+
+_DEFAULT_SOLVER = None
+
+
+def solve(cube):
+    global _DEFAULT_SOLVER
+    if _DEFAULT_SOLVER is None:
+        _DEFAULT_SOLVER = Solver_2x2x2()
+    return _DEFAULT_SOLVER.solve(cube)
+
+
+def main():
+    solver = Solver_2x2x2(table_path=None)
+    stats = solver.build_table()
+    print(f'States:       {stats.states}')
+    print(f'Table size:   {stats.table_bytes / 2**20:.2f} MiB')
+    if stats.peak_rss_bytes is not None:
+        print(f'Peak RSS:     {stats.peak_rss_bytes / 2**20:.1f} MiB')
+    print(f'Build time:   {stats.seconds:.2f} s')
+    for depth, count in enumerate(stats.depth_counts):
+        print(f'    depth {depth:2}: {count}')
+
+
+if __name__ == '__main__':
+    main()
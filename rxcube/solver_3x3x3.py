@@ -0,0 +1,389 @@
+"""
+Two-phase (Kociemba) solver for the 3x3x3.
+
+Phase 1 brings the cube into the subgroup <U, D, R2, L2, F2, B2>: all
+corner and edge orientations solved and the four middle layer edges back
+in the middle layer. Phase 2 solves the rest using only moves of that
+subgroup. Both phases are iterative deepening searches over coordinates,
+with move tables for the coordinates and pruning tables giving a lower
+bound on the remaining moves. Phase 1 keeps producing longer solutions
+until phase 2 can finish within ``max_length`` moves in total.
+
+The tables are generated from the cubie move definitions on first use,
+which takes a while, and saved in ``table_dir`` (see ``rxcube.tables``)
+so later runs map them read-only and worker processes share one copy.
+"""
+import time
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+from .cube import Cube_3x3x3, FACES, OPPOSITE_FACES
+from .cubie import (CubieCube_3x3x3, orientation_rank, orientation_unrank, permutation_rank,
+                    permutation_unrank)
+from .simplify import simplify_moves
+from .tables import TableStore, move_digest
+
+MOVES = tuple(Cube_3x3x3.make_cube().non_rotational_moves())
+N_MOVES = len(MOVES)
+PHASE2_MOVES = tuple(i for i, m in enumerate(MOVES) if m[0] in 'UD' or m.endswith('2'))
+
+N_TWIST = 3 ** 7
+N_FLIP = 2 ** 11
+N_SLICE = 495
+N_CORNER_PERM = 40320
+N_EDGE_PERM = 40320
+N_SLICE_PERM = 24
+
+# Middle layer edges FR, FL, BL, BR in cubie numbering.
+_SLICE_EDGES = (8, 9, 10, 11)
+
+# Bump when the layout of any table changes.
+TABLE_VERSION = 1
+
+DEFAULT_TABLE_DIR = Path('~').expanduser() / '.cache' / 'rxcube' / '3x3x3'
+
+_FACE_OF_MOVE = tuple(FACES.index(m[0]) for m in MOVES)
+_OPPOSITE_FACE = tuple(FACES.index(OPPOSITE_FACES[f]) for f in FACES)
+
+
+class TableStats(NamedTuple):
+    name: str
+    entries: int
+    table_bytes: int
+    seconds: float
+
+
+def _binomial(n, k):
+    if k < 0 or k > n:
+        return 0
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def _slice_coord(ep):
+    """
+    Which four positions hold the middle layer edges, 0 when they are home.
+    """
+    coord = 0
+    found = 0
+    for j in range(11, -1, -1):
+        if ep[j] in _SLICE_EDGES:
+            coord += _binomial(11 - j, found + 1)
+            found += 1
+    return coord
+
+
+def _move_cubes():
+    move_cubes = CubieCube_3x3x3.move_cubes()
+    return [move_cubes[m] for m in MOVES]
+
+
+def _build_move_table(n_coords, moves, to_items, from_items, apply):
+    """
+    Flat ``array('H')`` with the coordinate reached from ``coord`` by
+    ``moves[m]`` at ``coord * len(moves) + m``.
+    """
+    table = array('H', bytes(2 * n_coords * len(moves)))
+    for coord in range(n_coords):
+        items = to_items(coord)
+        base = coord * len(moves)
+        for m, move in enumerate(moves):
+            table[base + m] = from_items(apply(items, move))
+    return table
+
+
+def _apply_twist(co, move):
+    return [(co[i] + o) % 3 for i, o in zip(move.cp, move.co)]
+
+
+def _apply_flip(eo, move):
+    return [(eo[i] + o) % 2 for i, o in zip(move.ep, move.eo)]
+
+
+def _apply_corner_perm(cp, move):
+    return [cp[i] for i in move.cp]
+
+
+def _apply_edge_perm(ep, move):
+    return [ep[i] for i in move.ep]
+
+
+def _build_slice_representatives():
+    """
+    For every slice coordinate, an edge permutation with the middle layer
+    edges at the positions it describes.
+    """
+    representatives = [None] * N_SLICE
+    filler = [e for e in range(12) if e not in _SLICE_EDGES]
+    for mask in range(1 << 12):
+        if bin(mask).count('1') != 4:
+            continue
+        ep = []
+        others = iter(filler)
+        slices = iter(_SLICE_EDGES)
+        for j in range(12):
+            ep.append(next(slices) if mask >> j & 1 else next(others))
+        representatives[_slice_coord(ep)] = ep
+    return representatives
+
+
+_SLICE_REPRESENTATIVES = _build_slice_representatives()
+
+
+def _build_pruning_table(n_first, n_second, first_moves, second_moves, n_moves):
+    """
+    Breadth first distances over the product of two coordinates, indexed by
+    ``first * n_second + second``.
+    """
+    unseen = 0xFF
+    distances = bytearray([unseen]) * (n_first * n_second)
+    distances[0] = 0
+    frontier = [0]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        append = next_frontier.append
+        for state in frontier:
+            first, second = divmod(state, n_second)
+            first_base = first * n_moves
+            second_base = second * n_moves
+            for m in range(n_moves):
+                neighbour = first_moves[first_base + m] * n_second + second_moves[second_base + m]
+                if distances[neighbour] == unseen:
+                    distances[neighbour] = depth
+                    append(neighbour)
+        frontier = next_frontier
+    return distances
+
+
+class Solver_3x3x3:
+    _TABLE_FORMATS = {
+        'twist_move': 'H',
+        'flip_move': 'H',
+        'slice_move': 'H',
+        'corner_perm_move': 'H',
+        'edge_perm_move': 'H',
+        'slice_perm_move': 'H',
+        'slice_twist_prune': 'B',
+        'slice_flip_prune': 'B',
+        'slice_perm_corner_prune': 'B',
+        'slice_perm_edge_prune': 'B',
+    }
+
+    def __init__(self, table_dir=DEFAULT_TABLE_DIR):
+        self.table_dir = Path(table_dir) if table_dir is not None else None
+        self.table_stats = []
+        self._tables = None
+
+    def build_tables(self):
+        """
+        Generate every move and pruning table; returns their build statistics.
+        """
+        moves = _move_cubes()
+        phase2 = [moves[m] for m in PHASE2_MOVES]
+        self.table_stats = []
+        tables = {}
+
+        def build(name, func, *args):
+            start = time.perf_counter()
+            table = tables[name] = func(*args)
+            self.table_stats.append(TableStats(
+                name=name,
+                entries=len(table),
+                table_bytes=len(table) * table.itemsize if isinstance(table, array) else len(table),
+                seconds=time.perf_counter() - start,
+            ))
+
+        build('twist_move', _build_move_table, N_TWIST, moves,
+              lambda c: orientation_unrank(c, 8, 3), lambda co: orientation_rank(co, 3), _apply_twist)
+        build('flip_move', _build_move_table, N_FLIP, moves,
+              lambda c: orientation_unrank(c, 12, 2), lambda eo: orientation_rank(eo, 2), _apply_flip)
+        build('slice_move', _build_move_table, N_SLICE, moves,
+              _SLICE_REPRESENTATIVES.__getitem__, _slice_coord, _apply_edge_perm)
+        build('corner_perm_move', _build_move_table, N_CORNER_PERM, phase2,
+              lambda c: permutation_unrank(c, 8), permutation_rank, _apply_corner_perm)
+        build('edge_perm_move', _build_move_table, N_EDGE_PERM, phase2,
+              lambda c: permutation_unrank(c, 8) + _SLICE_EDGES, lambda ep: permutation_rank(ep[:8]),
+              _apply_edge_perm)
+        build('slice_perm_move', _build_move_table, N_SLICE_PERM, phase2,
+              lambda c: tuple(range(8)) + tuple(8 + e for e in permutation_unrank(c, 4)),
+              lambda ep: permutation_rank([e - 8 for e in ep[8:]]), _apply_edge_perm)
+        build('slice_twist_prune', _build_pruning_table, N_SLICE, N_TWIST,
+              tables['slice_move'], tables['twist_move'], N_MOVES)
+        build('slice_flip_prune', _build_pruning_table, N_SLICE, N_FLIP,
+              tables['slice_move'], tables['flip_move'], N_MOVES)
+        build('slice_perm_corner_prune', _build_pruning_table, N_SLICE_PERM, N_CORNER_PERM,
+              tables['slice_perm_move'], tables['corner_perm_move'], len(PHASE2_MOVES))
+        build('slice_perm_edge_prune', _build_pruning_table, N_SLICE_PERM, N_EDGE_PERM,
+              tables['slice_perm_move'], tables['edge_perm_move'], len(PHASE2_MOVES))
+        self._tables = tables
+        return self.table_stats
+
+    def load_tables(self):
+        """
+        Map the tables from ``table_dir``, building and saving them if any is
+        missing or was generated from other move definitions.
+        """
+        if self._tables is not None:
+            return
+        store = None
+        if self.table_dir is not None:
+            store = TableStore(self.table_dir, move_digest(Cube_3x3x3, extra=f'3x3x3-two-phase-{TABLE_VERSION}'))
+            tables = {name: store.open(name, typecode) for name, typecode in self._TABLE_FORMATS.items()}
+            if all(table is not None for table in tables.values()):
+                self._tables = tables
+                return
+        self.build_tables()
+        if store is not None:
+            for name, table in self._tables.items():
+                store.save(name, table)
+            self._tables = {name: store.open(name, typecode) for name, typecode in self._TABLE_FORMATS.items()}
+
+    def solve(self, cube, max_length=22, timeout=None):
+        """
+        Solution for a ``Cube_3x3x3`` or a 54 character cube string, as a list
+        of moves in the notation of ``Cube.non_rotational_moves()``.
+
+        Returns the first solution of at most ``max_length`` moves, or raises
+        ``TimeoutError`` if none is found within ``timeout`` seconds. A cube
+        that is turned as a whole is solved in the orientation it is in.
+        """
+        self.load_tables()
+        if isinstance(cube, str):
+            cube = Cube_3x3x3.from_cube_string(cube)
+        rotation = cube.orientation_rotation()
+        cc = CubieCube_3x3x3.from_cube(cube.canonical_orientation())
+        if not cc.is_valid():
+            raise ValueError('Not a solvable 3x3x3 state')
+        solution = _Search(self._tables, cc, max_length, timeout).run()
+        if rotation:
+            # Carry the rotation through the solution and drop it at the end.
+            solution = [m for m in simplify_moves(rotation.split() + solution) if m[0] not in 'XYZ']
+        return solution
+
+
+class _Search:
+    def __init__(self, tables, cubie_cube, max_length, timeout):
+        self.twist_move = tables['twist_move']
+        self.flip_move = tables['flip_move']
+        self.slice_move = tables['slice_move']
+        self.corner_perm_move = tables['corner_perm_move']
+        self.edge_perm_move = tables['edge_perm_move']
+        self.slice_perm_move = tables['slice_perm_move']
+        self.slice_twist_prune = tables['slice_twist_prune']
+        self.slice_flip_prune = tables['slice_flip_prune']
+        self.slice_perm_corner_prune = tables['slice_perm_corner_prune']
+        self.slice_perm_edge_prune = tables['slice_perm_edge_prune']
+        self.cubie_cube = cubie_cube
+        self.move_cubes = _move_cubes()
+        self.max_length = max_length
+        self.deadline = time.perf_counter() + timeout if timeout is not None else None
+        self.moves = []
+        self.solution = None
+
+    def run(self):
+        cc = self.cubie_cube
+        twist = orientation_rank(cc.co, 3)
+        flip = orientation_rank(cc.eo, 2)
+        slice_ = _slice_coord(cc.ep)
+        for depth in range(self.max_length + 1):
+            if self._phase1(twist, flip, slice_, depth, -1):
+                return [MOVES[m] for m in self.solution]
+            if self._timed_out():
+                raise TimeoutError('No solution found in time')
+        raise ValueError(f'No solution within {self.max_length} moves')
+
+    def _timed_out(self):
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def _phase1(self, twist, flip, slice_, togo, last_face):
+        if togo == 0:
+            if twist or flip or slice_:
+                return False
+            # A phase 1 solution ending in a phase 2 move was already found one move shorter.
+            if self.moves and self.moves[-1] in PHASE2_MOVES:
+                return False
+            return self._start_phase2()
+        if self._timed_out():
+            return False
+        twist_move, flip_move, slice_move = self.twist_move, self.flip_move, self.slice_move
+        slice_twist_prune, slice_flip_prune = self.slice_twist_prune, self.slice_flip_prune
+        for m in range(N_MOVES):
+            face = _FACE_OF_MOVE[m]
+            if face == last_face or (last_face >= 0 and face == _OPPOSITE_FACE[last_face] and face < last_face):
+                continue
+            t = twist_move[twist * N_MOVES + m]
+            f = flip_move[flip * N_MOVES + m]
+            s = slice_move[slice_ * N_MOVES + m]
+            if slice_twist_prune[s * N_TWIST + t] >= togo or slice_flip_prune[s * N_FLIP + f] >= togo:
+                continue
+            self.moves.append(m)
+            if self._phase1(t, f, s, togo - 1, face):
+                return True
+            self.moves.pop()
+        return False
+
+    def _start_phase2(self):
+        cc = self.cubie_cube
+        for m in self.moves:
+            cc = cc.multiply(self.move_cubes[m])
+        corner_perm = permutation_rank(cc.cp)
+        edge_perm = permutation_rank(cc.ep[:8])
+        slice_perm = permutation_rank([e - 8 for e in cc.ep[8:]])
+        limit = self.max_length - len(self.moves)
+        last_face = _FACE_OF_MOVE[self.moves[-1]] if self.moves else -1
+        bound = max(self.slice_perm_corner_prune[slice_perm * N_CORNER_PERM + corner_perm],
+                    self.slice_perm_edge_prune[slice_perm * N_EDGE_PERM + edge_perm])
+        for depth in range(bound, limit + 1):
+            phase2_moves = []
+            if self._phase2(corner_perm, edge_perm, slice_perm, depth, last_face, phase2_moves):
+                self.solution = self.moves + [PHASE2_MOVES[m] for m in phase2_moves]
+                return True
+        return False
+
+    def _phase2(self, corner_perm, edge_perm, slice_perm, togo, last_face, moves):
+        if togo == 0:
+            return corner_perm == 0 and edge_perm == 0 and slice_perm == 0
+        n_moves = len(PHASE2_MOVES)
+        corner_perm_move, edge_perm_move, slice_perm_move = (
+            self.corner_perm_move, self.edge_perm_move, self.slice_perm_move)
+        corner_prune, edge_prune = self.slice_perm_corner_prune, self.slice_perm_edge_prune
+        for i, m in enumerate(PHASE2_MOVES):
+            face = _FACE_OF_MOVE[m]
+            if face == last_face or (last_face >= 0 and face == _OPPOSITE_FACE[last_face] and face < last_face):
+                continue
+            c = corner_perm_move[corner_perm * n_moves + i]
+            e = edge_perm_move[edge_perm * n_moves + i]
+            s = slice_perm_move[slice_perm * n_moves + i]
+            if corner_prune[s * N_CORNER_PERM + c] >= togo or edge_prune[s * N_EDGE_PERM + e] >= togo:
+                continue
+            moves.append(i)
+            if self._phase2(c, e, s, togo - 1, face, moves):
+                return True
+            moves.pop()
+        return False
+
+
+_DEFAULT_SOLVER = None
+
+
+def solve(cube, max_length=22, timeout=None):
+    global _DEFAULT_SOLVER
+    if _DEFAULT_SOLVER is None:
+        _DEFAULT_SOLVER = Solver_3x3x3()
+    return _DEFAULT_SOLVER.solve(cube, max_length=max_length, timeout=timeout)
+
+
+def main():
+    solver = Solver_3x3x3(table_dir=None)
+    for stats in solver.build_tables():
+        print(f'{stats.name:<24} {stats.entries:>9} entries {stats.table_bytes / 2**20:7.2f} MiB '
+              f'{stats.seconds:7.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+The 48 symmetries of the cube and canonical representatives of states.
+
+A symmetry is one of the 24 whole-cube rotations, optionally followed by
+the left-right mirror image. Applied to a state it moves the stickers like
+the rotation (and mirror) would and then renames the colours so that each
+face gets back its own colour; the solved cube is therefore fixed by every
+symmetry, and two states related by a symmetry are the same distance from
+solved in any move set that is closed under the symmetries (all face moves
+are). Pruning and BFS tables for distance to solved can be keyed on the
+equivalence class instead of the state, which is up to 48 times smaller.
+
+``canonical`` picks the representative with the smallest sticker bytes
+and also returns the symmetry that produces it from the given state.
+
+So far only the transposition table of ``search.ida_star`` is keyed on
+classes (``key=class_key(...)``). The solver tables, the table files and
+the position database still index raw states: the solvers index their
+tables by cubie coordinates, which would need the symmetries as maps on
+those coordinates rather than on stickers.
+"""
+from operator import itemgetter
+
+from .cube import FACES, compose_permutations
+
+_SYMMETRIES = {}
+
+
+class Symmetry:
+    """
+    A sticker permutation (a gather, as in ``Cube.move_permutations``)
+    together with the colour renaming that goes with it.
+    """
+    __slots__ = ('name', 'perm', 'size', 'face_map', '_gather', '_colours')
+
+    def __init__(self, name, perm, size):
+        fc_size = size * size
+        self.name = name
+        self.perm = tuple(perm)
+        self.size = size
+        # face_map[h] == g: the stickers of face h end up on face g.
+        face_map = [0] * len(FACES)
+        for g in range(len(FACES)):
+            face_map[self.perm[g * fc_size] // fc_size] = g
+        self.face_map = tuple(face_map)
+        self._gather = itemgetter(*self.perm)
+        self._colours = bytes(self.face_map) + bytes(range(len(FACES), 256))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name!r})'
+
+    def apply_stickers(self, stickers):
+        return bytes(self._gather(stickers)).translate(self._colours)
+
+    def apply(self, cube):
+        return cube._from_stickers(self.apply_stickers(cube.stickers))
+
+    def inverse(self):
+        inverse = [0] * len(self.perm)
+        for i, p in enumerate(self.perm):
+            inverse[p] = i
+        return Symmetry(f'({self.name})^-1', inverse, self.size)
+
+
+def mirror_permutation(size):
+    """
+    Sticker permutation reflecting the cube in the plane between L and R.
+    """
+    fc_size = size * size
+
+    def flipped(face):
+        base = face * fc_size
+        return [base + row * size + (size - 1 - col) for row in range(size) for col in range(size)]
+
+    u, l, f, r, b, d = (flipped(i) for i in range(len(FACES)))
+    return tuple(u + r + f + l + b + d)
+
+
+def symmetries(cube_class):
+    """
+    The 48 symmetries for ``cube_class``; the identity comes first and the
+    24 rotations before their mirror images.
+    """
+    result = _SYMMETRIES.get(cube_class)
+    if result is None:
+        size = cube_class.SIZE
+        rotations = cube_class.whole_cube_rotations()
+        assert len(rotations) == 24
+        mirror = mirror_permutation(size)
+        result = tuple(Symmetry(name, perm, size) for name, perm in rotations)
+        result += tuple(Symmetry(f'{name} M'.strip(), compose_permutations(perm, mirror), size)
+                        for name, perm in rotations)
+        _SYMMETRIES[cube_class] = result
+    return result
+
+
+def canonical_stickers(cube_class, stickers):
+    """
+    Smallest sticker bytes among the 48 symmetric images of ``stickers``,
+    and the index into ``symmetries(cube_class)`` of a symmetry giving it.
+    """
+    best, best_index = None, 0
+    for i, sym in enumerate(symmetries(cube_class)):
+        image = sym.apply_stickers(stickers)
+        if best is None or image < best:
+            best, best_index = image, i
+    return best, best_index
+
+
+def canonical(cube):
+    """
+    Canonical representative of ``cube``'s symmetry class and the
+    ``Symmetry`` that maps ``cube`` to it.
+    """
+    stickers, index = canonical_stickers(cube.__class__, cube.stickers)
+    return cube._from_stickers(stickers), symmetries(cube.__class__)[index]
+
+
+def class_key(cube_class):
+    """
+    A key function for sticker bytes that is equal for states in the same
+    symmetry class, for keying tables on classes instead of states.
+    """
+    syms = symmetries(cube_class)
+
+    def key(stickers):
+        return min(sym.apply_stickers(stickers) for sym in syms)
+
+    return key
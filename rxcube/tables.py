@@ -0,0 +1,136 @@
+"""
+On-disk store for solver tables.
+
+Each table is one flat file: a fixed 64 byte header followed by the raw
+table items in native byte order. Tables are opened with ``mmap`` and
+handed out as read-only ``memoryview`` objects cast to the table's item
+type, so nothing is copied and every process that opens the same file
+shares one copy in the page cache.
+
+The header records a format version, the item type and count, a CRC-32 of
+the data and a digest of whatever the table was generated from (normally
+the move permutations of the cube classes involved, see ``move_digest``).
+A file whose header does not match what the caller expects is treated as
+missing, so tables generated from older move definitions get rebuilt.
+The CRC is checked the first time a process opens a given file (and again
+if the file changes), so a corrupted table is also treated as missing
+without paying for a full read on every open.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+
+FORMAT_VERSION = 1
+
+MAGIC = b'RXCT'
+
+# magic, version, typecode, byte order, item count, crc32 of the data, source digest
+_HEADER = struct.Struct('<4sHccQI32s12x')
+HEADER_SIZE = _HEADER.size
+
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+# (path, inode, size, mtime) of files whose CRC this process has checked.
+_VERIFIED = set()
+
+
+def move_digest(*cube_classes, extra=''):
+    """
+    SHA-256 over the move permutations of ``cube_classes``, plus ``extra``.
+
+    Solvers pass their own table layout version as ``extra`` so that a
+    change to how a table is generated also invalidates saved copies.
+    """
+    digest = hashlib.sha256(extra.encode('utf-8'))
+    for cls in cube_classes:
+        digest.update(f'{cls.__name__}:{cls.SIZE}'.encode('ascii'))
+        for move, perm in cls.move_permutations().items():
+            digest.update(move.encode('ascii'))
+            digest.update(array('I', perm).tobytes())
+    return digest.digest()
+
+
+def _typecode_of(table):
+    return table.typecode if isinstance(table, array) else 'B'
+
+
+def write_table(path, table, digest):
+    """
+    Save ``table`` (an ``array`` or a bytes-like object of bytes) to ``path``.
+
+    The file is written under a temporary name and renamed into place, so
+    other processes never see a partly written table.
+    """
+    path = Path(path)
+    typecode = _typecode_of(table)
+    data = memoryview(table).cast('B')
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, typecode.encode('ascii'), _BYTE_ORDER,
+                          len(data) // array(typecode).itemsize, zlib.crc32(data), digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def open_table(path, typecode, digest, verify=None):
+    """
+    Map the table at ``path`` read-only and return it as a ``memoryview``
+    of ``typecode`` items.
+
+    Returns None if the file is missing, was written by another format
+    version or byte order, holds another item type, was generated from a
+    different ``digest``, is truncated or fails its CRC. The CRC reads the
+    whole file, so by default it is checked once per file and process;
+    ``verify=True`` checks it on every call and ``verify=False`` never.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            return None
+        magic, version, table_typecode, byte_order, count, crc, table_digest = _HEADER.unpack(header)
+        if (magic != MAGIC or version != FORMAT_VERSION or table_typecode != typecode.encode('ascii')
+                or byte_order != _BYTE_ORDER or table_digest != digest):
+            return None
+        size = count * array(typecode).itemsize
+        stat = os.fstat(f.fileno())
+        if stat.st_size != HEADER_SIZE + size:
+            return None
+        if size == 0:
+            return memoryview(array(typecode))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    data = memoryview(mapped)[HEADER_SIZE:]
+    key = (os.path.abspath(path), stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    if verify or (verify is None and key not in _VERIFIED):
+        if zlib.crc32(data) != crc:
+            return None
+        _VERIFIED.add(key)
+    return data.cast(typecode)
+
+
+class TableStore:
+    """
+    A directory of named tables sharing one source digest.
+    """
+    def __init__(self, directory, digest):
+        self.directory = Path(directory)
+        self.digest = digest
+
+    def path(self, name):
+        return self.directory / f'{name}.bin'
+
+    def open(self, name, typecode, verify=None):
+        return open_table(self.path(name), typecode, self.digest, verify=verify)
+
+    def save(self, name, table):
+        write_table(self.path(name), table, self.digest)
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from rxcube.batch import (apply_move, apply_move_sequence, apply_move_sequences, from_sticker_matrix,
+                          make_cubes, move_indices, move_table, rank_states, to_sticker_matrix, unrank_states)
+from rxcube.cube import make_cube
+from rxcube.rank import rank_state, unrank_state
+from rxcube.rubix import perform_move_sequence
+
+
+@pytest.mark.parametrize('size', [2, 3])
+def test_batch_matches_single_cube_moves(size):
+    rng = random.Random(5)
+    names, _ = move_table(size)
+    sequences = [rng.choices(names, k=12) for _ in range(20)]
+    expected = [perform_move_sequence(' '.join(s), make_cube(size)) for s in sequences]
+
+    batch = make_cubes(len(sequences), size)
+    for k in range(12):
+        batch = apply_move(batch, [s[k] for s in sequences])
+    assert from_sticker_matrix(batch) == expected
+
+    indices = np.array([move_indices(s, size) for s in sequences])
+    assert from_sticker_matrix(apply_move_sequences(make_cubes(len(sequences), size), indices)) == expected
+
+
+def test_same_move_sequence_for_whole_batch():
+    cubes = [make_cube(3), make_cube(3).move_R(), make_cube(3).rotate_Y()]
+    batch = apply_move_sequence(to_sticker_matrix(cubes), "R U R' U' x2 D")
+    assert from_sticker_matrix(batch) == [perform_move_sequence("R U R' U' x2 D", c) for c in cubes]
+    assert from_sticker_matrix(apply_move(batch, 'F2'))[1] == perform_move_sequence("R U R' U' x2 D F2", cubes[1])
+
+
+@pytest.mark.parametrize('size', [2, 3])
+def test_batch_ranks_match_single_ranks(size):
+    rng = random.Random(18)
+    cb = make_cube(size)
+    moves = cb.non_rotational_moves() + cb.whole_cube_rotation_moves()
+    cubes = [perform_move_sequence(' '.join(rng.choices(moves, k=25)), cb) for _ in range(30)]
+    ranks = rank_states(to_sticker_matrix(cubes))
+    assert list(ranks) == [rank_state(c) for c in cubes]
+    assert from_sticker_matrix(unrank_states(ranks, size)) == [unrank_state(r, size) for r in ranks]
@@ -0,0 +1,38 @@
+import random
+
+from rxcube.bulk import solve_cube_strings, solve_file
+from rxcube.cube import make_cube
+from rxcube.rubix import perform_move_sequence
+
+
+def test_results_stream_in_input_order(tmp_path):
+    rng = random.Random(9)
+    cb = make_cube(2)
+    scrambled = [perform_move_sequence(' '.join(rng.choices(cb.non_rotational_moves(), k=20)), cb)
+                 for _ in range(12)]
+    lines = [c.to_cube_string() for c in scrambled]
+    lines.insert(5, '')
+    lines.insert(7, 'not a cube')
+    filepath = tmp_path / 'cubes.txt'
+    filepath.write_text('\n'.join(lines) + '\n')
+
+    results = list(solve_file(filepath, processes=2, table_dir=tmp_path / 'tables'))
+
+    # Line numbers in the file, which skip the blank line 6.
+    assert [r.index for r in results] == [1, 2, 3, 4, 5, 7, 8, 9, 10, 11, 12, 13, 14]
+    assert results[6].solution is None and results[6].error.startswith('ValueError')
+    solved = [r for r in results if r.error is None]
+    assert [r.cube_string for r in solved] == [c.to_cube_string() for c in scrambled]
+    for result, cube in zip(solved, scrambled):
+        assert result.seconds >= 0
+        assert perform_move_sequence(' '.join(result.solution), cube).is_solved()
+
+
+def test_interleaved_runs_keep_their_own_tables(tmp_path):
+    cube_strings = [perform_move_sequence(moves, make_cube(2)).to_cube_string() for moves in ('R', 'U F')]
+    first = solve_cube_strings(cube_strings, processes=1, table_dir=tmp_path / 'first')
+    second = solve_cube_strings(cube_strings, processes=1, table_dir=tmp_path / 'second')
+    results = [next(first), next(second), next(first), next(second)]
+    assert [len(r.solution) for r in results] == [1, 1, 2, 2]
+    assert (tmp_path / 'first' / '2x2x2_distances.bin').exists()
+    assert (tmp_path / 'second' / '2x2x2_distances.bin').exists()
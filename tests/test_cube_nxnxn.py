@@ -0,0 +1,51 @@
+import pickle
+import random
+
+import pytest
+
+from rxcube.cube import (Cube_2x2x2, Cube_3x3x3, Cube_NxNxN, cube_class, from_cube_string, layer_move_permutations,
+                         make_cube)
+from rxcube.rubix import generate_scramble, perform_move_sequence
+
+
+@pytest.mark.parametrize('cube_cls', [Cube_3x3x3, Cube_2x2x2])
+def test_generated_moves_match_hand_written_ones(cube_cls):
+    generated = layer_move_permutations(cube_cls.SIZE)
+    cb = cube_cls.make_cube()
+    for move in cb.non_rotational_moves() + cb.whole_cube_rotation_moves():
+        assert generated[move] == cube_cls.move_permutations()[move]
+
+    # A generic class of the same size agrees on the face level too.
+    generic_cls = type(f'Generic{cube_cls.SIZE}', (Cube_NxNxN,), {'SIZE': cube_cls.SIZE})
+    face = list(range(cube_cls.SIZE ** 2))
+    assert generic_cls._turn_face_clockwise(face) == cube_cls._turn_face_clockwise(face)
+    assert generic_cls._turn_face_anticlockwise(face) == cube_cls._turn_face_anticlockwise(face)
+    assert generic_cls.make_cube().move_R().rotate_y().stickers == cb.move_R().rotate_y().stickers
+
+
+@pytest.mark.parametrize('size', [3, 4, 5, 7])
+def test_layer_moves_compose_like_face_moves(size):
+    cb = make_cube(size)
+    wide = f'{size - 1}Rw' if size > 3 else 'Rw'
+    assert perform_move_sequence(wide, cb) == perform_move_sequence("L X'", cb)
+    assert perform_move_sequence('Rw', cb) == perform_move_sequence('R 2R', cb)
+    if size % 2:
+        middle = size // 2 + 1
+        assert perform_move_sequence('M', cb) == perform_move_sequence(f"{middle}L", cb)
+        assert perform_move_sequence("E S'", cb) == perform_move_sequence(f"{middle}D {middle}B", cb)
+    for move in cb.layer_moves():
+        assert perform_move_sequence(f'{move} {move} {move} {move}', cb) == cb
+
+
+def test_large_cubes_scramble_and_round_trip():
+    rng = random.Random(21)
+    for size in (4, 5, 6, 7):
+        cb = make_cube(size)
+        assert cube_class(size) is cb.__class__ and cb.__class__.__name__ == f'Cube_{size}x{size}x{size}'
+        scrambled = perform_move_sequence(' '.join(generate_scramble(cb, rng)), cb)
+        # Inner layers move too.
+        assert len(set(scrambled.stickers[size + 1:2 * size - 1])) > 1
+        assert from_cube_string(scrambled.to_cube_string()) == scrambled
+        assert pickle.loads(pickle.dumps(scrambled)) == scrambled
+        assert scrambled.mutable().apply_moves(['3Rw', "u'"]).to_cube() == perform_move_sequence("3rw U'", scrambled)
+        assert perform_move_sequence('X Y', cb).is_solved()
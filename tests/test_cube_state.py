@@ -0,0 +1,85 @@
+import itertools
+import pickle
+import random
+import tracemalloc
+
+from rxcube.cube import Cube_3x3x3, make_cube
+from rxcube.rubix import perform_move_sequence
+
+
+def test_cubes_hash_and_compare_by_state():
+    cb = make_cube(3)
+    states = {cb, make_cube(3), cb.move_R().move_r(), cb.move_R()}
+    assert len(states) == 2
+    assert cb.move_U() == cb.move_u().move_U().move_U()
+    assert make_cube(3) != make_cube(2)
+
+
+def test_compact_state_round_trips():
+    cb = make_cube(3).move_F().move_d()
+    assert len(cb.stickers) == 54
+    assert set(cb.stickers) == set(range(6))
+    assert Cube_3x3x3.from_stickers(cb.stickers) == cb
+    assert Cube_3x3x3.from_cube_string(cb.to_cube_string()) == cb
+    assert pickle.loads(pickle.dumps(cb)) == cb
+
+
+def test_is_solved_in_any_orientation(capsys):
+    for size in (2, 3):
+        cb = make_cube(size)
+        for name, _ in cb.whole_cube_rotations():
+            rotated = perform_move_sequence(name, cb)
+            assert rotated.is_solved()
+            assert rotated.canonical_orientation() == cb
+        assert not cb.move_R().is_solved()
+    assert capsys.readouterr().out == ''
+
+
+def test_is_solved_does_not_allocate():
+    cb = make_cube(3).rotate_X().rotate_y()
+    cb.is_solved()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in itertools.repeat(None, 1000):
+            cb.is_solved()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert after == before
+    assert peak - before < 256
+
+
+def test_canonical_orientation_undoes_rotations():
+    rng = random.Random(19)
+    for size in (2, 3):
+        cb = make_cube(size)
+        scrambled = perform_move_sequence(' '.join(rng.choices(cb.non_rotational_moves(), k=25)), cb)
+        oriented = scrambled.canonical_orientation()
+        for name, _ in cb.whole_cube_rotations():
+            rotated = perform_move_sequence(name, scrambled)
+            assert rotated.canonical_orientation() == oriented
+            assert perform_move_sequence(rotated.orientation_rotation(), rotated) == oriented
+
+
+def test_rotations_only_change_the_frame():
+    rng = random.Random(23)
+    for size in (2, 3, 4):
+        cb = make_cube(size)
+        scrambled = perform_move_sequence(' '.join(rng.choices(cb.non_rotational_moves(), k=25)), cb)
+        rotated = scrambled.make_move('X').make_move("y'").make_move('Z2')
+        assert rotated._stickers is scrambled._stickers
+        assert rotated.stickers == perform_move_sequence("X Y' Z2", scrambled).stickers
+
+        moves = cb.non_rotational_moves() + cb.whole_cube_rotation_moves() + cb.layer_moves()
+        sequence = rng.choices(moves, k=40)
+        framed, mutable = rotated, rotated.mutable()
+        for move in sequence:
+            framed = framed.make_move(move)
+            mutable.apply_move(move)
+        expected = mutable.to_cube()
+        assert framed == expected and hash(framed) == hash(expected)
+        assert framed.to_cube_string() == expected.to_cube_string()
+        assert pickle.loads(pickle.dumps(framed)) == expected
+        assert framed.is_solved() == expected.is_solved()
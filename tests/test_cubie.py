@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from rxcube.cube import make_cube
+from rxcube.cubie import CubieCube_2x2x2, CubieCube_3x3x3
+from rxcube.rubix import perform_move_sequence
+
+
+@pytest.mark.parametrize('cubie_cls', [CubieCube_3x3x3, CubieCube_2x2x2])
+def test_cubie_moves_track_sticker_moves(cubie_cls):
+    rng = random.Random(4)
+    cb = make_cube(cubie_cls.CUBE_CLASS.SIZE)
+    cc = cubie_cls.make_cube()
+    for m in rng.choices(cubie_cls.supported_moves(), k=60):
+        cb = cb.make_move(m)
+        cc = cc.make_move(m)
+        assert cc.is_valid()
+        assert cubie_cls.from_cube_string(cb.to_cube_string()) == cc
+        assert cc.to_cube_string() == cb.to_cube_string()
+    assert cc.multiply(cc.inverse()).is_solved()
+
+
+def test_2x2x2_is_solved_in_any_orientation():
+    for name, _ in make_cube(2).whole_cube_rotations():
+        rotated = perform_move_sequence(name, make_cube(2))
+        assert CubieCube_2x2x2.from_cube(rotated).is_solved()
+    assert not CubieCube_2x2x2.make_cube().make_move('R').is_solved()
+
+
+def test_rotated_3x3x3_is_rejected():
+    with pytest.raises(ValueError):
+        CubieCube_3x3x3.from_cube(make_cube(3).rotate_X())
+
+
+def test_invalid_corner_is_rejected():
+    cube_string = make_cube(2).to_cube_string()
+    with pytest.raises(ValueError):
+        CubieCube_2x2x2.from_cube_string('D' + cube_string[1:])
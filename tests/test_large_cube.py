@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from rxcube.cube import make_cube
+from rxcube.large import LargeCube
+from rxcube.rubix import perform_move_sequence
+
+
+@pytest.mark.parametrize('size', [2, 3, 4, 5, 10])
+def test_large_cube_matches_cube_moves(size):
+    rng = random.Random(22)
+    cb = make_cube(size)
+    moves = cb.non_rotational_moves() + cb.whole_cube_rotation_moves() + cb.layer_moves()
+    for _ in range(5):
+        sequence = rng.choices(moves, k=60)
+        large = LargeCube(cb).apply_moves(sequence)
+        assert large.to_cube() == perform_move_sequence(' '.join(sequence), cb)
+    for move in (f'{size}R', '2Rw'):
+        with pytest.raises(NotImplementedError):
+            LargeCube(cb).apply_move(move)
+        with pytest.raises(NotImplementedError):
+            perform_move_sequence(move, cb)
+
+
+def test_moves_only_touch_their_layers():
+    size = 12
+    large = LargeCube(perform_move_sequence("R U' 3Fw", make_cube(size)))
+    before = bytes(large._buffer)
+    large.apply_moves("X Y' Z2")
+    assert large._buffer == before
+    for move in ('R', "5U'", '4Bw2'):
+        before = bytes(large._buffer)
+        large.apply_move(move)
+        changed = sum(a != b for a, b in zip(before, large._buffer))
+        assert changed <= 4 * size * max(1, int(move[0]) if move[0].isdigit() else 1)
+
+
+def test_copies_are_independent():
+    large = LargeCube(make_cube(6)).apply_moves('Rw U 2F')
+    copy = large.copy()
+    assert copy == large
+    copy.apply_move('D')
+    assert copy != large
+    assert large.to_cube() == perform_move_sequence('Rw U 2F', make_cube(6))
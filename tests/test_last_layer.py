@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from rxcube.cube import Cube_3x3x3
+from rxcube.last_layer import (AUFS, OLL_ALGORITHMS, PLL_ALGORITHMS, recognise, recognise_oll, recognise_pll,
+                               to_rxcube_notation)
+from rxcube.rubix import perform_move_sequence
+from rxcube.simplify import invert_moves
+
+
+def test_every_case_is_recognised():
+    assert to_rxcube_notation("r U' x y2 z' M") == "Rw U' X' Y2 Z M"
+    cb = Cube_3x3x3.make_cube()
+    numbers = set()
+    for algorithm in OLL_ALGORITHMS.values():
+        for auf in AUFS:
+            cube = perform_move_sequence(' '.join(invert_moves(f'{auf} {to_rxcube_notation(algorithm)}')), cb)
+            case = recognise_oll(cube)
+            numbers.add(case.number)
+            assert perform_move_sequence(f'{case.auf} {case.algorithm}', cube).stickers[:9] == bytes(9)
+    assert numbers == set(OLL_ALGORITHMS)
+
+    names = set()
+    for algorithm in PLL_ALGORITHMS.values():
+        for auf in AUFS:
+            cube = perform_move_sequence(' '.join(invert_moves(f'{auf} {to_rxcube_notation(algorithm)}')), cb)
+            case = recognise_pll(cube)
+            names.add(case.name)
+            assert perform_move_sequence(f'{case.auf} {case.algorithm} {case.final_auf}', cube).is_solved()
+    assert names == set(PLL_ALGORITHMS)
+
+
+def test_recognised_algorithms_solve_the_last_layer():
+    rng = random.Random(25)
+    cb = Cube_3x3x3.make_cube()
+    for _ in range(50):
+        oll = to_rxcube_notation(OLL_ALGORITHMS[rng.choice(list(OLL_ALGORITHMS))])
+        pll = to_rxcube_notation(PLL_ALGORITHMS[rng.choice(list(PLL_ALGORITHMS))])
+        moves = ' '.join([rng.choice(AUFS), oll, rng.choice(AUFS), pll, rng.choice(AUFS)])
+        rotation = rng.choice(cb.whole_cube_rotations())[0]
+        cube = perform_move_sequence(' '.join(invert_moves(moves) + rotation.split()), cb)
+
+        case = recognise(cube)
+        assert case.oll == recognise_oll(cube)
+        oriented = perform_move_sequence(f'{case.oll.auf} {case.oll.algorithm}', cube.canonical_orientation())
+        assert oriented.stickers[:9] == bytes(9)
+        assert recognise_pll(oriented) == case.pll
+        pll = case.pll
+        assert perform_move_sequence(f'{pll.auf} {pll.algorithm} {pll.final_auf}', oriented).is_solved()
+
+
+def test_recognise_rejects_unsolved_first_two_layers():
+    cb = Cube_3x3x3.make_cube()
+    assert recognise(cb).oll.number == 0 and recognise(cb).pll.name == 'solved'
+    with pytest.raises(ValueError):
+        recognise_oll(perform_move_sequence('R', cb))
+    with pytest.raises(ValueError):
+        recognise_pll(perform_move_sequence("F R U R' U' F'", cb))
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from rxcube.cube import Cube_2x2x2, Cube_3x3x3, make_cube
+from rxcube.rubix import perform_move_sequence
+
+
+@pytest.mark.parametrize('cube_cls', [Cube_3x3x3, Cube_2x2x2])
+def test_move_table_matches_face_definitions(cube_cls):
+    rng = random.Random(1)
+    cb = make_cube(cube_cls.SIZE)
+    cb = perform_move_sequence(' '.join(rng.choices(cb.non_rotational_moves(), k=25)), cb)
+
+    for move, faces_func in cube_cls._quarter_turn_definitions().items():
+        expected = ''.join(sum(faces_func(*cb._unpack_faces()), []))
+        assert cb.make_move(move).to_cube_string() == expected, move
+
+
+@pytest.mark.parametrize('size', [2, 3])
+def test_every_move_has_order_four(size):
+    cb = make_cube(size)
+    for m in cb.non_rotational_moves() + cb.whole_cube_rotation_moves():
+        assert perform_move_sequence(' '.join([m] * 4), cb).to_cube_string() == cb.to_cube_string(), m
+
+
+def test_unknown_move():
+    with pytest.raises(NotImplementedError):
+        make_cube(3).make_move('Q')
+
+
+@pytest.mark.parametrize('size', [2, 3])
+def test_native_b_and_d_match_rotation_composition(size):
+    cb = perform_move_sequence("R U F' L2 D B'", make_cube(size))
+    assert cb.move_B().to_cube_string() == cb.rotate_X().move_U().rotate_x().to_cube_string()
+    assert cb.move_b().to_cube_string() == cb.rotate_X().move_u().rotate_x().to_cube_string()
+    assert cb.move_D().to_cube_string() == cb.rotate_x().move_F().rotate_X().to_cube_string()
+    assert cb.move_d().to_cube_string() == cb.rotate_x().move_f().rotate_X().to_cube_string()
+
+
+def test_compiled_sequence_matches_move_by_move():
+    alg = "R U R' U' r' F R2 u' R' U' R U R' F' x y2"
+    for size in (2, 3):
+        cb = make_cube(size)
+        expected = cb
+        for m in alg.split():
+            expected = expected.make_move(m)
+        compiled = cb.compile_move_sequence(alg)
+        assert compiled.apply(cb) == expected
+        assert len(compiled) == 16
+        assert cb.compile_move_sequence(alg.upper()) is compiled
+        assert cb.mutable().apply_move_sequence(alg).to_cube() == expected
+    assert make_cube(3).compile_move_sequence('').apply(make_cube(3)) == make_cube(3)
+    with pytest.raises(NotImplementedError):
+        make_cube(3).compile_move_sequence('R Q')
@@ -0,0 +1,41 @@
+import random
+import tracemalloc
+
+import pytest
+
+from rxcube.cube import make_cube
+
+
+def test_mutable_cube_matches_immutable_moves():
+    for size in (2, 3):
+        cb = make_cube(size)
+        moves = random.Random(12).choices(cb.non_rotational_moves() + cb.whole_cube_rotation_moves(), k=200)
+        mc = cb.mutable().apply_moves(moves)
+        for m in moves:
+            cb = cb.make_move(m)
+        assert mc.to_cube() == cb
+        assert mc.stickers == cb.stickers
+
+    snapshot = mc.copy()
+    mc.apply_move("r'")
+    assert snapshot != mc and snapshot.to_cube() == cb
+    with pytest.raises(NotImplementedError):
+        mc.apply_move('Q')
+
+
+def test_moves_do_not_allocate():
+    cb = make_cube(3)
+    moves = random.Random(12).choices(cb.non_rotational_moves(), k=10000)
+    mc = cb.mutable().apply_moves(moves[:10])
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for m in moves:
+            mc.apply_move(m)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert after == before
+    # Only the loop's own iterator is alive at any time, however many moves.
+    assert peak - before < 256
@@ -0,0 +1,61 @@
+import io
+import random
+
+import pytest
+
+from rxcube.cube import from_cube_string, make_cube
+from rxcube.packed import (ENCODING_CUBIE, ENCODING_STICKERS, HEADER_SIZE, StateFile, StateReader, StateWriter,
+                           packed_to_text, text_to_packed)
+from rxcube.rubix import perform_move_sequence
+
+
+def random_cubes(size, count, rotations=False):
+    rng = random.Random(17)
+    cb = make_cube(size)
+    moves = cb.non_rotational_moves() + (cb.whole_cube_rotation_moves() if rotations else [])
+    return [perform_move_sequence(' '.join(rng.choices(moves, k=25)), cb) for _ in range(count)]
+
+
+@pytest.mark.parametrize('size, encoding, n_bytes', [
+    (3, ENCODING_STICKERS, 21),
+    (2, ENCODING_STICKERS, 9),
+    (3, ENCODING_CUBIE, 9),
+    (2, ENCODING_CUBIE, 4),
+])
+def test_states_round_trip(tmp_path, size, encoding, n_bytes):
+    cubes = random_cubes(size, 50, rotations=size == 2 or encoding == ENCODING_STICKERS)
+    path = tmp_path / 'states.bin'
+    with StateWriter(path, size, encoding) as writer:
+        writer.write_many(cubes)
+    assert path.stat().st_size == HEADER_SIZE + 50 * n_bytes
+
+    with StateReader(path) as reader:
+        assert list(reader) == cubes
+    with StateFile(path) as states:
+        assert len(states) == 50
+        assert states[7] == cubes[7] and states[-1] == cubes[-1]
+        with pytest.raises(IndexError):
+            states[50]
+
+
+def test_unknown_colours_are_rejected():
+    cube_string = make_cube(3).to_cube_string()
+    with StateWriter(io.BytesIO(), 3, ENCODING_STICKERS) as writer:
+        with pytest.raises(ValueError):
+            writer.write(from_cube_string('Q' + cube_string[1:]))
+
+
+def test_text_conversion_is_lossless(tmp_path):
+    cubes = random_cubes(3, 20, rotations=True)
+    text = ''.join(f'{c.to_cube_string()}\n' for c in cubes)
+    (tmp_path / 'in.txt').write_text(text)
+    assert text_to_packed(tmp_path / 'in.txt', tmp_path / 'states.bin') == 20
+    assert packed_to_text(tmp_path / 'states.bin', tmp_path / 'out.txt') == 20
+    assert (tmp_path / 'out.txt').read_text() == text
+
+
+def test_cubie_encoding_rejects_rotated_3x3x3():
+    with pytest.raises(ValueError):
+        StateWriter(io.BytesIO(), 3, ENCODING_CUBIE).write(make_cube(3).rotate_X())
+    with pytest.raises(ValueError):
+        StateReader(io.BytesIO(b'not a state file'))
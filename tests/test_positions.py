@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from rxcube.cube import make_cube
+from rxcube.positions import PositionDatabase, position_key
+from rxcube.rubix import perform_move_sequence
+from rxcube.simplify import invert_moves
+
+
+def test_lookup_finds_every_rotation_with_a_working_solution(tmp_path):
+    rng = random.Random(24)
+    path = tmp_path / 'positions.db'
+    with PositionDatabase(path) as db:
+        for size in (2, 3):
+            cb = make_cube(size)
+            moves = rng.choices(cb.non_rotational_moves(), k=20) + ['X', 'Y']
+            scrambled = perform_move_sequence(' '.join(moves), cb)
+            db.add(scrambled, f'scramble {size}', invert_moves(moves))
+            for name, _ in cb.whole_cube_rotations():
+                rotated = perform_move_sequence(name, scrambled)
+                position = db.lookup(rotated.to_cube_string())
+                assert position.name == f'scramble {size}'
+                assert position.cube_string == scrambled.to_cube_string()
+                assert perform_move_sequence(' '.join(position.solution), rotated).is_solved()
+            assert db.lookup(perform_move_sequence('R', scrambled)) is None
+        assert len(db) == 2
+
+    # The records are on disk and the colour setting is kept with them.
+    with PositionDatabase(path) as db:
+        assert db.find_name('scramble 3') == [scrambled.to_cube_string()]
+        assert scrambled in db
+    with pytest.raises(ValueError):
+        PositionDatabase(path, colours=True)
+
+
+def test_import_file_and_cache(tmp_path):
+    rng = random.Random(25)
+    cb = make_cube(3)
+    lines = ['# name and solution are optional', '']
+    cubes = []
+    for i in range(20):
+        moves = rng.choices(cb.non_rotational_moves(), k=12)
+        cubes.append(perform_move_sequence(' '.join(moves), cb))
+        lines.append(f'{cubes[-1].to_cube_string()}\tcase {i}\t{" ".join(invert_moves(moves))}')
+    lines.append(cb.to_cube_string())
+    filepath = tmp_path / 'positions.txt'
+    filepath.write_text('\n'.join(lines) + '\n')
+
+    db = PositionDatabase(cache_size=8)
+    assert db.import_file(filepath) == 21
+    assert db.lookup(cb) == (cb.to_cube_string(), None, None)
+    for _ in range(2):
+        for i, cube in enumerate(cubes[:5]):
+            assert db.lookup(cube).name == f'case {i}'
+    info = db.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (5, 6, 6)
+    for cube in cubes:
+        db.lookup(cube)
+    assert db.cache_info().currsize == 8
+
+    # Writing drops the cache so lookups see the new record.
+    db.add(cubes[0], 'renamed')
+    assert db.lookup(cubes[0]).name == 'renamed'
+
+
+def test_colour_keys_ignore_the_colour_scheme():
+    cb = make_cube(3)
+    pattern = perform_move_sequence("R U R' U'", cb)
+    # Rename the colours as a turn of the cube about the L-R axis would, and turn the cube.
+    recoloured = cb.from_cube_string(pattern.to_cube_string().translate(str.maketrans('ULFRBD', 'FLDRUB')))
+    recoloured = perform_move_sequence('Y X2', recoloured)
+    assert position_key(recoloured) != position_key(pattern)
+    assert position_key(recoloured, colours=True) == position_key(pattern, colours=True)
+
+    db = PositionDatabase(colours=True)
+    db.add(pattern, 'sexy move', "U R U' R'")
+    position = db.lookup(recoloured)
+    assert position.name == 'sexy move'
+    assert perform_move_sequence(' '.join(position.solution), recoloured).is_solved()
@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from rxcube.cube import make_cube
+from rxcube.rank import (N_STATES_2X2X2, N_STATES_3X3X3, rank_2x2x2, rank_3x3x3, rank_state, unrank_2x2x2,
+                         unrank_3x3x3, unrank_state)
+from rxcube.rubix import perform_move_sequence
+
+
+def test_3x3x3_ranks_round_trip():
+    rng = random.Random(18)
+    assert rank_3x3x3(make_cube(3)) == 0
+    for _ in range(200):
+        r = rng.randrange(N_STATES_3X3X3)
+        assert rank_3x3x3(unrank_3x3x3(r)) == r
+    cb = make_cube(3)
+    for _ in range(50):
+        scrambled = perform_move_sequence(' '.join(rng.choices(cb.non_rotational_moves(), k=30)), cb)
+        assert unrank_state(rank_state(scrambled), 3) == scrambled
+    assert rank_3x3x3(scrambled.rotate_X().rotate_Z()) == rank_3x3x3(scrambled)
+    with pytest.raises(ValueError):
+        unrank_3x3x3(N_STATES_3X3X3)
+
+
+def test_2x2x2_ranks_ignore_rotation():
+    rng = random.Random(18)
+    assert rank_2x2x2(make_cube(2).rotate_X().rotate_y()) == 0
+    for r in range(0, N_STATES_2X2X2, 7919):
+        assert rank_2x2x2(unrank_2x2x2(r)) == r
+    cb = make_cube(2)
+    scrambled = perform_move_sequence(' '.join(rng.choices(cb.non_rotational_moves(), k=30)), cb)
+    assert rank_2x2x2(scrambled) == rank_2x2x2(scrambled.rotate_Z().rotate_Y())
+    with pytest.raises(ValueError):
+        rank_2x2x2(perform_move_sequence('R', cb).to_cube_string().replace('L', 'U', 1))
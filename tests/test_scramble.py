@@ -1,5 +1,8 @@
+import random
+
 from rxcube.cube import make_cube
 from rxcube.rubix import generate_scramble, perform_move_sequence
+from rxcube.scramble import random_state, random_state_scrambles, scramble_by_id, scramble_stream
 
 
 def test_scramble_3x3x3_001():
@@ -23,3 +26,32 @@ def test_scramble_2x2x2_001():
     cb_scrambled = perform_move_sequence(' '.join(s), cb)
     assert not cb_scrambled.is_solved()
 
+
+def test_random_states_are_legal():
+    rng = random.Random(15)
+    for _ in range(200):
+        assert random_state(3, rng).is_valid()
+        cc = random_state(2, rng)
+        assert cc.is_valid() and cc.cp[6] == 6 and cc.co[6] == 0
+
+
+def test_random_state_scrambles_reach_the_drawn_states(tmp_path):
+    scrambles = random_state_scrambles(4, 2, rng=random.Random(15), processes=2, table_dir=tmp_path)
+    rng = random.Random(15)
+    for scramble in scrambles:
+        assert len(scramble) <= 11
+        assert perform_move_sequence(' '.join(scramble), make_cube(2)) == random_state(2, rng).to_cube()
+
+
+def test_scramble_streams_are_reproducible_and_shardable():
+    stream = list(scramble_stream(42, size=3, stop=6, method='random_moves'))
+    assert [s.id for s in stream] == [f'42-{i}' for i in range(6)]
+    assert list(scramble_stream(42, size=3, stop=6, method='random_moves')) == stream
+    assert len({' '.join(s.moves) for s in stream}) == 6
+
+    shards = [list(scramble_stream(42, size=3, start=k, stop=6, step=2, method='random_moves')) for k in (0, 1)]
+    assert sorted(shards[0] + shards[1]) == sorted(stream)
+    assert scramble_by_id('42-4', size=3, method='random_moves') == stream[4]
+
+    from_rng = next(scramble_stream(random.Random(1), size=2, method='random_moves'))
+    assert scramble_by_id(from_rng.id, size=2, method='random_moves') == from_rng
@@ -0,0 +1,32 @@
+import random
+
+from rxcube.cube import make_cube
+from rxcube.rubix import perform_move_sequence
+from rxcube.search import TranspositionTable, bidirectional_bfs, ida_star, parse_move_set
+
+
+def test_parse_move_set():
+    assert parse_move_set('<R,U>') == ['R', "R'", 'R2', 'U', "U'", 'U2']
+    assert parse_move_set("r' u2") == ["R'", 'U2']
+
+
+def test_searches_agree_on_shortest_sequences():
+    rng = random.Random(10)
+    cb = make_cube(2)
+    for _ in range(5):
+        scrambled = perform_move_sequence(' '.join(rng.choices(parse_move_set('<U,R,F>'), k=8)), cb)
+        bfs = bidirectional_bfs(scrambled, moves='<U,R,F>')
+        ida = ida_star(scrambled, moves='<U,R,F>', table=TranspositionTable(1000))
+        assert len(bfs.moves) == len(ida.moves) <= 8
+        for result in (bfs, ida):
+            assert perform_move_sequence(' '.join(result.moves), scrambled) == cb
+            assert result.nodes > 0 and result.nodes_per_second > 0
+
+
+def test_search_between_arbitrary_states_with_restricted_moves():
+    start = make_cube(3).move_F()
+    goal = perform_move_sequence("F R U R' U'", make_cube(3))
+    assert bidirectional_bfs(start, goal, moves='<R,U>').moves == ['R', 'U', "R'", "U'"]
+    assert ida_star(start, goal, moves='<R,U>').moves == ['R', 'U', "R'", "U'"]
+    assert ida_star(start, goal, moves='<R,U>', max_depth=3).moves is None
+    assert bidirectional_bfs(start, start).moves == []
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from rxcube.cube import Cube_2x2x2, Cube_3x3x3, make_cube
+from rxcube.rubix import perform_move_sequence
+from rxcube.simplify import simplify_moves
+
+
+@pytest.mark.parametrize('moves, expected', [
+    ('R R', ['R2']),
+    ("R R'", []),
+    ('L R L', ['L2', 'R']),
+    ('R L', ['L', 'R']),
+    ("U D' U2 D", ["U'"]),
+    ("X U X'", ['B']),
+    ('X X X X R R2 R', []),
+    ("Rw R' Rw 2R'", ['Rw']),
+    ("R M'", ['Rw']),
+    ("L' Lw M", ['M2']),
+])
+def test_simplify_examples(moves, expected):
+    assert simplify_moves(moves) == expected
+
+
+@pytest.mark.parametrize('cube_cls', [Cube_3x3x3, Cube_2x2x2])
+def test_simplified_sequences_give_the_same_state(cube_cls):
+    rng = random.Random(14)
+    cb = cube_cls.make_cube()
+    moves = cb.non_rotational_moves() + cb.whole_cube_rotation_moves()
+    for _ in range(500):
+        sequence = rng.choices(moves, k=rng.randrange(30))
+        simplified = simplify_moves(sequence, cube_cls)
+        assert perform_move_sequence(' '.join(simplified), cb) == perform_move_sequence(' '.join(sequence), cb)
+        assert len(simplified) <= len(sequence)
+        assert simplify_moves(simplified, cube_cls) == simplified
+
+
+@pytest.mark.parametrize('size', [3, 4, 5])
+def test_simplify_keeps_wide_and_slice_moves(size):
+    rng = random.Random(21)
+    cb = make_cube(size)
+    moves = cb.non_rotational_moves() + cb.whole_cube_rotation_moves() + cb.layer_moves()
+    for _ in range(200):
+        sequence = rng.choices(moves, k=rng.randrange(30))
+        simplified = simplify_moves(sequence, cb.__class__)
+        assert perform_move_sequence(' '.join(simplified), cb) == perform_move_sequence(' '.join(sequence), cb)
+        assert len(simplified) <= len(sequence)
+        assert simplify_moves(simplified, cb.__class__) == simplified
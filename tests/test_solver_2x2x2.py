@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from rxcube.cube import make_cube
+from rxcube.rubix import perform_move_sequence
+from rxcube.solver_2x2x2 import Solver_2x2x2
+
+
+@pytest.fixture(scope='module')
+def solver(tmp_path_factory):
+    solver = Solver_2x2x2(tmp_path_factory.mktemp('tables') / '2x2x2.bin')
+    solver.load_table()
+    return solver
+
+
+def test_table_covers_every_state(solver):
+    assert solver.table_stats.depth_counts == (1, 9, 54, 321, 1847, 9992, 50136, 227536, 870072, 1887748,
+                                               623800, 2644)
+    reloaded = Solver_2x2x2(solver.table_path)
+    assert reloaded.distance(make_cube(2).move_R().move_U()) == 2
+
+
+def test_solutions_are_optimal_and_solve(solver):
+    rng = random.Random(6)
+    cb = make_cube(2)
+    moves = cb.non_rotational_moves() + cb.whole_cube_rotation_moves()
+    for _ in range(50):
+        scrambled = perform_move_sequence(' '.join(rng.choices(moves, k=25)), cb)
+        solution = solver.solve(scrambled.to_cube_string())
+        assert len(solution) == solver.distance(scrambled) <= 11
+        assert perform_move_sequence(' '.join(solution), scrambled).is_solved()
+
+    assert solver.solve(perform_move_sequence("R U2 F'", cb)) == ['F', 'U2', "R'"]
+
+
+def test_twisted_corner_is_rejected(solver):
+    cube_string = make_cube(2).to_cube_string()
+    twisted = 'L' + cube_string[1:4] + 'B' + cube_string[5:16] + 'U' + cube_string[17:]
+    with pytest.raises(ValueError):
+        solver.solve(twisted)
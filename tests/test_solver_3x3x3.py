@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from rxcube.cube import make_cube
+from rxcube.rubix import perform_move_sequence
+from rxcube.solver_3x3x3 import MOVES, Solver_3x3x3
+
+
+@pytest.fixture(scope='module')
+def solver(tmp_path_factory):
+    solver = Solver_3x3x3(tmp_path_factory.mktemp('tables'))
+    solver.load_tables()
+    return solver
+
+
+def test_solutions_solve_within_22_moves(solver):
+    rng = random.Random(7)
+    cb = make_cube(3)
+    for _ in range(10):
+        scrambled = perform_move_sequence(' '.join(rng.choices(MOVES, k=30)), cb)
+        solution = solver.solve(scrambled.to_cube_string(), timeout=10)
+        assert len(solution) <= 22
+        assert set(solution) <= set(MOVES)
+        assert perform_move_sequence(' '.join(solution), scrambled) == cb
+
+    assert solver.solve(cb) == []
+
+
+def test_tables_are_reused(solver):
+    reloaded = Solver_3x3x3(solver.table_dir)
+    reloaded.load_tables()
+    assert reloaded.table_stats == []
+    scrambled = perform_move_sequence("R U R' U'", make_cube(3))
+    assert perform_move_sequence(' '.join(reloaded.solve(scrambled)), scrambled) == make_cube(3)
+
+
+def test_rotated_cubes_are_solved_as_they_are(solver):
+    scrambled = perform_move_sequence("R U F' D2 L X Y'", make_cube(3))
+    solution = solver.solve(scrambled)
+    assert set(solution) <= set(MOVES)
+    assert perform_move_sequence(' '.join(solution), scrambled).is_solved()
+
+
+def test_flipped_edge_is_rejected(solver):
+    cube_string = make_cube(3).to_cube_string()
+    # Swap the two stickers of the UF edge.
+    flipped = cube_string[:7] + 'F' + cube_string[8:19] + 'U' + cube_string[20:]
+    with pytest.raises(ValueError):
+        solver.solve(flipped)
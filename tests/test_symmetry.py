@@ -0,0 +1,33 @@
+import random
+
+from rxcube.cube import Cube_2x2x2, Cube_3x3x3, make_cube
+from rxcube.cubie import CubieCube_3x3x3
+from rxcube.rubix import perform_move_sequence
+from rxcube.search import ida_star
+from rxcube.symmetry import canonical, class_key, symmetries
+
+
+def test_48_distinct_symmetries_fix_the_solved_cube():
+    for cls in (Cube_3x3x3, Cube_2x2x2):
+        syms = symmetries(cls)
+        assert len({sym.perm for sym in syms}) == 48
+        assert all(sym.apply(cls.make_cube()) == cls.make_cube() for sym in syms)
+
+
+def test_symmetric_states_share_a_canonical_representative():
+    cb = make_cube(3)
+    scrambled = perform_move_sequence(' '.join(random.Random(11).choices(cb.non_rotational_moves(), k=30)), cb)
+    rep, sym = canonical(scrambled)
+    assert sym.apply(scrambled) == rep
+    for sym in symmetries(Cube_3x3x3):
+        image = sym.apply(scrambled)
+        assert CubieCube_3x3x3.from_cube(image).is_valid()
+        assert canonical(image)[0] == rep
+        assert sym.inverse().apply(image) == scrambled
+
+
+def test_search_keyed_on_symmetry_classes():
+    scrambled = perform_move_sequence("R U F' L2", make_cube(3))
+    result = ida_star(scrambled, key=class_key(Cube_3x3x3))
+    assert len(result.moves) == 4
+    assert perform_move_sequence(' '.join(result.moves), scrambled) == make_cube(3)
@@ -0,0 +1,38 @@
+from array import array
+
+from rxcube.cube import Cube_2x2x2, Cube_3x3x3
+from rxcube.tables import HEADER_SIZE, TableStore, move_digest, open_table, write_table
+
+
+def test_tables_round_trip_as_read_only_views(tmp_path):
+    store = TableStore(tmp_path, move_digest(Cube_3x3x3))
+    store.save('moves', array('H', [0, 1, 65535]))
+    store.save('depths', bytearray(b'\x00\x01\x02'))
+
+    moves = store.open('moves', 'H')
+    assert moves.tolist() == [0, 1, 65535]
+    assert moves.readonly
+    assert bytes(store.open('depths', 'B', verify=True)) == b'\x00\x01\x02'
+    assert store.open('missing', 'B') is None
+
+
+def test_stale_tables_are_not_opened(tmp_path):
+    path = tmp_path / 'table.bin'
+    digest = move_digest(Cube_2x2x2)
+    write_table(path, array('H', range(10)), digest)
+
+    assert move_digest(Cube_2x2x2) == digest
+    assert move_digest(Cube_2x2x2, extra='v2') != digest
+    assert open_table(path, 'H', move_digest(Cube_3x3x3)) is None
+    assert open_table(path, 'B', digest) is None
+
+    data = bytearray(path.read_bytes())
+    data[HEADER_SIZE] ^= 1
+    path.write_bytes(data)
+    assert open_table(path, 'H', digest, verify=False) is not None
+    assert open_table(path, 'H', digest, verify=True) is None
+    # Checked on the first default open too, not only on request.
+    assert open_table(path, 'H', digest) is None
+
+    path.write_bytes(data[:-1])
+    assert open_table(path, 'H', digest) is None